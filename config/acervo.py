@@ -0,0 +1,162 @@
+"""
+Acervo
+======
+Arquivo das páginas HTML baixadas durante as coletas. Cada corpo é
+guardado uma única vez, comprimido, com o hash SHA-256 do conteúdo como
+nome (dados/html/objetos/ab/abcdef....zst); páginas que não mudaram entre
+coletas apontam para o mesmo objeto. O índice (dados/html/indice.jsonl)
+registra, a cada download, a URL, o hash, o tipo da página e a data.
+
+Usa zstd quando o pacote zstandard está instalado e gzip caso contrário;
+os dois formatos podem conviver no mesmo acervo.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstandard é opcional (gzip é usado no lugar)
+    zstandard = None
+
+# Diretório raiz do acervo
+CAMINHO_ACERVO = 'dados/html'
+
+# Nível de compressão do zstd (cada página é comprimida uma única vez)
+NIVEL_ZSTD = 19
+
+class AcervoHtml:
+    """
+    Armazenamento endereçado por conteúdo das páginas baixadas
+
+    Uso:
+        with AcervoHtml() as acervo:
+            acervo.guardar(url, html, 'produto')
+            html = acervo.html_recente(url)
+    """
+
+    def __init__(self, diretorio: str = CAMINHO_ACERVO):
+        self.diretorio = diretorio
+        self.objetos = os.path.join(diretorio, 'objetos')
+        self.caminho_indice = os.path.join(diretorio, 'indice.jsonl')
+        os.makedirs(self.objetos, exist_ok=True)
+        self.indice = None
+        self.novos = 0
+        self.repetidos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastro):
+        self.fechar()
+        return False
+
+    def _caminho_objeto(self, digest: str, extensao: str) -> str:
+        return os.path.join(self.objetos, digest[:2], digest + extensao)
+
+    def _localizar(self, digest: str) -> Optional[str]:
+        for extensao in ('.zst', '.gz'):
+            caminho = self._caminho_objeto(digest, extensao)
+            if os.path.exists(caminho):
+                return caminho
+        return None
+
+    def guardar(self, url: str, html: str, tipo: str = 'produto') -> str:
+        """
+        Guarda o corpo da página (se ainda não existe) e registra a URL no índice
+
+        Returns:
+            Hash SHA-256 do conteúdo
+        """
+        corpo = html.encode('utf-8')
+        digest = hashlib.sha256(corpo).hexdigest()
+
+        if self._localizar(digest) is None:
+            if zstandard is not None:
+                comprimido = zstandard.ZstdCompressor(level=NIVEL_ZSTD).compress(corpo)
+                caminho = self._caminho_objeto(digest, '.zst')
+            else:
+                comprimido = gzip.compress(corpo, compresslevel=9, mtime=0)
+                caminho = self._caminho_objeto(digest, '.gz')
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with open(temporario, 'wb') as f:
+                f.write(comprimido)
+            os.replace(temporario, caminho)
+            self.novos += 1
+        else:
+            self.repetidos += 1
+
+        if self.indice is None:
+            self.indice = open(self.caminho_indice, 'a', encoding='utf-8')
+        self.indice.write(json.dumps({
+            'url': url,
+            'hash': digest,
+            'tipo': tipo,
+            'coletado_em': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }, ensure_ascii=False) + '\n')
+        self.indice.flush()
+        return digest
+
+    def ler(self, digest: str) -> str:
+        """Retorna o HTML guardado com o hash informado"""
+        caminho = self._localizar(digest)
+        if caminho is None:
+            raise KeyError(f"Objeto não encontrado no acervo: {digest}")
+        with open(caminho, 'rb') as f:
+            dados = f.read()
+        if caminho.endswith('.zst'):
+            if zstandard is None:
+                raise ImportError("Objeto comprimido com zstd: requer o pacote zstandard")
+            dados = zstandard.ZstdDecompressor().decompress(dados)
+        else:
+            dados = gzip.decompress(dados)
+        return dados.decode('utf-8')
+
+    def entradas(self, tipo: Optional[str] = None) -> Iterator[Dict]:
+        """Percorre o índice na ordem de gravação (opcionalmente só um tipo de página)"""
+        if not os.path.exists(self.caminho_indice):
+            return
+        with open(self.caminho_indice, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:
+                    continue  # linha incompleta de uma coleta interrompida
+                if tipo is None or entrada.get('tipo') == tipo:
+                    yield entrada
+
+    def mais_recentes(self, tipo: Optional[str] = None, ate: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Última versão de cada URL no índice
+
+        Args:
+            tipo: 'produto', 'listagem' ou None para todas
+            ate: Data limite 'AAAA-MM-DD HH:MM:SS' (para reprocessar o estado de uma data)
+        """
+        recentes = {}
+        for entrada in self.entradas(tipo):
+            if ate is None or entrada['coletado_em'] <= ate:
+                recentes[entrada['url']] = entrada
+        return recentes
+
+    def html_recente(self, url: str) -> Optional[str]:
+        """HTML da versão mais recente da URL, ou None se ela nunca foi guardada"""
+        entrada = self.mais_recentes().get(url)
+        return self.ler(entrada['hash']) if entrada else None
+
+    def paginas(self, tipo: Optional[str] = 'produto', ate: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """Percorre (url, html) da versão mais recente de cada página"""
+        for url, entrada in self.mais_recentes(tipo, ate).items():
+            yield url, self.ler(entrada['hash'])
+
+    def fechar(self):
+        if self.indice is not None:
+            self.indice.close()
+            self.indice = None
+        if self.novos or self.repetidos:
+            print(f"Acervo HTML: {self.novos} páginas novas, {self.repetidos} sem alteração")
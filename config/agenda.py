@@ -0,0 +1,152 @@
+"""
+Agenda
+======
+Ordem de processamento dos produtos por prioridade. URLs que nunca foram
+coletadas vêm primeiro; as demais são ordenadas pela pontuação
+
+    dias desde a última coleta com sucesso + PESO_ALTERACOES x taxa de alteração
+
+com a taxa de alteração (fração das coletas em que a linha do produto
+mudou) calculada no histórico particionado (config/historico.py). Com um
+tempo limite, a coleta para de iniciar produtos quando o tempo acaba; os
+produtos adiados mantêm a linha da coleta anterior, então mesmo uma coleta
+parcial gera um conjunto completo, atualizado primeiro onde mais importa.
+
+As linhas mantidas não contam como coleta: ficam fora do histórico, e a
+data da última coleta real de cada URL fica em dados/ultimas_coletas.json
+(usado também quando não há histórico). Assim os adiados ficam mais
+atrasados a cada coleta parcial e são os primeiros da próxima.
+"""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import pandas as pd
+from .delta import CAMPOS_COMPARADOS, hash_linhas
+from .historico import CAMINHO_HISTORICO, consultar_historico, listar_particoes
+from .produto import CAMPOS, ProdutoBruto
+
+# Dias de atraso equivalentes a um produto que muda em todas as coletas
+PESO_ALTERACOES = 30.0
+
+# Dias de histórico considerados no cálculo
+JANELA_HISTORICO_DIAS = 180
+
+# Data da última coleta real (não mantida da coleta anterior) de cada URL
+CAMINHO_COLETAS = 'dados/ultimas_coletas.json'
+
+class EstadoProduto(NamedTuple):
+    """Resumo do histórico de um produto"""
+
+    ultima_coleta: datetime
+    coletas: int
+    taxa_alteracao: float
+
+def carregar_coletas(caminho: str = CAMINHO_COLETAS) -> Dict[str, datetime]:
+    """Data da última coleta real de cada URL (vazio se o arquivo não existe)"""
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            urls = json.load(f).get('urls', {})
+    except (OSError, ValueError) as e:
+        print(f"Erro ao ler as datas de coleta '{caminho}': {e}")
+        return {}
+    return {url: datetime.strptime(coletado_em, '%Y-%m-%d %H:%M:%S') for url, coletado_em in urls.items()}
+
+def registrar_coletas(urls, caminho: str = CAMINHO_COLETAS, coletado_em: Optional[datetime] = None):
+    """Grava a data desta coleta para as URLs efetivamente coletadas (não as adiadas nem as inválidas)"""
+    urls = list(urls)
+    if not urls:
+        return
+    coletas = {url: data.strftime('%Y-%m-%d %H:%M:%S') for url, data in carregar_coletas(caminho).items()}
+    agora = (coletado_em or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+    coletas.update((url, agora) for url in urls)
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'urls': coletas}, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+def carregar_estado(diretorio: str = CAMINHO_HISTORICO, janela_dias: int = JANELA_HISTORICO_DIAS,
+                    caminho_dados: Optional[str] = None,
+                    caminho_coletas: str = CAMINHO_COLETAS) -> Dict[str, EstadoProduto]:
+    """
+    Última coleta e taxa de alteração de cada URL
+
+    Usa o histórico dos últimos janela_dias para a taxa e caminho_coletas
+    para a data; quando caminho_coletas existe, uma URL que não está nele
+    (nunca coletada com sucesso) conta como nova. Sem caminho_coletas, a data
+    vem do histórico. Sem histórico (ou sem pyarrow), usa só caminho_coletas,
+    com taxa zero; sem nenhum dos dois, usa o arquivo de dados da última
+    coleta, com a data de modificação do arquivo.
+    """
+    coletas = carregar_coletas(caminho_coletas)
+    df = None
+    if listar_particoes(diretorio):
+        try:
+            df = consultar_historico(inicio=date.today() - timedelta(days=janela_dias),
+                                     colunas=CAMPOS_COMPARADOS, diretorio=diretorio)
+        except ImportError as e:
+            print(f"Histórico indisponível para priorizar a coleta: {e}")
+
+    if df is None or df.empty:
+        if coletas:
+            return {url: EstadoProduto(coletado_em, 1, 0.0) for url, coletado_em in coletas.items()}
+        if not caminho_dados or not os.path.exists(caminho_dados):
+            return {}
+        coletado_em = datetime.fromtimestamp(os.path.getmtime(caminho_dados))
+        urls = pd.read_csv(caminho_dados, usecols=['url'], dtype=str)['url'].dropna()
+        return {url: EstadoProduto(coletado_em, 1, 0.0) for url in urls}
+
+    df = df.sort_values(['url', 'coletado_em'], kind='stable').reset_index(drop=True)
+    hashes = hash_linhas(df)
+    mudou = (df['url'] == df['url'].shift()) & (hashes != hashes.shift())
+    resumo = df.assign(mudou=mudou).groupby('url').agg(
+        ultima_coleta=('coletado_em', 'max'), coletas=('coletado_em', 'size'), alteracoes=('mudou', 'sum'))
+    taxas = resumo['alteracoes'] / (resumo['coletas'] - 1).clip(lower=1)
+    return {url: EstadoProduto(coletas[url] if coletas else linha.ultima_coleta.to_pydatetime(),
+                               int(linha.coletas), float(taxa))
+            for url, linha, taxa in zip(resumo.index, resumo.itertuples(), taxas)
+            if not coletas or url in coletas}
+
+def pontuacao(estado: EstadoProduto, agora: datetime, peso_alteracoes: float = PESO_ALTERACOES) -> float:
+    """Prioridade de um produto já coletado (maior = antes)"""
+    dias = (agora - estado.ultima_coleta).total_seconds() / 86400
+    return dias + peso_alteracoes * estado.taxa_alteracao
+
+def priorizar_urls(urls: Sequence[str], estado: Dict[str, EstadoProduto],
+                   agora: Optional[datetime] = None) -> List[str]:
+    """URLs novas (na ordem recebida) seguidas das conhecidas, da maior para a menor pontuação"""
+    agora = agora or datetime.now()
+    novas = [url for url in urls if url not in estado]
+    conhecidas = sorted((url for url in urls if url in estado),
+                        key=lambda url: pontuacao(estado[url], agora), reverse=True)
+    if conhecidas:
+        mais_antiga = max((agora - estado[url].ultima_coleta).days for url in conhecidas)
+        print(f"Prioridade: {len(novas)} produtos novos primeiro, depois {len(conhecidas)} já coletados "
+              f"(última coleta mais antiga há {mais_antiga} dias)")
+    return novas + conhecidas
+
+def manter_anteriores(escritor, caminho_bruto: str, urls) -> int:
+    """
+    Copia para a coleta atual as linhas brutas da coleta anterior das URLs adiadas
+
+    Deve ser chamada antes de o escritor fechar, enquanto caminho_bruto
+    ainda é o arquivo da coleta anterior. As linhas mantidas não são uma
+    nova coleta: devem ficar fora do histórico e de registrar_coletas.
+
+    Returns:
+        Número de linhas mantidas
+    """
+    urls = set(urls)
+    if not urls or not os.path.exists(caminho_bruto):
+        return 0
+    mantidas = 0
+    for bloco in pd.read_csv(caminho_bruto, dtype=str, keep_default_na=False, chunksize=1000):
+        bloco = bloco[bloco['url'].isin(urls)].reindex(columns=list(CAMPOS), fill_value='')
+        for linha in bloco.itertuples(index=False, name=None):
+            escritor.escrever(ProdutoBruto(*linha))
+            mantidas += 1
+    return mantidas
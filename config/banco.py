@@ -0,0 +1,107 @@
+"""
+Banco
+=====
+Saída opcional em SQLite, atualizada produto a produto durante a coleta.
+A tabela 'produtos' usa a URL canônica como chave (upsert com ON CONFLICT)
+e 'metadados_coleta' guarda, por URL, quando e como o produto foi
+coletado. O banco fica em modo WAL, então pode ser consultado enquanto a
+coleta está em andamento.
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Optional, Union
+from .produto import CAMPOS, CAMPOS_NUTRIENTES
+
+# Arquivo padrão do banco
+CAMINHO_BANCO = 'dados/produtos.sqlite'
+
+_COLUNAS_PRODUTOS = ',\n    '.join(
+    ['url TEXT PRIMARY KEY']
+    + [f"{campo} {'REAL' if campo in CAMPOS_NUTRIENTES else 'TEXT'}" for campo in CAMPOS if campo != 'url']
+    + ['atualizado_em TEXT NOT NULL'])
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS produtos (
+    {_COLUNAS_PRODUTOS}
+);
+CREATE INDEX IF NOT EXISTS idx_produtos_nome ON produtos (nome);
+CREATE INDEX IF NOT EXISTS idx_produtos_categoria ON produtos (categoria);
+CREATE TABLE IF NOT EXISTS metadados_coleta (
+    url TEXT PRIMARY KEY,
+    coletado_em TEXT NOT NULL,
+    nivel TEXT,
+    duracao REAL,
+    erro TEXT
+);
+"""
+
+_CAMPOS_UPSERT = list(CAMPOS) + ['atualizado_em']
+
+SQL_UPSERT_PRODUTO = (
+    f"INSERT INTO produtos ({', '.join(_CAMPOS_UPSERT)}) "
+    f"VALUES ({', '.join('?' for _ in _CAMPOS_UPSERT)}) "
+    f"ON CONFLICT(url) DO UPDATE SET "
+    + ', '.join(f"{campo} = excluded.{campo}" for campo in _CAMPOS_UPSERT if campo != 'url'))
+
+SQL_UPSERT_METADADOS = (
+    "INSERT INTO metadados_coleta (url, coletado_em, nivel, duracao, erro) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(url) DO UPDATE SET coletado_em = excluded.coletado_em, nivel = excluded.nivel, "
+    "duracao = excluded.duracao, erro = excluded.erro")
+
+def _agora() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+class SaidaSqlite:
+    """
+    Banco SQLite com os produtos e os metadados de coleta
+
+    Uso:
+        with SaidaSqlite('dados/produtos.sqlite') as banco:
+            banco.gravar_produto(produto)
+            banco.gravar_metadados(url, 'dom', 0.4)
+    """
+
+    def __init__(self, caminho: str = CAMINHO_BANCO):
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self.caminho = caminho
+        # Cada gravação é confirmada imediatamente (leitores veem o produto na hora)
+        self.conexao = sqlite3.connect(caminho, isolation_level=None)
+        self.conexao.execute('PRAGMA journal_mode=WAL')
+        self.conexao.execute('PRAGMA synchronous=NORMAL')
+        self.conexao.executescript(ESQUEMA)
+        # Bancos criados antes de uma coluna existir (ex.: status) recebem a coluna vazia
+        existentes = {coluna[1] for coluna in self.conexao.execute('PRAGMA table_info(produtos)')}
+        for campo in CAMPOS:
+            if campo not in existentes:
+                tipo = 'REAL' if campo in CAMPOS_NUTRIENTES else 'TEXT'
+                self.conexao.execute(f"ALTER TABLE produtos ADD COLUMN {campo} {tipo}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastro):
+        self.fechar()
+        return False
+
+    def gravar_produto(self, produto: Union[Dict, tuple]):
+        """Insere ou atualiza o produto (tupla na ordem de CAMPOS ou dicionário)"""
+        if not isinstance(produto, dict):
+            produto = dict(zip(CAMPOS, produto))
+        valores = [produto.get(campo) for campo in CAMPOS]
+        # NaN vira NULL
+        valores = [None if valor != valor else valor for valor in valores]
+        self.conexao.execute(SQL_UPSERT_PRODUTO, valores + [_agora()])
+
+    def gravar_metadados(self, url: str, nivel: Optional[str], duracao: Optional[float],
+                         erro: Optional[str] = None):
+        """Registra quando e com qual nível a URL foi coletada (e o erro, se houve)"""
+        self.conexao.execute(SQL_UPSERT_METADADOS, (url, _agora(), nivel, duracao, erro))
+
+    def fechar(self):
+        if self.conexao is not None:
+            self.conexao.close()
+            self.conexao = None
@@ -0,0 +1,73 @@
+"""
+Benchmark dos Parsers
+=====================
+Mede o tempo de interpretação de um conjunto de páginas salvas com cada
+backend disponível em config/parsers.py.
+
+Uso:
+    python -m config.bench_parsers dados/paginas --repeticoes 5
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List
+from .parsers import BACKENDS, interpretar_html
+
+def carregar_corpus(diretorio: str) -> List[str]:
+    """Lê todos os arquivos .html do diretório (recursivamente)"""
+    paginas = []
+    for raiz, _, arquivos in os.walk(diretorio):
+        for arquivo in sorted(arquivos):
+            if arquivo.endswith(('.html', '.htm')):
+                with open(os.path.join(raiz, arquivo), 'r', encoding='utf-8', errors='replace') as f:
+                    paginas.append(f.read())
+    return paginas
+
+def consultar_pagina(pagina):
+    """Executa todas as consultas usadas pelos extratores e pelo coletor"""
+    pagina.titulo()
+    pagina.tabela_nutricional()
+    pagina.links_produtos()
+    pagina.links_fotos_produtos()
+    pagina.pagina_vazia()
+    pagina.json_ld()
+    pagina.og_titulo()
+    pagina.blobs_mage_init()
+
+def medir_backend(backend: str, paginas: List[str], repeticoes: int) -> float:
+    """Retorna o melhor tempo (em segundos) para interpretar e consultar todo o corpus"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for html in paginas:
+            consultar_pagina(interpretar_html(html, backend))
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def executar_benchmark(diretorio: str, repeticoes: int = 3) -> Dict[str, float]:
+    """Executa o benchmark e imprime uma tabela comparativa"""
+    paginas = carregar_corpus(diretorio)
+    if not paginas:
+        print(f"Nenhuma página .html encontrada em '{diretorio}'")
+        return {}
+
+    tamanho_mb = sum(len(html) for html in paginas) / (1024 * 1024)
+    print(f"\nCorpus: {len(paginas)} páginas ({tamanho_mb:.1f} MB), {repeticoes} repetições")
+    print("=" * 60)
+
+    tempos = {backend: medir_backend(backend, paginas, repeticoes) for backend in BACKENDS}
+    mais_lento = max(tempos.values())
+    for backend, tempo in sorted(tempos.items(), key=lambda item: item[1]):
+        print(f"{backend:>6}: {tempo:8.3f}s  {len(paginas) / tempo:10.1f} páginas/s  "
+              f"{mais_lento / tempo:5.1f}x")
+
+    print("=" * 60)
+    return tempos
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Benchmark dos backends de parser HTML")
+    argumentos.add_argument('diretorio', help="Diretório com páginas .html salvas")
+    argumentos.add_argument('--repeticoes', type=int, default=3, help="Repetições por backend")
+    opcoes = argumentos.parse_args()
+    executar_benchmark(opcoes.diretorio, opcoes.repeticoes)
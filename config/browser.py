@@ -11,18 +11,17 @@ Suporta Chrome, Firefox, Edge e Opera nos sistemas Windows e Linux.
 import os
 import sys
 import subprocess
-from typing import Dict, Optional, Tuple
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from webdriver_manager.opera import OperaDriverManager
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # psutil é opcional (usado para medir a memória do navegador)
+    psutil = None
+
+# O Selenium e os gerenciadores de WebDriver são importados em setup_driver,
+# apenas para o navegador escolhido
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 class BrowserManager:
     """Gerenciador de navegadores para automação web"""
@@ -123,13 +122,16 @@ class BrowserManager:
         return browsers
 
     @staticmethod
-    def setup_driver(browser_type: str = None, headless: bool = True) -> Tuple[Optional[webdriver.Remote], str]:
+    def setup_driver(browser_type: str = None, headless: bool = True,
+                     capturar_rede: bool = False) -> Tuple[Optional['webdriver.Remote'], str]:
         """
         Configura e retorna um driver do Selenium para o navegador especificado
         
         Args:
             browser_type: Tipo de navegador ('chrome', 'firefox', 'edge', 'opera')
             headless: Se True, executa o navegador em modo headless
+            capturar_rede: Se True, habilita o log 'performance' (eventos de rede
+                do DevTools Protocol) nos navegadores baseados no Chromium
         
         Returns:
             Tupla (driver, browser_name) ou (None, error_message)
@@ -147,16 +149,26 @@ class BrowserManager:
             return None, f"Navegador {browser_type} não encontrado no sistema"
         
         try:
+            from selenium import webdriver
+            
             if browser_type == 'chrome':
+                from selenium.webdriver.chrome.service import Service as ChromeService
+                from selenium.webdriver.chrome.options import Options as ChromeOptions
+                from webdriver_manager.chrome import ChromeDriverManager
                 options = ChromeOptions()
                 if headless:
                     options.add_argument('--headless')
                 options.add_argument('--no-sandbox')
                 options.add_argument('--disable-dev-shm-usage')
+                if capturar_rede:
+                    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
                 service = ChromeService(ChromeDriverManager().install())
                 driver = webdriver.Chrome(service=service, options=options)
                 
             elif browser_type == 'firefox':
+                from selenium.webdriver.firefox.service import Service as FirefoxService
+                from selenium.webdriver.firefox.options import Options as FirefoxOptions
+                from webdriver_manager.firefox import GeckoDriverManager
                 options = FirefoxOptions()
                 if headless:
                     options.add_argument('--headless')
@@ -164,17 +176,27 @@ class BrowserManager:
                 driver = webdriver.Firefox(service=service, options=options)
                 
             elif browser_type == 'edge':
+                from selenium.webdriver.edge.service import Service as EdgeService
+                from selenium.webdriver.edge.options import Options as EdgeOptions
+                from webdriver_manager.microsoft import EdgeChromiumDriverManager
                 options = EdgeOptions()
                 if headless:
                     options.add_argument('--headless')
+                if capturar_rede:
+                    options.set_capability('ms:loggingPrefs', {'performance': 'ALL'})
                 service = EdgeService(EdgeChromiumDriverManager().install())
                 driver = webdriver.Edge(service=service, options=options)
                 
             elif browser_type == 'opera':
+                from selenium.webdriver.chrome.service import Service as ChromeService
+                from selenium.webdriver.chrome.options import Options as ChromeOptions
+                from webdriver_manager.opera import OperaDriverManager
                 options = ChromeOptions()
                 if headless:
                     options.add_argument('--headless')
                 options.add_argument('--no-sandbox')
+                if capturar_rede:
+                    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
                 service = ChromeService(OperaDriverManager().install())
                 driver = webdriver.Chrome(service=service, options=options)
             
@@ -203,6 +225,122 @@ class BrowserManager:
         
         print("\n" + "=" * 50)
 
+class DriverReciclavel:
+    """
+    WebDriver que reinicia o navegador automaticamente após um número de
+    páginas ou quando a memória (RSS) do navegador passa de um limite.
+    
+    Os demais atributos e métodos são repassados ao driver atual, então o
+    objeto pode ser usado no lugar de um WebDriver comum.
+    """
+    
+    def __init__(self, browser_type: str = None, headless: bool = True,
+                 max_paginas: Optional[int] = 100, max_memoria_mb: Optional[float] = 1500,
+                 fabrica: Optional[Callable[[], Tuple]] = None, capturar_rede: bool = False):
+        """
+        Args:
+            browser_type: Tipo de navegador (ver BrowserManager.setup_driver)
+            headless: Se True, executa o navegador em modo headless
+            max_paginas: Páginas servidas antes de reiniciar (None desativa)
+            max_memoria_mb: RSS do navegador, em MB, acima do qual ele é reiniciado
+                (None desativa; requer psutil)
+            fabrica: Função que retorna (driver, nome); padrão: BrowserManager.setup_driver
+            capturar_rede: Habilita o log de rede em cada navegador iniciado
+        """
+        self.fabrica = fabrica or (lambda: BrowserManager.setup_driver(browser_type, headless, capturar_rede))
+        self.max_paginas = max_paginas
+        self.max_memoria_mb = max_memoria_mb
+        self.driver = None
+        self.browser_name = None
+        self.paginas = 0
+        self.reinicios = 0
+        self.url_atual = None
+        self.timeout_carregamento = None
+        self.iniciar()
+    
+    def iniciar(self):
+        """Inicia um novo navegador"""
+        driver, browser_name = self.fabrica()
+        if driver is None:
+            raise RuntimeError(browser_name)
+        self.driver = driver
+        self.browser_name = browser_name
+        self.paginas = 0
+        if self.timeout_carregamento is not None:
+            driver.set_page_load_timeout(self.timeout_carregamento)
+    
+    def set_page_load_timeout(self, segundos: float):
+        """Timeout de carregamento do navegador atual, reaplicado a cada navegador reiniciado"""
+        self.timeout_carregamento = segundos
+        self.driver.set_page_load_timeout(segundos)
+    
+    def memoria_mb(self) -> Optional[float]:
+        """Soma o RSS do processo do driver e de todos os seus filhos (navegador, renderizadores)"""
+        if psutil is None:
+            return None
+        try:
+            processo = psutil.Process(self.driver.service.process.pid)
+            processos = [processo] + processo.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return None
+        total = 0
+        for proc in processos:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    
+    def motivo_reciclagem(self) -> Optional[str]:
+        """Retorna o motivo para reiniciar o navegador, ou None se ainda não é necessário"""
+        if self.max_paginas and self.paginas >= self.max_paginas:
+            return f"{self.paginas} páginas servidas"
+        if self.max_memoria_mb:
+            memoria = self.memoria_mb()
+            if memoria is not None and memoria >= self.max_memoria_mb:
+                return f"{memoria:.0f} MB de memória"
+        return None
+    
+    def reciclar(self, reabrir: bool = True, motivo: str = "solicitado"):
+        """
+        Fecha o navegador atual e inicia um novo
+        
+        Args:
+            reabrir: Se True, volta para a URL que estava aberta
+        """
+        print(f"Reiniciando navegador ({motivo})...")
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.iniciar()
+        self.reinicios += 1
+        if reabrir and self.url_atual:
+            self.driver.get(self.url_atual)
+            self.paginas += 1
+    
+    def get(self, url: str):
+        """Navega para a URL, reiniciando o navegador antes se algum limite foi atingido"""
+        motivo = self.motivo_reciclagem()
+        if motivo:
+            # Entre duas páginas não há estado a preservar: a nova URL é aberta no navegador novo
+            self.reciclar(reabrir=False, motivo=motivo)
+        self.driver.get(url)
+        self.url_atual = url
+        self.paginas += 1
+    
+    def quit(self):
+        """Fecha o navegador"""
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+    
+    def __getattr__(self, nome):
+        driver = self.__dict__.get('driver')
+        if driver is None:
+            raise AttributeError(nome)
+        return getattr(driver, nome)
+
 if __name__ == "__main__":
     # Exemplo de uso
     BrowserManager.print_browser_info()
@@ -0,0 +1,156 @@
+"""
+Catalog API
+===========
+Cliente da API GraphQL do Magento usada pela loja Essential Nutrition.
+Permite listar produtos de uma categoria e buscar atributos de vários
+produtos em lote, com páginas de até 100 itens por requisição.
+"""
+
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import requests
+
+# Endpoint padrão da API (pode ser trocado por um servidor local de teste)
+GRAPHQL_URL = 'https://www.essentialnutrition.com.br/graphql'
+
+# Quantidade máxima de itens por página aceita pela API
+TAMANHO_PAGINA = 100
+
+CAMPOS_PRODUTO = """
+fragment CamposProduto on ProductInterface {
+  name
+  sku
+  url_key
+  url_suffix
+  canonical_url
+  categories { name url_path }
+  description { html }
+  short_description { html }
+}
+"""
+
+CONSULTA_CATEGORIA = """
+query Categoria($urlPath: String!) {
+  categoryList(filters: {url_path: {eq: $urlPath}}) { uid name url_path }
+}
+"""
+
+CONSULTA_PRODUTOS_CATEGORIA = """
+query ProdutosCategoria($uid: String!, $tamanho: Int!, $pagina: Int!) {
+  products(filter: {category_uid: {eq: $uid}}, pageSize: $tamanho, currentPage: $pagina) {
+    total_count
+    page_info { current_page total_pages }
+    items { ...CamposProduto }
+  }
+}
+""" + CAMPOS_PRODUTO
+
+CONSULTA_PRODUTOS_URL = """
+query ProdutosPorUrl($urlKeys: [String], $tamanho: Int!) {
+  products(filter: {url_key: {in: $urlKeys}}, pageSize: $tamanho) {
+    items { ...CamposProduto }
+  }
+}
+""" + CAMPOS_PRODUTO
+
+class ErroCatalogoAPI(Exception):
+    """Erro de comunicação ou resposta inválida da API do catálogo"""
+
+def criar_sessao_api() -> requests.Session:
+    """Cria uma sessão HTTP reaproveitável para as consultas GraphQL"""
+    sessao = requests.Session()
+    sessao.headers.update({
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+    })
+    return sessao
+
+def consultar_graphql(sessao, consulta: str, variaveis: Optional[Dict] = None,
+                      url: str = GRAPHQL_URL, timeout: int = 30) -> Dict:
+    """
+    Executa uma consulta GraphQL e retorna o campo 'data' da resposta
+
+    Raises:
+        ErroCatalogoAPI: se a requisição falhar ou a API retornar erros
+    """
+    try:
+        resposta = sessao.post(url, json={'query': consulta, 'variables': variaveis or {}}, timeout=timeout)
+        resposta.raise_for_status()
+        corpo = resposta.json()
+    except (requests.RequestException, ValueError) as e:
+        raise ErroCatalogoAPI(f"Falha ao consultar {url}: {e}") from e
+
+    if corpo.get('errors'):
+        mensagens = '; '.join(erro.get('message', str(erro)) for erro in corpo['errors'])
+        raise ErroCatalogoAPI(f"API retornou erros: {mensagens}")
+
+    return corpo.get('data') or {}
+
+def url_key_de(url: str) -> str:
+    """Extrai a url_key do Magento a partir da URL do produto"""
+    caminho = urlparse(url).path.strip('/')
+    url_key = caminho.rsplit('/', 1)[-1]
+    if url_key.endswith('.html'):
+        url_key = url_key[:-len('.html')]
+    return url_key
+
+def url_produto(item: Dict, url_base: str) -> str:
+    """Monta a URL pública de um produto retornado pela API"""
+    canonica = item.get('canonical_url') or ''
+    if canonica.startswith('http'):
+        return canonica
+    if not canonica:
+        canonica = f"{item.get('url_key', '')}{item.get('url_suffix') or ''}"
+    return f"{url_base.rstrip('/')}/{canonica.lstrip('/')}"
+
+def listar_urls_categoria(sessao, url_categoria: str, url: str = GRAPHQL_URL,
+                          tamanho_pagina: int = TAMANHO_PAGINA) -> List[str]:
+    """Lista as URLs de todos os produtos de uma categoria via API"""
+    partes = urlparse(url_categoria)
+    url_base = f"{partes.scheme}://{partes.netloc}"
+
+    dados = consultar_graphql(sessao, CONSULTA_CATEGORIA, {'urlPath': partes.path.strip('/')}, url=url)
+    categorias = dados.get('categoryList') or []
+    if not categorias:
+        raise ErroCatalogoAPI(f"Categoria não encontrada na API: {url_categoria}")
+    uid = categorias[0]['uid']
+
+    urls = []
+    pagina = 1
+    while True:
+        dados = consultar_graphql(sessao, CONSULTA_PRODUTOS_CATEGORIA,
+                                  {'uid': uid, 'tamanho': tamanho_pagina, 'pagina': pagina}, url=url)
+        produtos = dados.get('products') or {}
+        itens = produtos.get('items') or []
+        urls.extend(url_produto(item, url_base) for item in itens)
+
+        total_paginas = (produtos.get('page_info') or {}).get('total_pages') or 1
+        if not itens or pagina >= total_paginas:
+            break
+        pagina += 1
+
+    return urls
+
+def buscar_produtos(sessao, urls: List[str], url: str = GRAPHQL_URL,
+                    tamanho_lote: int = TAMANHO_PAGINA) -> Dict[str, Dict]:
+    """
+    Busca os atributos de vários produtos em lote
+
+    Returns:
+        Dicionário {url: item da API}; URLs não encontradas ficam de fora
+    """
+    urls_por_chave = {}
+    for url_original in urls:
+        urls_por_chave.setdefault(url_key_de(url_original), []).append(url_original)
+
+    chaves = list(urls_por_chave)
+    produtos = {}
+    for inicio in range(0, len(chaves), tamanho_lote):
+        lote = chaves[inicio:inicio + tamanho_lote]
+        dados = consultar_graphql(sessao, CONSULTA_PRODUTOS_URL,
+                                  {'urlKeys': lote, 'tamanho': tamanho_lote}, url=url)
+        for item in (dados.get('products') or {}).get('items') or []:
+            for url_original in urls_por_chave.get(item.get('url_key'), []):
+                produtos[url_original] = item
+
+    return produtos
@@ -0,0 +1,180 @@
+"""
+Consulta
+========
+Motor de consultas em memória sobre o CSV numérico da coleta. O arquivo é
+lido uma vez para arrays NumPy contíguos (um por coluna), com índices
+ordenados por nutriente e por razões derivadas (proteína por kcal e
+valores por 100 g). Intervalos usam busca binária, filtros usam máscaras
+vetorizadas e o arquivo é recarregado quando sua data de modificação muda.
+
+Uso:
+    python -m config.consulta --ordenar proteina_por_kcal --k 10 --categoria PROTEINAS --filtro acucares=:5
+"""
+
+import argparse
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .produto import CAMPOS_NUTRIENTES, CAMPOS_TEXTO
+
+# Arquivo consultado por padrão
+CAMINHO_DADOS = 'dados/csv/dados_nutricionais.csv'
+
+# Gramas da porção no texto do cabeçalho (ex.: "Porção: 25g (1 sachê)")
+PADRAO_GRAMAS = re.compile(r'(\d+(?:[.,]\d+)?)\s*g\b', re.IGNORECASE)
+
+# Intervalo (mínimo, máximo) de um filtro; None deixa o lado aberto
+Intervalo = Tuple[Optional[float], Optional[float]]
+
+def gramas_porcao(porcao: str) -> float:
+    """Extrai o peso da porção em gramas; NaN se não houver"""
+    encontrado = PADRAO_GRAMAS.search(porcao or '')
+    if not encontrado:
+        return np.nan
+    return float(encontrado.group(1).replace(',', '.'))
+
+class IndiceOrdenado:
+    """Valores de uma coluna ordenados (sem NaN) e as posições das linhas correspondentes"""
+
+    def __init__(self, valores: np.ndarray):
+        validos = np.flatnonzero(~np.isnan(valores))
+        ordem = np.argsort(valores[validos], kind='stable')
+        self.linhas = validos[ordem]
+        self.valores = valores[self.linhas]
+
+    def intervalo(self, minimo: Optional[float] = None, maximo: Optional[float] = None) -> np.ndarray:
+        """Linhas com minimo <= valor <= maximo, em ordem crescente de valor"""
+        inicio = 0 if minimo is None else np.searchsorted(self.valores, minimo, side='left')
+        fim = len(self.valores) if maximo is None else np.searchsorted(self.valores, maximo, side='right')
+        return self.linhas[inicio:fim]
+
+class MotorConsulta:
+    """
+    Dados de uma coleta em arrays NumPy, com índices ordenados por coluna numérica
+
+    Uso:
+        motor = MotorConsulta()
+        motor.top_k('proteina_por_kcal', 10, categoria='PROTEINAS', filtros={'acucares': (None, 5)})
+    """
+
+    def __init__(self, caminho: str = CAMINHO_DADOS):
+        self.caminho = caminho
+        self.mtime = None
+        self.total = 0
+        self.texto: Dict[str, np.ndarray] = {}
+        self.numeros: Dict[str, np.ndarray] = {}
+        self.indices: Dict[str, IndiceOrdenado] = {}
+        self.por_categoria: Dict[str, np.ndarray] = {}
+        self.atualizar()
+
+    def atualizar(self) -> bool:
+        """Recarrega o arquivo se a data de modificação mudou; retorna True se recarregou"""
+        mtime = os.stat(self.caminho).st_mtime_ns
+        if mtime == self.mtime:
+            return False
+        self._carregar()
+        self.mtime = mtime
+        return True
+
+    def _carregar(self):
+        df = pd.read_csv(self.caminho, dtype={campo: 'object' for campo in CAMPOS_TEXTO})
+        self.total = len(df)
+        self.texto = {campo: df[campo].fillna('').to_numpy(dtype=object) if campo in df else
+                      np.full(self.total, '', dtype=object) for campo in CAMPOS_TEXTO}
+
+        numeros = {}
+        for campo in CAMPOS_NUTRIENTES:
+            coluna = df[campo] if campo in df else pd.Series(np.nan, index=df.index)
+            numeros[campo] = np.ascontiguousarray(pd.to_numeric(coluna, errors='coerce'), dtype=np.float64)
+
+        # Razões derivadas (NaN quando o denominador é zero ou ausente)
+        gramas = np.array([gramas_porcao(porcao) for porcao in self.texto['porcao']], dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calorias = np.where(numeros['calorias'] > 0, numeros['calorias'], np.nan)
+            numeros['proteina_por_kcal'] = numeros['proteinas'] / calorias
+            gramas = np.where(gramas > 0, gramas, np.nan)
+            for campo in CAMPOS_NUTRIENTES:
+                numeros[f'{campo}_100g'] = numeros[campo] * 100.0 / gramas
+        self.numeros = numeros
+        self.indices = {campo: IndiceOrdenado(valores) for campo, valores in numeros.items()}
+
+        categorias = self.texto['categoria']
+        unicas, grupos = np.unique(categorias.astype(str), return_inverse=True)
+        ordem = np.argsort(grupos, kind='stable')
+        limites = np.searchsorted(grupos[ordem], np.arange(len(unicas) + 1))
+        self.por_categoria = {categoria: ordem[limites[i]:limites[i + 1]] for i, categoria in enumerate(unicas)}
+
+    @property
+    def colunas(self) -> List[str]:
+        """Colunas numéricas consultáveis (nutrientes e razões derivadas)"""
+        return list(self.numeros)
+
+    def _coluna(self, nome: str) -> IndiceOrdenado:
+        if nome not in self.indices:
+            raise ValueError(f"Coluna desconhecida: {nome}")
+        return self.indices[nome]
+
+    def intervalo(self, coluna: str, minimo: Optional[float] = None, maximo: Optional[float] = None) -> np.ndarray:
+        """Linhas com a coluna dentro do intervalo (busca binária no índice ordenado)"""
+        self.atualizar()
+        return self._coluna(coluna).intervalo(minimo, maximo)
+
+    def mascara(self, categoria: Optional[str] = None, filtros: Optional[Dict[str, Intervalo]] = None) -> np.ndarray:
+        """Máscara booleana das linhas na categoria e dentro de todos os intervalos"""
+        self.atualizar()
+        mascara = np.ones(self.total, dtype=bool)
+        if categoria is not None:
+            mascara[:] = False
+            mascara[self.por_categoria.get(categoria, np.empty(0, dtype=np.intp))] = True
+        for coluna, (minimo, maximo) in (filtros or {}).items():
+            dentro = np.zeros(self.total, dtype=bool)
+            dentro[self._coluna(coluna).intervalo(minimo, maximo)] = True
+            mascara &= dentro
+        return mascara
+
+    def filtrar(self, categoria: Optional[str] = None, filtros: Optional[Dict[str, Intervalo]] = None) -> List[Dict]:
+        """Produtos na categoria e dentro de todos os intervalos, na ordem do arquivo"""
+        return self.registros(np.flatnonzero(self.mascara(categoria, filtros)))
+
+    def top_k(self, coluna: str, k: int = 10, categoria: Optional[str] = None,
+              filtros: Optional[Dict[str, Intervalo]] = None, decrescente: bool = True) -> List[Dict]:
+        """Os k produtos com maior (ou menor) valor na coluna, respeitando os filtros"""
+        self.atualizar()
+        linhas = self._coluna(coluna).linhas
+        if decrescente:
+            linhas = linhas[::-1]
+        if categoria is not None or filtros:
+            linhas = linhas[self.mascara(categoria, filtros)[linhas]]
+        return self.registros(linhas[:k])
+
+    def registros(self, linhas: np.ndarray) -> List[Dict]:
+        """Monta dicionários apenas para as linhas pedidas"""
+        resultado = []
+        for linha in linhas.tolist():
+            registro = {campo: valores[linha] for campo, valores in self.texto.items()}
+            registro.update({campo: float(valores[linha]) for campo, valores in self.numeros.items()})
+            resultado.append(registro)
+        return resultado
+
+def interpretar_filtro(texto: str) -> Tuple[str, Intervalo]:
+    """Converte 'coluna=min:max' (lados opcionais) em (coluna, (min, max))"""
+    coluna, _, faixa = texto.partition('=')
+    minimo, _, maximo = faixa.partition(':')
+    return coluna, (float(minimo) if minimo else None, float(maximo) if maximo else None)
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Consulta os dados nutricionais em memória")
+    argumentos.add_argument('--arquivo', default=CAMINHO_DADOS, help="CSV numérico da coleta")
+    argumentos.add_argument('--ordenar', default='proteina_por_kcal', help="Coluna usada no top-k")
+    argumentos.add_argument('--k', type=int, default=10, help="Quantidade de produtos")
+    argumentos.add_argument('--categoria', help="Categoria dos produtos")
+    argumentos.add_argument('--filtro', action='append', default=[], help="Intervalo coluna=min:max")
+    argumentos.add_argument('--crescente', action='store_true', help="Menores valores primeiro")
+    opcoes = argumentos.parse_args()
+
+    motor = MotorConsulta(opcoes.arquivo)
+    filtros = dict(interpretar_filtro(filtro) for filtro in opcoes.filtro)
+    for produto in motor.top_k(opcoes.ordenar, opcoes.k, opcoes.categoria, filtros, not opcoes.crescente):
+        print(f"{produto[opcoes.ordenar]:10.3f}  {produto['nome']}  ({produto['categoria']})")
@@ -0,0 +1,173 @@
+"""
+Conversão
+=========
+Etapa pós-coleta que converte os textos brutos das tabelas nutricionais em
+números, coluna a coluna, com operações vetorizadas do pandas. Entende
+decimais com vírgula, separador de milhar, "traços" e limites como "<0,1",
+e gera um relatório das células que não puderam ser convertidas.
+
+Uso (reconverter um arquivo bruto já salvo, sem nova coleta):
+    python -m config.conversao dados/csv/dados_nutricionais_bruto.csv
+"""
+
+import argparse
+import math
+import os
+import re
+from typing import Dict, Iterable, Tuple
+import pandas as pd
+from .produto import CAMPOS, CAMPOS_NUTRIENTES, ProdutoBruto, ProdutoNutricional, para_colunas
+from .writer import EscritorStreaming
+
+# Arquivo com os textos brutos gravados durante a coleta
+CAMINHO_BRUTO = 'dados/csv/dados_nutricionais_bruto.csv'
+
+# Relatório das células com conversão problemática
+CAMINHO_RELATORIO = 'dados/csv/falhas_conversao.csv'
+
+# Textos que indicam quantidade não significativa (convertidos para 0.0)
+TEXTOS_TRACOS = ['tr', 'tr.', 'traço', 'traços', 'traco', 'tracos', '-', '–', '—',
+                 'não contém', 'nao contem', 'zero']
+
+# Limite opcional ("<", "≤", "menor que") seguido do primeiro número da célula
+PADRAO_NUMERO = (r'^(?P<limite><|≤|menor que|inferior a)?\s*'
+                 r'(?P<numero>\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:[.,]\d+)?)')
+
+# Números com separador de milhar no formato brasileiro (ex.: 1.234 ou 1.234,5)
+PADRAO_MILHAR = r'\d{1,3}(?:\.\d{3})+(?:,\d+)?'
+
+COLUNAS_RELATORIO = ['url', 'campo', 'bruto', 'status']
+
+_REGEX_NUMERO = re.compile(PADRAO_NUMERO)
+_REGEX_MILHAR = re.compile(PADRAO_MILHAR)
+_TRACOS = frozenset(TEXTOS_TRACOS)
+
+def converter_serie_br(serie: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Converte uma coluna de textos no formato brasileiro para float
+
+    Returns:
+        Tupla (valores, status). Status de cada célula: 'ok', 'vazio' (sem
+        valor, NaN), 'tracos' (0.0), 'limite' (ex.: "<0,1" vira 0.1) ou
+        'falha' (texto não reconhecido, NaN)
+    """
+    texto = serie.fillna('').astype(str).str.strip().str.lower()
+    partes = texto.str.extract(PADRAO_NUMERO)
+    numero = partes['numero']
+
+    milhar = numero.str.fullmatch(PADRAO_MILHAR).fillna(False).astype(bool)
+    numero = numero.where(~milhar, numero.str.replace('.', '', regex=False))
+    valores = pd.to_numeric(numero.str.replace(',', '.', regex=False), errors='coerce')
+
+    vazio = texto == ''
+    tracos = texto.isin(TEXTOS_TRACOS)
+    valores = valores.mask(tracos, 0.0)
+
+    status = pd.Series('ok', index=serie.index)
+    status = status.mask(partes['limite'].notna() & valores.notna(), 'limite')
+    status = status.mask(tracos, 'tracos')
+    status = status.mask(valores.isna(), 'falha')
+    status = status.mask(vazio, 'vazio')
+    return valores.astype('float64'), status
+
+def converter_dataframe(df_bruto: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Converte todas as colunas de nutrientes de um DataFrame de textos brutos
+
+    Returns:
+        Tupla (df_numerico, relatorio) com as células em 'falha', 'limite' ou 'tracos'
+    """
+    df = df_bruto.reindex(columns=list(CAMPOS)).fillna('')
+    relatorios = []
+    for campo in CAMPOS_NUTRIENTES:
+        valores, status = converter_serie_br(df[campo])
+        relevantes = status.isin(['falha', 'limite', 'tracos'])
+        if relevantes.any():
+            relatorios.append(pd.DataFrame({
+                'url': df.loc[relevantes, 'url'],
+                'campo': campo,
+                'bruto': df.loc[relevantes, campo],
+                'status': status[relevantes],
+            }))
+        df[campo] = valores
+
+    relatorio = pd.concat(relatorios, ignore_index=True) if relatorios else pd.DataFrame(columns=COLUNAS_RELATORIO)
+    return df, relatorio
+
+def converter_registros(registros: Iterable[ProdutoBruto]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Converte uma lista de registros brutos (ver converter_dataframe)"""
+    return converter_dataframe(pd.DataFrame(para_colunas(registros)))
+
+def converter_texto_br(texto) -> float:
+    """Versão escalar de converter_serie_br para uma única célula (NaN se vazia ou não reconhecida)"""
+    texto = str(texto or '').strip().lower()
+    if texto in _TRACOS:
+        return 0.0
+    encontrado = _REGEX_NUMERO.match(texto)
+    if not encontrado:
+        return math.nan
+    numero = encontrado.group('numero')
+    if _REGEX_MILHAR.fullmatch(numero):
+        numero = numero.replace('.', '')
+    return float(numero.replace(',', '.'))
+
+def converter_produto(produto: ProdutoBruto) -> ProdutoNutricional:
+    """
+    Converte um único registro bruto em ProdutoNutricional
+
+    Usada produto a produto durante a coleta (banco SQLite); não passa pelo
+    pandas e dá o mesmo resultado de converter_dataframe.
+    """
+    dados = produto._asdict()
+    for campo in CAMPOS_NUTRIENTES:
+        dados[campo] = converter_texto_br(dados[campo])
+    return ProdutoNutricional(**dados)
+
+def resumir_relatorio(relatorio: pd.DataFrame):
+    """Exibe quantas células caíram em cada status relevante"""
+    if relatorio.empty:
+        print("Conversão numérica: todas as células convertidas sem ressalvas")
+        return
+    print("Conversão numérica:")
+    for status, quantidade in relatorio['status'].value_counts().items():
+        print(f"  {status}: {quantidade} células")
+
+def converter_arquivo(caminho_bruto: str = CAMINHO_BRUTO, destinos: Dict[str, str] = None,
+                      caminho_relatorio: str = CAMINHO_RELATORIO, tamanho_bloco: int = 1000) -> int:
+    """
+    Converte um CSV de textos brutos em blocos e grava as saídas numéricas
+
+    Args:
+        caminho_bruto: CSV gravado durante a coleta
+        destinos: {formato: caminho} das saídas numéricas
+        caminho_relatorio: CSV com as células problemáticas
+        tamanho_bloco: Linhas lidas por vez (mantém a memória limitada)
+
+    Returns:
+        Número de produtos convertidos
+    """
+    destinos = destinos or {'csv': 'dados/csv/dados_nutricionais.csv'}
+    blocos = pd.read_csv(caminho_bruto, dtype=str, keep_default_na=False, chunksize=tamanho_bloco)
+
+    relatorios = []
+    with EscritorStreaming(destinos, CAMPOS, tamanho_lote=tamanho_bloco) as escritor:
+        for bloco in blocos:
+            df, relatorio = converter_dataframe(bloco)
+            for linha in df.itertuples(index=False, name=None):
+                escritor.escrever(linha)
+            if not relatorio.empty:
+                relatorios.append(relatorio)
+
+    relatorio = pd.concat(relatorios, ignore_index=True) if relatorios else pd.DataFrame(columns=COLUNAS_RELATORIO)
+    os.makedirs(os.path.dirname(caminho_relatorio) or '.', exist_ok=True)
+    relatorio.to_csv(caminho_relatorio, index=False, encoding='utf-8')
+    resumir_relatorio(relatorio)
+    return escritor.total
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Converte os textos brutos da coleta em números")
+    argumentos.add_argument('bruto', nargs='?', default=CAMINHO_BRUTO, help="CSV com os textos brutos")
+    argumentos.add_argument('--saida', default='dados/csv/dados_nutricionais.csv', help="CSV numérico de saída")
+    opcoes = argumentos.parse_args()
+    total = converter_arquivo(opcoes.bruto, {'csv': opcoes.saida})
+    print(f"{total} produtos convertidos em '{opcoes.saida}'")
@@ -0,0 +1,125 @@
+"""
+Delta
+=====
+Compara o conjunto de dados de uma coleta com o da coleta anterior, usando
+a URL canônica como chave, e grava apenas as diferenças: produtos
+adicionados, removidos e nutrientes alterados (valor anterior e novo).
+
+Uso (comparar dois arquivos já salvos):
+    python -m config.delta dados/csv/dados_nutricionais_anterior.csv dados/csv/dados_nutricionais.csv
+"""
+
+import argparse
+import os
+import shutil
+from typing import Dict
+import pandas as pd
+from .produto import CAMPOS, CAMPOS_NUTRIENTES, CAMPOS_TEXTO
+from .urls import canonicalizar_url
+
+# Cópia do conjunto de dados da coleta anterior
+CAMINHO_ANTERIOR = 'dados/csv/dados_nutricionais_anterior.csv'
+
+# Arquivo com as diferenças entre as duas últimas coletas
+CAMINHO_ALTERACOES = 'dados/csv/alteracoes.csv'
+
+# Campos comparados (além dos nutrientes); a URL é a chave
+CAMPOS_COMPARADOS = ['nome', 'categoria', 'porcao'] + list(CAMPOS_NUTRIENTES)
+
+COLUNAS_ALTERACOES = ['tipo', 'url', 'nome', 'campo', 'anterior', 'novo']
+
+def preservar_anterior(caminho_atual: str, caminho_anterior: str = CAMINHO_ANTERIOR) -> bool:
+    """Copia o conjunto de dados atual antes que a nova coleta o substitua"""
+    if not os.path.exists(caminho_atual):
+        return False
+    shutil.copy2(caminho_atual, caminho_anterior)
+    return True
+
+def carregar_conjunto(caminho: str) -> pd.DataFrame:
+    """Lê um CSV numérico e indexa pela URL canônica (uma linha por URL)"""
+    df = pd.read_csv(caminho, dtype={campo: 'object' for campo in CAMPOS_TEXTO})
+    df = df.reindex(columns=list(CAMPOS))
+    df['url'] = df['url'].fillna('').map(canonicalizar_url)
+    return df.drop_duplicates('url', keep='last').set_index('url')
+
+def hash_linhas(df: pd.DataFrame) -> pd.Series:
+    """Hash de 64 bits de cada linha, sobre os campos comparados"""
+    return pd.util.hash_pandas_object(df[CAMPOS_COMPARADOS], index=False)
+
+def calcular_delta(anterior: pd.DataFrame, atual: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula as diferenças entre dois conjuntos indexados pela URL
+
+    Returns:
+        DataFrame com as colunas COLUNAS_ALTERACOES; 'tipo' é 'adicionado',
+        'removido' ou 'alterado' (uma linha por campo alterado)
+    """
+    chaves = pd.merge(
+        hash_linhas(anterior).rename('hash_anterior'), hash_linhas(atual).rename('hash_atual'),
+        left_index=True, right_index=True, how='outer', indicator=True)
+
+    adicionados = chaves.index[chaves['_merge'] == 'right_only']
+    removidos = chaves.index[chaves['_merge'] == 'left_only']
+    em_ambos = chaves[chaves['_merge'] == 'both']
+    alterados = em_ambos.index[em_ambos['hash_anterior'] != em_ambos['hash_atual']]
+
+    partes = [
+        pd.DataFrame({'tipo': 'adicionado', 'url': adicionados, 'nome': atual.loc[adicionados, 'nome'].values}),
+        pd.DataFrame({'tipo': 'removido', 'url': removidos, 'nome': anterior.loc[removidos, 'nome'].values}),
+    ]
+
+    # Comparar campo a campo apenas as linhas cujo hash mudou
+    antes = anterior.loc[alterados, CAMPOS_COMPARADOS]
+    depois = atual.loc[alterados, CAMPOS_COMPARADOS]
+    for campo in CAMPOS_COMPARADOS:
+        diferente = ~((antes[campo] == depois[campo]) | (antes[campo].isna() & depois[campo].isna()))
+        if diferente.any():
+            urls = diferente.index[diferente]
+            partes.append(pd.DataFrame({
+                'tipo': 'alterado',
+                'url': urls,
+                'nome': depois.loc[urls, 'nome'].values,
+                'campo': campo,
+                'anterior': antes.loc[urls, campo].values,
+                'novo': depois.loc[urls, campo].values,
+            }))
+
+    return pd.concat(partes, ignore_index=True).reindex(columns=COLUNAS_ALTERACOES)
+
+def resumir_delta(delta: pd.DataFrame) -> Dict[str, int]:
+    """Conta produtos adicionados, removidos e alterados"""
+    return {
+        'adicionados': int((delta['tipo'] == 'adicionado').sum()),
+        'removidos': int((delta['tipo'] == 'removido').sum()),
+        'alterados': int(delta.loc[delta['tipo'] == 'alterado', 'url'].nunique()),
+    }
+
+def gerar_delta(caminho_anterior: str = CAMINHO_ANTERIOR, caminho_atual: str = 'dados/csv/dados_nutricionais.csv',
+                caminho_saida: str = CAMINHO_ALTERACOES):
+    """
+    Compara os dois arquivos e grava o arquivo de alterações
+
+    Returns:
+        Dicionário com as contagens (ver resumir_delta) ou None se não há coleta anterior
+    """
+    if not os.path.exists(caminho_anterior):
+        print("Nenhuma coleta anterior para comparar")
+        return None
+
+    delta = calcular_delta(carregar_conjunto(caminho_anterior), carregar_conjunto(caminho_atual))
+    os.makedirs(os.path.dirname(caminho_saida) or '.', exist_ok=True)
+    delta.to_csv(caminho_saida, index=False, encoding='utf-8')
+
+    resumo = resumir_delta(delta)
+    print(f"Alterações desde a coleta anterior: {resumo['adicionados']} adicionados, "
+          f"{resumo['removidos']} removidos, {resumo['alterados']} alterados")
+    print(f"Alterações salvas em '{caminho_saida}'")
+    return resumo
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Compara duas coletas e grava as alterações")
+    argumentos.add_argument('anterior', nargs='?', default=CAMINHO_ANTERIOR, help="CSV da coleta anterior")
+    argumentos.add_argument('atual', nargs='?', default='dados/csv/dados_nutricionais.csv', help="CSV da coleta atual")
+    argumentos.add_argument('--saida', default=CAMINHO_ALTERACOES, help="CSV de alterações")
+    opcoes = argumentos.parse_args()
+    gerar_delta(opcoes.anterior, opcoes.atual, opcoes.saida)
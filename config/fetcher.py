@@ -0,0 +1,72 @@
+"""
+Fetcher
+=======
+Download do HTML das páginas sem navegador, usado pelos níveis de extração
+que leem os dados diretamente do HTML inicial e pela leitura das listagens
+de categoria (config/listagem.py). As sessões mantêm um pool de conexões
+keep-alive por host e pedem respostas comprimidas (gzip, e brotli quando o
+pacote está instalado).
+"""
+
+import threading
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401
+except ImportError:  # brotli é opcional (sem ele, só gzip/deflate)
+    try:
+        import brotlicffi as brotli  # noqa: F401
+    except ImportError:
+        brotli = None
+
+# Conexões mantidas abertas por host
+POOL_CONEXOES = 10
+
+# Novas tentativas em falhas de conexão e respostas 429/5xx, com espera crescente
+TENTATIVAS = 3
+FATOR_ESPERA = 0.5
+
+# Cabeçalhos de um navegador comum para receber o mesmo HTML servido ao Chrome
+CABECALHOS_PADRAO = {
+    'User-Agent': ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br' if brotli is not None else 'gzip, deflate',
+}
+
+def criar_sessao(pool: int = POOL_CONEXOES) -> requests.Session:
+    """Cria uma sessão HTTP com os cabeçalhos padrão e um pool de conexões keep-alive"""
+    sessao = requests.Session()
+    sessao.headers.update(CABECALHOS_PADRAO)
+    tentativas = Retry(total=TENTATIVAS, backoff_factor=FATOR_ESPERA,
+                       status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET', 'HEAD'))
+    adaptador = HTTPAdapter(pool_connections=pool, pool_maxsize=pool, max_retries=tentativas)
+    sessao.mount('https://', adaptador)
+    sessao.mount('http://', adaptador)
+    return sessao
+
+# Sessão compartilhada pelas etapas de coleta (criada no primeiro uso)
+_sessao = None
+_trava_sessao = threading.Lock()
+
+def sessao_compartilhada() -> requests.Session:
+    """Sessão única do processo, para reaproveitar as conexões entre etapas"""
+    global _sessao
+    with _trava_sessao:
+        if _sessao is None:
+            _sessao = criar_sessao()
+        return _sessao
+
+def baixar_html(sessao, url: str, timeout: int = 15) -> Optional[str]:
+    """Baixa o HTML de uma página; retorna None em caso de erro"""
+    try:
+        resposta = sessao.get(url, timeout=timeout)
+        resposta.raise_for_status()
+        return resposta.text
+    except requests.RequestException as e:
+        print(f"Erro ao baixar {url}: {e}")
+        return None
@@ -0,0 +1,162 @@
+"""
+Histórico
+=========
+Guarda o resultado de cada coleta em um conjunto Parquet particionado por
+data (dados/history/date=AAAA-MM-DD/part-*.parquet) e consulta apenas as
+partições e colunas necessárias para o período pedido.
+
+Uso:
+    python -m config.historico --url https://www.essentialnutrition.com.br/produto --inicio 2024-01-01
+    python -m config.historico --categoria PROTEINAS --colunas nome proteinas
+"""
+
+import argparse
+import os
+import uuid
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Sequence
+import pandas as pd
+from .produto import CAMPOS, CAMPOS_NUTRIENTES, CAMPOS_TEXTO
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional (só para o histórico)
+    pa = None
+    pq = None
+
+# Diretório raiz do histórico
+CAMINHO_HISTORICO = 'dados/history'
+
+# Prefixo dos diretórios de partição
+PREFIXO_PARTICAO = 'date='
+
+def esquema_historico():
+    """Esquema fixo das partições (evita tipos diferentes entre coletas)"""
+    campos = [pa.field(campo, pa.float64() if campo in CAMPOS_NUTRIENTES else pa.string()) for campo in CAMPOS]
+    return pa.schema(campos + [pa.field('coletado_em', pa.timestamp('s'))])
+
+def carregar_resultado(caminho: str) -> pd.DataFrame:
+    """Lê a saída numérica de uma coleta (CSV, JSONL ou Parquet)"""
+    if caminho.endswith('.parquet'):
+        return pd.read_parquet(caminho)
+    if caminho.endswith('.jsonl'):
+        return pd.read_json(caminho, lines=True, dtype=False)
+    return pd.read_csv(caminho, dtype={campo: 'object' for campo in CAMPOS_TEXTO})
+
+def adicionar_execucao(caminho_resultado: str, diretorio: str = CAMINHO_HISTORICO,
+                       coletado_em: Optional[datetime] = None,
+                       excluir: Optional[Iterable[str]] = None) -> Optional[str]:
+    """
+    Acrescenta o resultado de uma coleta ao histórico, na partição do dia
+
+    Args:
+        excluir: URLs que não foram coletadas nesta execução (linhas mantidas
+            da coleta anterior); ficam fora do histórico
+
+    Returns:
+        Caminho do arquivo gravado ou None se pyarrow não está instalado
+    """
+    if pq is None:
+        print("Histórico não gravado: requer o pacote pyarrow")
+        return None
+
+    coletado_em = (coletado_em or datetime.now()).replace(microsecond=0)
+    df = carregar_resultado(caminho_resultado).reindex(columns=list(CAMPOS))
+    if excluir:
+        df = df[~df['url'].isin(set(excluir))]
+    # Ordenar pela URL deixa as estatísticas dos row groups úteis para filtros
+    df = df.sort_values('url', kind='stable')
+    df['coletado_em'] = coletado_em
+
+    particao = os.path.join(diretorio, f"{PREFIXO_PARTICAO}{coletado_em.date().isoformat()}")
+    os.makedirs(particao, exist_ok=True)
+    caminho = os.path.join(particao, f"part-{coletado_em:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet")
+    tabela = pa.Table.from_pandas(df, schema=esquema_historico(), preserve_index=False)
+    pq.write_table(tabela, caminho)
+    print(f"Histórico: {len(df)} produtos gravados em '{caminho}'")
+    return caminho
+
+def listar_particoes(diretorio: str = CAMINHO_HISTORICO, inicio: Optional[date] = None,
+                     fim: Optional[date] = None) -> List[tuple]:
+    """Retorna [(data, caminho)] das partições no intervalo, sem abrir nenhum arquivo"""
+    if not os.path.isdir(diretorio):
+        return []
+    particoes = []
+    for nome in sorted(os.listdir(diretorio)):
+        if not nome.startswith(PREFIXO_PARTICAO):
+            continue
+        try:
+            dia = date.fromisoformat(nome[len(PREFIXO_PARTICAO):])
+        except ValueError:
+            continue
+        if (inicio and dia < inicio) or (fim and dia > fim):
+            continue
+        particoes.append((dia, os.path.join(diretorio, nome)))
+    return particoes
+
+def consultar_historico(url: Optional[str] = None, categoria: Optional[str] = None,
+                        inicio: Optional[date] = None, fim: Optional[date] = None,
+                        colunas: Optional[Sequence[str]] = None,
+                        diretorio: str = CAMINHO_HISTORICO) -> pd.DataFrame:
+    """
+    Consulta o histórico de um produto ou categoria em um período
+
+    Só as partições do período são abertas e só as colunas pedidas são lidas;
+    o filtro por URL ou categoria usa as estatísticas dos row groups.
+
+    Args:
+        url: URL canônica do produto
+        categoria: Categoria dos produtos
+        inicio, fim: Datas limite (inclusivas)
+        colunas: Colunas a retornar (padrão: todas); 'date', 'url' e
+            'coletado_em' sempre são incluídas
+
+    Returns:
+        DataFrame com uma linha por produto por coleta, ordenado por data
+    """
+    if pq is None:
+        raise ImportError("Consulta ao histórico requer o pacote pyarrow")
+
+    filtros = []
+    if url:
+        filtros.append(('url', '=', url))
+    if categoria:
+        filtros.append(('categoria', '=', categoria))
+    leitura = None
+    if colunas:
+        leitura = list(dict.fromkeys(['url', 'coletado_em'] + [c for c in colunas if c in CAMPOS]))
+
+    tabelas = []
+    for dia, particao in listar_particoes(diretorio, inicio, fim):
+        for arquivo in sorted(os.listdir(particao)):
+            if not arquivo.endswith('.parquet'):
+                continue
+            caminho = os.path.join(particao, arquivo)
+            colunas_arquivo = leitura
+            if leitura:
+                # Partições gravadas antes de uma coluna existir (ex.: status) não a têm
+                nomes = pq.read_schema(caminho).names
+                colunas_arquivo = [coluna for coluna in leitura if coluna in nomes]
+            tabela = pq.read_table(caminho, columns=colunas_arquivo, filters=filtros or None)
+            if tabela.num_rows:
+                tabelas.append(tabela.to_pandas().assign(date=dia))
+
+    if not tabelas:
+        return pd.DataFrame(columns=['date'] + (leitura or list(CAMPOS) + ['coletado_em']))
+    resultado = pd.concat(tabelas, ignore_index=True)
+    if leitura:
+        resultado = resultado.reindex(columns=['date'] + leitura)
+    return resultado[['date'] + [c for c in resultado.columns if c != 'date']].sort_values(
+        ['date', 'coletado_em'], kind='stable', ignore_index=True)
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Consulta o histórico de coletas")
+    argumentos.add_argument('--url', help="URL canônica do produto")
+    argumentos.add_argument('--categoria', help="Categoria dos produtos")
+    argumentos.add_argument('--inicio', type=date.fromisoformat, help="Data inicial (AAAA-MM-DD)")
+    argumentos.add_argument('--fim', type=date.fromisoformat, help="Data final (AAAA-MM-DD)")
+    argumentos.add_argument('--colunas', nargs='*', help="Colunas a exibir")
+    opcoes = argumentos.parse_args()
+    resultado = consultar_historico(opcoes.url, opcoes.categoria, opcoes.inicio, opcoes.fim, opcoes.colunas)
+    print(resultado.to_string(index=False))
@@ -0,0 +1,112 @@
+"""
+Listagem
+========
+Leitura das páginas de categoria (/produtos/<categoria>?p=N) por HTTP. As
+listagens do Magento já vêm renderizadas no servidor: os links dos produtos
+(a.product-item-link) e o aviso de página vazia (div.message.info.empty)
+estão no HTML inicial, então basta baixar cada página pela sessão com pool
+de conexões (config/fetcher.py) e interpretá-la, sem abrir o navegador.
+
+Uso:
+    python -m config.listagem https://www.essentialnutrition.com.br/produtos/proteinas
+"""
+
+import argparse
+import time
+from typing import List, NamedTuple, Optional
+from urllib.parse import urlparse
+from .fetcher import baixar_html, sessao_compartilhada
+from .parsers import interpretar_html
+from .urls import canonicalizar_url
+
+# Limite de páginas por categoria (proteção contra paginação que nunca esvazia)
+MAXIMO_PAGINAS = 50
+
+class PaginaListagem(NamedTuple):
+    """Uma página de categoria já interpretada"""
+
+    url: str
+    html: str
+    links: List[str]
+    vazia: bool
+
+def url_pagina(url_categoria: str, pagina: int) -> str:
+    return url_categoria if pagina == 1 else f"{url_categoria}?p={pagina}"
+
+def baixar_listagem(sessao, url: str, aliases=None) -> Optional[PaginaListagem]:
+    """
+    Baixa e interpreta uma página de categoria
+
+    Returns:
+        PaginaListagem com as URLs canônicas dos produtos (do mesmo site e
+        fora de /produtos/), ou None se o download falhou
+    """
+    html = baixar_html(sessao, url)
+    if html is None:
+        return None
+    pagina = interpretar_html(html)
+    host = urlparse(url).netloc
+    links = []
+    for href in pagina.links_produtos():
+        produto = canonicalizar_url(href, url, aliases)
+        partes = urlparse(produto)
+        if partes.netloc == host and '/produtos/' not in partes.path:
+            links.append(produto)
+    return PaginaListagem(url, html, links, pagina.pagina_vazia())
+
+def listar_categoria(url_categoria: str, aliases=None, sessao=None, acervo=None,
+                     maximo_paginas: int = MAXIMO_PAGINAS) -> Optional[List[str]]:
+    """
+    URLs canônicas dos produtos de uma categoria, percorrendo a paginação por HTTP
+
+    A paginação termina no aviso de página vazia, numa página sem links ou
+    numa página que só repete produtos já vistos (o Magento repete a última
+    página quando p passa do fim).
+
+    Args:
+        url_categoria: URL da primeira página da categoria
+        aliases: Hosts equivalentes (ver config/urls.py)
+        sessao: Sessão HTTP (padrão: a sessão compartilhada)
+        acervo: AcervoHtml onde as listagens são guardadas (None para não guardar)
+
+    Returns:
+        URLs na ordem da listagem, ou None se a primeira página não pôde ser
+        lida por HTTP (falha no download ou listagem sem produtos e sem aviso
+        de página vazia, que indica conteúdo montado por JavaScript)
+    """
+    sessao = sessao or sessao_compartilhada()
+    urls = []
+    vistas = set()
+    for numero in range(1, maximo_paginas + 1):
+        inicio = time.perf_counter()
+        pagina = baixar_listagem(sessao, url_pagina(url_categoria, numero), aliases)
+        if pagina is None:
+            if numero == 1:
+                return None
+            break
+        if acervo is not None:
+            acervo.guardar(pagina.url, pagina.html, 'listagem')
+        if numero == 1 and not pagina.links and not pagina.vazia:
+            return None
+        novas = [url for url in dict.fromkeys(pagina.links) if url not in vistas]
+        print(f"Página {numero}: {len(pagina.links)} produtos ({len(novas)} novos) "
+              f"em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+        if pagina.vazia or not novas:
+            break
+        vistas.update(novas)
+        urls.extend(novas)
+    return urls
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Lista os produtos de categorias por HTTP")
+    argumentos.add_argument('categorias', nargs='+', help="URLs das categorias")
+    opcoes = argumentos.parse_args()
+    for categoria in opcoes.categorias:
+        inicio = time.perf_counter()
+        resultado = listar_categoria(categoria)
+        if resultado is None:
+            print(f"{categoria}: listagem não disponível por HTTP")
+            continue
+        print(f"{categoria}: {len(resultado)} produtos em {time.perf_counter() - inicio:.2f}s")
+        for url in resultado:
+            print(f"  {url}")
@@ -0,0 +1,164 @@
+"""
+Parsers
+=======
+Camada de interpretação de HTML usada pelos extratores e pelo coletor de URLs.
+Usa lxml com expressões XPath pré-compiladas quando disponível e
+BeautifulSoup como alternativa.
+"""
+
+from typing import List, Optional, Tuple
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml é opcional
+    lxml = None
+    etree = None
+
+# Texto exibido pelo Magento quando a listagem não tem produtos
+TEXTO_PAGINA_VAZIA = "Não encontramos produtos correspondentes"
+
+def normalizar_texto(texto: str) -> str:
+    """Remove espaços e quebras de linha repetidos"""
+    return ' '.join(texto.split())
+
+def _classe(nome: str) -> str:
+    """Expressão XPath equivalente ao seletor CSS '.nome'"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {nome} ')"
+
+if etree is not None:
+    XPATH_TITULO = etree.XPath("//h1")
+    XPATH_TABELA = etree.XPath(f"//div[{_classe('tabela-nutri')}]//table[{_classe('table')}]")
+    XPATH_PORCAO = etree.XPath("./thead/tr[1]/*[1][self::th]")
+    XPATH_LINHAS = etree.XPath("./tbody/tr | ./tr")
+    XPATH_COLUNAS = etree.XPath("./td")
+    XPATH_LINKS = etree.XPath(f"//a[{_classe('product-item-link')}]/@href")
+    XPATH_LINKS_FOTOS = etree.XPath(
+        f"//a[{_classe('product')} and {_classe('photo')} and {_classe('product-item-photo')}]/@href")
+    XPATH_VAZIA = etree.XPath(f"//div[{_classe('message')} and {_classe('info')} and {_classe('empty')}]")
+    XPATH_JSON_LD = etree.XPath("//script[@type='application/ld+json']/text()")
+    XPATH_OG_TITULO = etree.XPath("//meta[@property='og:title']/@content")
+    XPATH_MAGE_INIT = etree.XPath("//@data-mage-init | //script[@type='text/x-magento-init']/text()")
+
+class PaginaLxml:
+    """Página interpretada com lxml e XPath pré-compilado"""
+
+    backend = 'lxml'
+
+    def __init__(self, html: str):
+        self.raiz = lxml.html.document_fromstring(html) if html.strip() else lxml.html.Element('html')
+
+    def titulo(self) -> str:
+        elementos = XPATH_TITULO(self.raiz)
+        return elementos[0].text_content().strip() if elementos else ''
+
+    def tabela_nutricional(self) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        tabelas = XPATH_TABELA(self.raiz)
+        if not tabelas:
+            return None
+        tabela = tabelas[0]
+        cabecalho = XPATH_PORCAO(tabela)
+        porcao = ''
+        if cabecalho:
+            # Manter as quebras de linha como no texto exibido pelo navegador
+            for quebra in cabecalho[0].iter('br'):
+                quebra.tail = '\n' + (quebra.tail or '')
+            porcao = cabecalho[0].text_content().strip()
+        linhas = []
+        for linha in XPATH_LINHAS(tabela):
+            colunas = XPATH_COLUNAS(linha)
+            if len(colunas) >= 2:
+                linhas.append((normalizar_texto(colunas[0].text_content()),
+                               normalizar_texto(colunas[1].text_content())))
+        return porcao, linhas
+
+    def links_produtos(self) -> List[str]:
+        return [str(href) for href in XPATH_LINKS(self.raiz)]
+
+    def links_fotos_produtos(self) -> List[str]:
+        return [str(href) for href in XPATH_LINKS_FOTOS(self.raiz)]
+
+    def pagina_vazia(self) -> bool:
+        return any(TEXTO_PAGINA_VAZIA in elemento.text_content() for elemento in XPATH_VAZIA(self.raiz))
+
+    def json_ld(self) -> List[str]:
+        return [str(texto) for texto in XPATH_JSON_LD(self.raiz)]
+
+    def og_titulo(self) -> str:
+        conteudo = XPATH_OG_TITULO(self.raiz)
+        return str(conteudo[0]).strip() if conteudo else ''
+
+    def blobs_mage_init(self) -> List[str]:
+        return [str(blob) for blob in XPATH_MAGE_INIT(self.raiz)]
+
+class PaginaBs4:
+    """Página interpretada com BeautifulSoup (sem dependências compiladas)"""
+
+    backend = 'bs4'
+
+    def __init__(self, html: str):
+        self.soup = BeautifulSoup(html, 'html.parser')
+
+    def titulo(self) -> str:
+        elemento = self.soup.find('h1')
+        return elemento.get_text().strip() if elemento else ''
+
+    def tabela_nutricional(self) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        tabela = self.soup.select_one("div.tabela-nutri table.table")
+        if tabela is None:
+            return None
+        cabecalho = tabela.select_one("thead tr th:first-child")
+        porcao = ''
+        if cabecalho:
+            # Manter as quebras de linha como no texto exibido pelo navegador
+            for quebra in cabecalho.find_all('br'):
+                quebra.replace_with('\n')
+            porcao = cabecalho.get_text().strip()
+        linhas = []
+        for linha in tabela.select("tbody tr") or tabela.find_all("tr", recursive=False):
+            colunas = linha.find_all("td", recursive=False)
+            if len(colunas) >= 2:
+                linhas.append((normalizar_texto(colunas[0].get_text()),
+                               normalizar_texto(colunas[1].get_text())))
+        return porcao, linhas
+
+    def links_produtos(self) -> List[str]:
+        return [link['href'] for link in self.soup.select("a.product-item-link[href]")]
+
+    def links_fotos_produtos(self) -> List[str]:
+        return [link['href'] for link in self.soup.select("a.product.photo.product-item-photo[href]")]
+
+    def pagina_vazia(self) -> bool:
+        return any(TEXTO_PAGINA_VAZIA in elemento.get_text()
+                   for elemento in self.soup.select("div.message.info.empty"))
+
+    def json_ld(self) -> List[str]:
+        return [script.string or '' for script in self.soup.select('script[type="application/ld+json"]')]
+
+    def og_titulo(self) -> str:
+        meta = self.soup.select_one('meta[property="og:title"]')
+        return (meta.get('content') or '').strip() if meta else ''
+
+    def blobs_mage_init(self) -> List[str]:
+        blobs = [elemento['data-mage-init'] for elemento in self.soup.select('[data-mage-init]')]
+        blobs += [script.string or '' for script in self.soup.select('script[type="text/x-magento-init"]')]
+        return blobs
+
+BACKENDS = {'bs4': PaginaBs4}
+if etree is not None:
+    BACKENDS['lxml'] = PaginaLxml
+
+BACKEND_PADRAO = 'lxml' if 'lxml' in BACKENDS else 'bs4'
+
+def interpretar_html(html: str, backend: Optional[str] = None):
+    """
+    Interpreta o HTML com o backend escolhido (padrão: o mais rápido disponível)
+
+    Returns:
+        PaginaLxml ou PaginaBs4, com a mesma interface de consulta
+    """
+    backend = backend or BACKEND_PADRAO
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de parser não disponível: {backend}")
+    return BACKENDS[backend](html or '')
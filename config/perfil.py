@@ -0,0 +1,250 @@
+"""
+Perfil
+======
+Modo de perfilamento das etapas de coleta. Quando ativado (variável de
+ambiente PERFIL_COLETA, ativar_perfil() ou `python main.py --perfil`), cada
+ponto de entrada decorado com @perfilado é amostrado por uma thread que lê
+a pilha da thread principal em intervalos fixos. Ao final são gravados em
+dados/perfil/:
+
+- <etapa>-<data>.speedscope.json: perfil amostrado (https://www.speedscope.app)
+- <etapa>-<data>.collapsed: pilhas no formato do flamegraph.pl
+- <etapa>-<data>.txt: tempo de parede x CPU por sub-etapa, divisão das
+  amostras entre WebDriver, rede e código Python, e as N funções com mais
+  amostras
+
+No modo 'cprofile' o perfilador determinístico também é executado e o
+arquivo .prof e sua tabela de funções são gravados.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# Modos aceitos: 'amostragem' ou 'cprofile' (None desativa)
+MODOS_PERFIL = ('amostragem', 'cprofile')
+
+# Diretório dos arquivos gerados
+CAMINHO_PERFIL = 'dados/perfil'
+
+# Intervalo entre amostras, em segundos
+INTERVALO_AMOSTRAGEM = 0.005
+
+# Quantidade de funções na tabela
+TOP_N = 25
+
+# Trechos do caminho do arquivo que identificam cada categoria de espera
+CATEGORIAS_ESPERA = (
+    ('webdriver', (f'{os.sep}selenium{os.sep}',)),
+    ('rede', (f'{os.sep}requests{os.sep}', f'{os.sep}urllib3{os.sep}', f'{os.sep}http{os.sep}client.py',
+              f'{os.sep}socket.py', f'{os.sep}ssl.py')),
+)
+
+MODO_PERFIL = os.environ.get('PERFIL_COLETA') or None
+
+# Perfilador em execução (um por vez)
+_atual = None
+
+def ativar_perfil(modo: Optional[str] = 'amostragem'):
+    """Ativa (ou desativa, com None) o perfilamento dos pontos de entrada"""
+    global MODO_PERFIL
+    if modo is not None and modo not in MODOS_PERFIL:
+        raise ValueError(f"Modo de perfil inválido: {modo} (use {', '.join(MODOS_PERFIL)})")
+    MODO_PERFIL = modo
+
+Quadro = Tuple[str, str, int]
+
+class Perfilador:
+    """Amostrador de pilha da thread que o iniciou, com tempos por sub-etapa"""
+
+    def __init__(self, nome: str, modo: str = 'amostragem', intervalo: float = INTERVALO_AMOSTRAGEM):
+        self.nome = nome
+        self.modo = modo
+        self.intervalo = intervalo
+        self.pilhas: Counter = Counter()
+        self.pesos: Dict[tuple, float] = defaultdict(float)
+        self.etapa = nome
+        self.tempos_etapas: Dict[str, list] = defaultdict(lambda: [0.0, 0.0])
+        self.thread_alvo = threading.get_ident()
+        self.ativo = False
+        self.cprofile = cProfile.Profile() if modo == 'cprofile' else None
+
+    def iniciar(self):
+        self.ativo = True
+        self.inicio_parede = time.perf_counter()
+        self.inicio_cpu = time.thread_time()
+        self.amostrador = threading.Thread(target=self._amostrar, daemon=True)
+        self.amostrador.start()
+        if self.cprofile:
+            self.cprofile.enable()
+
+    def parar(self):
+        if self.cprofile:
+            self.cprofile.disable()
+        self.ativo = False
+        self.amostrador.join()
+        self.duracao_parede = time.perf_counter() - self.inicio_parede
+        self.duracao_cpu = time.thread_time() - self.inicio_cpu
+
+    def _amostrar(self):
+        anterior = time.perf_counter()
+        while self.ativo:
+            time.sleep(self.intervalo)
+            agora = time.perf_counter()
+            quadro = sys._current_frames().get(self.thread_alvo)
+            if quadro is None:
+                continue
+            pilha = []
+            while quadro is not None:
+                codigo = quadro.f_code
+                pilha.append((codigo.co_name, codigo.co_filename, codigo.co_firstlineno))
+                quadro = quadro.f_back
+            pilha.append((f'[{self.etapa}]', '', 0))
+            pilha = tuple(reversed(pilha))
+            self.pilhas[pilha] += 1
+            self.pesos[pilha] += agora - anterior
+            anterior = agora
+
+    @contextmanager
+    def sub_etapa(self, nome: str):
+        """Agrupa as amostras e mede parede x CPU de um trecho da etapa"""
+        anterior = self.etapa
+        self.etapa = nome
+        inicio_parede, inicio_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            tempos = self.tempos_etapas[nome]
+            tempos[0] += time.perf_counter() - inicio_parede
+            tempos[1] += time.thread_time() - inicio_cpu
+            self.etapa = anterior
+
+    def categoria(self, pilha: Tuple[Quadro, ...]) -> str:
+        """Classifica uma amostra pelo quadro mais externo que pertence a uma biblioteca de espera"""
+        for _, arquivo, _ in pilha:
+            for categoria, trechos in CATEGORIAS_ESPERA:
+                if any(trecho in arquivo for trecho in trechos):
+                    return categoria
+        # Código próprio e bibliotecas de dados (pausas com time.sleep também caem aqui)
+        return 'python'
+
+    def relatorio(self, top_n: int = TOP_N) -> str:
+        total = sum(self.pilhas.values()) or 1
+        linhas = [f"Perfil de '{self.nome}' ({self.modo}), {datetime.now():%Y-%m-%d %H:%M:%S}",
+                  f"Parede: {self.duracao_parede:.2f}s  CPU (thread principal): {self.duracao_cpu:.2f}s  "
+                  f"Espera: {max(self.duracao_parede - self.duracao_cpu, 0):.2f}s",
+                  f"Amostras: {total} a cada {self.intervalo * 1000:.0f} ms", '']
+
+        if self.tempos_etapas:
+            linhas.append(f"{'Sub-etapa':<28}{'Parede':>10}{'CPU':>10}{'Espera':>10}")
+            for nome, (parede, cpu) in self.tempos_etapas.items():
+                linhas.append(f"{nome:<28}{parede:>9.2f}s{cpu:>9.2f}s{max(parede - cpu, 0):>9.2f}s")
+            linhas.append('')
+
+        categorias = Counter()
+        for pilha, quantidade in self.pilhas.items():
+            categorias[self.categoria(pilha)] += quantidade
+        linhas.append("Amostras por categoria:")
+        for categoria, quantidade in categorias.most_common():
+            linhas.append(f"  {categoria:<12}{quantidade:>8}  {quantidade / total:6.1%}")
+        linhas.append('')
+
+        proprias = Counter()
+        inclusivas = Counter()
+        for pilha, quantidade in self.pilhas.items():
+            proprias[pilha[-1]] += quantidade
+            for quadro in set(pilha):
+                inclusivas[quadro] += quantidade
+        linhas.append(f"{'Próprias':>9}{'Inclusivas':>12}  Função")
+        for quadro, quantidade in proprias.most_common(top_n):
+            funcao, arquivo, linha = quadro
+            local = f"{os.path.basename(arquivo)}:{linha}" if arquivo else ''
+            linhas.append(f"{quantidade / total:>9.1%}{inclusivas[quadro] / total:>12.1%}  {funcao} {local}")
+
+        if self.cprofile:
+            saida = io.StringIO()
+            pstats.Stats(self.cprofile, stream=saida).sort_stats('cumulative').print_stats(top_n)
+            linhas += ['', 'cProfile (tempo acumulado):', saida.getvalue()]
+        return '\n'.join(linhas)
+
+    def speedscope(self) -> Dict:
+        quadros = {}
+        amostras, pesos = [], []
+        for pilha, peso in self.pesos.items():
+            amostras.append([quadros.setdefault(quadro, len(quadros)) for quadro in pilha])
+            pesos.append(round(peso, 6))
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': [{'name': funcao, 'file': arquivo, 'line': linha}
+                                  for funcao, arquivo, linha in quadros]},
+            'profiles': [{
+                'type': 'sampled', 'name': self.nome, 'unit': 'seconds',
+                'startValue': 0, 'endValue': round(sum(pesos), 6),
+                'samples': amostras, 'weights': pesos,
+            }],
+            'name': self.nome,
+            'activeProfileIndex': 0,
+        }
+
+    def collapsed(self) -> str:
+        return '\n'.join(';'.join(funcao if not arquivo else f"{funcao} ({os.path.basename(arquivo)}:{linha})"
+                                  for funcao, arquivo, linha in pilha) + f' {quantidade}'
+                         for pilha, quantidade in self.pilhas.items())
+
+    def salvar(self, diretorio: str = CAMINHO_PERFIL) -> str:
+        """Grava os arquivos do perfil e retorna o prefixo usado"""
+        os.makedirs(diretorio, exist_ok=True)
+        prefixo = os.path.join(diretorio, f"{self.nome}-{datetime.now():%Y%m%d-%H%M%S}")
+        with open(prefixo + '.speedscope.json', 'w', encoding='utf-8') as f:
+            json.dump(self.speedscope(), f)
+        with open(prefixo + '.collapsed', 'w', encoding='utf-8') as f:
+            f.write(self.collapsed() + '\n')
+        relatorio = self.relatorio()
+        with open(prefixo + '.txt', 'w', encoding='utf-8') as f:
+            f.write(relatorio + '\n')
+        if self.cprofile:
+            self.cprofile.dump_stats(prefixo + '.prof')
+        print('\n' + relatorio)
+        print(f"\nPerfil salvo em '{prefixo}.*'")
+        return prefixo
+
+@contextmanager
+def sub_etapa(nome: str):
+    """Marca um trecho de uma etapa perfilada (sem efeito se o perfil não está ativo)"""
+    if _atual is None or threading.get_ident() != _atual.thread_alvo:
+        yield
+        return
+    with _atual.sub_etapa(nome):
+        yield
+
+def perfilado(nome: str):
+    """Decorador dos pontos de entrada: perfila a chamada quando o modo de perfil está ativo"""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            global _atual
+            if not MODO_PERFIL or _atual is not None:
+                return funcao(*args, **kwargs)
+            _atual = Perfilador(nome, MODO_PERFIL)
+            _atual.iniciar()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                perfilador, _atual = _atual, None
+                perfilador.parar()
+                try:
+                    perfilador.salvar()
+                except Exception as e:
+                    print(f"Erro ao salvar o perfil: {e}")
+        return envolvida
+    return decorador
@@ -0,0 +1,83 @@
+"""
+Prazo
+=====
+Orçamento de tempo por página. Todas as esperas, pausas e tentativas feitas
+em uma página do produto descontam de um único prazo, com um teto por
+etapa; quando o prazo acaba a página é abandonada com PrazoEsgotado, que
+informa a etapa em que o tempo terminou. Assim uma página quebrada custa no
+máximo ORCAMENTO_PAGINA segundos, em vez da soma dos timeouts de cada etapa.
+"""
+
+import time
+from typing import Dict, Optional
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Tempo total, em segundos, para processar uma página no navegador
+ORCAMENTO_PAGINA = 45.0
+
+# Tempo máximo de cada etapa (limitado ao que resta do orçamento)
+LIMITES_ETAPA = {
+    'navegacao': 30.0,
+    'carregamento': 20.0,
+    'nome': 10.0,
+    'aba': 15.0,
+    'tabela': 15.0,
+}
+
+class PrazoEsgotado(TimeoutError):
+    """O orçamento de tempo da página acabou"""
+
+    def __init__(self, etapa: str, orcamento: float):
+        self.etapa = etapa
+        self.orcamento = orcamento
+        super().__init__(f"prazo de {orcamento:.0f}s esgotado na etapa '{etapa}'")
+
+class Prazo:
+    """
+    Prazo de uma página, consumido por todas as esperas feitas nela
+
+    Uso:
+        prazo = Prazo()
+        prazo.esperar(driver, lambda d: d.find_elements(By.TAG_NAME, 'h1'), 'nome')
+        prazo.pausar(2, 'zoom')
+    """
+
+    def __init__(self, orcamento: float = ORCAMENTO_PAGINA, limites: Optional[Dict[str, float]] = None):
+        self.orcamento = orcamento
+        self.limites = LIMITES_ETAPA if limites is None else limites
+        self.inicio = time.perf_counter()
+
+    def decorrido(self) -> float:
+        return time.perf_counter() - self.inicio
+
+    def restante(self) -> float:
+        return max(self.orcamento - self.decorrido(), 0.0)
+
+    def verificar(self, etapa: str):
+        """Levanta PrazoEsgotado se não resta tempo"""
+        if self.restante() <= 0:
+            raise PrazoEsgotado(etapa, self.orcamento)
+
+    def limite(self, etapa: str) -> float:
+        """Segundos disponíveis para a etapa: o teto dela ou o que resta, o que for menor"""
+        self.verificar(etapa)
+        return min(self.limites.get(etapa, self.orcamento), self.restante())
+
+    def esperar(self, driver, condicao, etapa: str):
+        """
+        WebDriverWait limitado ao prazo
+
+        Levanta PrazoEsgotado se o prazo acabou durante a espera e
+        TimeoutException se só o teto da etapa foi atingido.
+        """
+        try:
+            return WebDriverWait(driver, self.limite(etapa)).until(condicao)
+        except TimeoutException:
+            self.verificar(etapa)
+            raise
+
+    def pausar(self, segundos: float, etapa: str):
+        """time.sleep que não passa do prazo"""
+        time.sleep(min(segundos, self.limite(etapa)))
+        self.verificar(etapa)
@@ -0,0 +1,85 @@
+"""
+Produto
+=======
+Registros compactos (tuplas nomeadas, sem __dict__) com os dados de um
+produto. Os extratores de config/scraper.py e config/teste_coleta.py
+retornam ProdutoBruto, com o texto original de cada célula; a etapa de
+conversão (config/conversao.py) produz ProdutoNutricional, com os mesmos
+campos e os nutrientes em float, e as colunas numéricas em lote.
+"""
+
+import math
+from typing import Dict, Iterable, List, NamedTuple
+
+class ProdutoBruto(NamedTuple):
+    """Textos das células da tabela nutricional, antes da conversão numérica"""
+
+    nome: str = ''
+    categoria: str = ''
+    url: str = ''
+    porcao: str = ''
+    calorias: str = ''
+    carboidratos: str = ''
+    proteinas: str = ''
+    gorduras_totais: str = ''
+    gorduras_saturadas: str = ''
+    fibras: str = ''
+    acucares: str = ''
+    sodio: str = ''
+    # '' para produtos com tabela; 'sem_tabela' quando a página confirmou que não há tabela
+    status: str = ''
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> 'ProdutoBruto':
+        """Cria o registro a partir de um dicionário, mantendo os textos originais"""
+        return cls(**{campo: str(dados[campo] or '').strip() for campo in CAMPOS if campo in dados})
+
+    def validar(self) -> List[str]:
+        """Retorna a lista de problemas de identificação do produto (vazia se válido)"""
+        erros = []
+        if not self.nome:
+            erros.append("nome vazio")
+        if not self.url.startswith(('http://', 'https://')):
+            erros.append(f"url inválida: '{self.url}'")
+        if not any(getattr(self, campo) for campo in CAMPOS_NUTRIENTES):
+            erros.append("nenhum nutriente encontrado")
+        return erros
+
+class ProdutoNutricional(NamedTuple):
+    """Valores convertidos, nos campos de ProdutoBruto (nutrientes em float, NaN se ausentes)"""
+
+    nome: str = ''
+    categoria: str = ''
+    url: str = ''
+    porcao: str = ''
+    calorias: float = math.nan
+    carboidratos: float = math.nan
+    proteinas: float = math.nan
+    gorduras_totais: float = math.nan
+    gorduras_saturadas: float = math.nan
+    fibras: float = math.nan
+    acucares: float = math.nan
+    sodio: float = math.nan
+    status: str = ''
+
+CAMPOS = ProdutoBruto._fields
+CAMPOS_TEXTO = ('nome', 'categoria', 'url', 'porcao', 'status')
+CAMPOS_NUTRIENTES = tuple(campo for campo in CAMPOS if campo not in CAMPOS_TEXTO)
+
+def linha_vazia(url: str) -> Dict:
+    """Dicionário de trabalho com todos os campos vazios, usado durante a extração"""
+    return ProdutoBruto(url=url)._asdict()
+
+def para_colunas(registros: Iterable[tuple]) -> Dict[str, tuple]:
+    """Transpõe os registros em colunas {campo: valores}"""
+    colunas = list(zip(*registros))
+    if not colunas:
+        return {campo: () for campo in CAMPOS}
+    return dict(zip(CAMPOS, colunas))
+
+def para_tabela_arrow(registros: Iterable[tuple], esquema):
+    """Cria uma tabela pyarrow coluna a coluna, sem um dicionário por linha, com o esquema dado"""
+    import pyarrow as pa
+    colunas = list(zip(*registros)) or [()] * len(esquema)
+    return pa.Table.from_arrays(
+        [pa.array(valores, type=campo.type) for campo, valores in zip(esquema, colunas)], schema=esquema)
@@ -0,0 +1,58 @@
+"""
+Rede
+====
+Captura das respostas de rede do navegador pelo Chrome DevTools Protocol.
+O driver precisa ser criado com o log 'performance' habilitado
+(BrowserManager.setup_driver(capturar_rede=True)); só navegadores baseados
+no Chromium (Chrome, Edge, Opera) oferecem esse log.
+"""
+
+import base64
+import json
+from typing import Iterator, Optional, Tuple
+
+# Tipos de recurso cujo corpo pode conter a tabela nutricional
+TIPOS_RECURSO = ('Document', 'XHR', 'Fetch')
+
+def rede_disponivel(driver) -> bool:
+    """Verifica se o driver expõe o log 'performance' e comandos CDP"""
+    try:
+        return 'performance' in driver.log_types and hasattr(driver, 'execute_cdp_cmd')
+    except Exception:
+        return False
+
+def descartar_eventos(driver):
+    """Esvazia o log acumulado (o próximo get_log só traz eventos novos)"""
+    try:
+        driver.get_log('performance')
+    except Exception:
+        pass
+
+def respostas_recebidas(driver, tipos=TIPOS_RECURSO) -> Iterator[Tuple[str, str]]:
+    """
+    Lê os eventos Network.responseReceived acumulados desde a última leitura
+
+    Yields:
+        Tuplas (request_id, url) das respostas dos tipos de recurso pedidos
+    """
+    for entrada in driver.get_log('performance'):
+        try:
+            mensagem = json.loads(entrada['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        if mensagem.get('method') != 'Network.responseReceived':
+            continue
+        parametros = mensagem.get('params', {})
+        if parametros.get('type') in tipos:
+            yield parametros['requestId'], parametros.get('response', {}).get('url', '')
+
+def corpo_resposta(driver, request_id: str) -> Optional[str]:
+    """Retorna o corpo de uma resposta capturada, ou None se já foi descartado pelo navegador"""
+    try:
+        resposta = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+    except Exception:
+        return None
+    corpo = resposta.get('body', '')
+    if resposta.get('base64Encoded'):
+        corpo = base64.b64decode(corpo).decode('utf-8', errors='replace')
+    return corpo
@@ -0,0 +1,135 @@
+"""
+Reextração
+==========
+Reaplica a extração (níveis estruturado e dom) a páginas já salvas, sem
+navegador e sem rede, usando um processo por núcleo. As tarefas levam só a
+localização da página; cada processo lê, descomprime e interpreta o HTML, e
+os resultados seguem para as saídas normais da coleta.
+
+Uso:
+    python -m config.reextracao                       # acervo em dados/html
+    python -m config.reextracao --diretorio paginas/  # arquivos .html soltos
+    python -m config.reextracao --ate "2024-06-30 23:59:59" --formatos csv parquet
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+from .acervo import CAMINHO_ACERVO, AcervoHtml
+from .produto import CAMPOS
+from .scraper import CAMINHOS_SAIDA, carregar_categorias, extrair_de_html
+from .writer import EscritorStreaming
+
+# Tarefa: ('acervo', diretório, url, hash) ou ('arquivo', caminho, url, None)
+Tarefa = Tuple[str, str, str, Optional[str]]
+
+def tarefas_acervo(diretorio: str = CAMINHO_ACERVO, ate: Optional[str] = None) -> List[Tarefa]:
+    """Uma tarefa por URL de produto, com a versão mais recente do acervo"""
+    acervo = AcervoHtml(diretorio)
+    return [('acervo', diretorio, url, entrada['hash'])
+            for url, entrada in acervo.mais_recentes('produto', ate).items()]
+
+def tarefas_diretorio(diretorio: str) -> List[Tarefa]:
+    """Uma tarefa por arquivo .html; o caminho relativo ao diretório faz o papel da URL"""
+    tarefas = []
+    for raiz, _, arquivos in os.walk(diretorio):
+        for arquivo in sorted(arquivos):
+            if arquivo.endswith(('.html', '.htm')):
+                caminho = os.path.join(raiz, arquivo)
+                tarefas.append(('arquivo', caminho, os.path.relpath(caminho, diretorio), None))
+    return tarefas
+
+def reextrair_pagina(tarefa: Tarefa) -> Tuple[str, Optional[tuple], Optional[str]]:
+    """
+    Executada nos processos do pool: lê a página e aplica a extração
+
+    Returns:
+        Tupla (url, ProdutoBruto ou None, nivel ou mensagem de erro)
+    """
+    origem, local, url, digest = tarefa
+    try:
+        if origem == 'acervo':
+            html = AcervoHtml(local).ler(digest)
+        else:
+            with open(local, 'r', encoding='utf-8', errors='replace') as f:
+                html = f.read()
+        resultado = extrair_de_html(url, html)
+    except Exception as e:
+        return url, None, f"erro: {e}"
+    if resultado is None:
+        return url, None, None
+    return url, resultado[0], resultado[1]
+
+def reextrair(tarefas: Iterable[Tarefa], formatos=('csv',), processos: Optional[int] = None,
+              tamanho_bloco: Optional[int] = None) -> int:
+    """
+    Reextrai as páginas em paralelo e grava as saídas da coleta
+
+    Args:
+        tarefas: Páginas a processar (ver tarefas_acervo e tarefas_diretorio)
+        formatos: Formatos de saída ('csv', 'jsonl', 'parquet')
+        processos: Número de processos (padrão: núcleos disponíveis)
+        tamanho_bloco: Tarefas enviadas por vez a cada processo (padrão:
+            divide o total em cerca de 4 blocos por processo)
+
+    Returns:
+        Número de produtos gravados
+    """
+    tarefas = list(tarefas)
+    if not tarefas:
+        print("Nenhuma página para reextrair")
+        return 0
+    # Só o processo principal converte; os processos do pool não importam o pandas
+    from .conversao import CAMINHO_BRUTO, converter_arquivo
+
+    processos = processos or os.cpu_count() or 1
+    tamanho_bloco = tamanho_bloco or max(1, len(tarefas) // (processos * 4))
+    destinos = {formato: CAMINHOS_SAIDA[formato] for formato in formatos}
+    print(f"Reextraindo {len(tarefas)} páginas com {processos} processos (blocos de {tamanho_bloco})...")
+
+    categorias = carregar_categorias()
+    inicio = time.perf_counter()
+    sem_tabela = []
+    erros = 0
+    with EscritorStreaming({'csv': CAMINHO_BRUTO}, CAMPOS) as escritor:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            for url, produto, nivel in executor.map(reextrair_pagina, tarefas, chunksize=tamanho_bloco):
+                if produto is not None:
+                    if not produto.categoria and url in categorias:
+                        produto = produto._replace(categoria=categorias[url])
+                    escritor.escrever(produto)
+                elif nivel:
+                    erros += 1
+                    print(f"Erro ao reextrair {url}: {nivel}")
+                else:
+                    sem_tabela.append(url)
+
+    duracao = time.perf_counter() - inicio
+    print(f"{escritor.total} produtos extraídos em {duracao:.1f}s "
+          f"({len(tarefas) / duracao:.0f} páginas/s); {len(sem_tabela)} sem tabela, {erros} com erro")
+    if not escritor.total:
+        return 0
+
+    total = converter_arquivo(CAMINHO_BRUTO, destinos)
+    for caminho in destinos.values():
+        print(f"Dados salvos em '{caminho}'")
+    return total
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Reextrai os dados nutricionais de páginas salvas")
+    argumentos.add_argument('--acervo', default=CAMINHO_ACERVO, help="Diretório do acervo de HTML")
+    argumentos.add_argument('--diretorio', help="Diretório com arquivos .html (no lugar do acervo)")
+    argumentos.add_argument('--ate', help="Usar a versão do acervo até esta data (AAAA-MM-DD HH:MM:SS)")
+    argumentos.add_argument('--formatos', nargs='+', default=['csv'], choices=sorted(CAMINHOS_SAIDA),
+                            help="Formatos de saída")
+    argumentos.add_argument('--processos', type=int, help="Número de processos (padrão: núcleos)")
+    argumentos.add_argument('--bloco', type=int, help="Tarefas enviadas por vez a cada processo")
+    opcoes = argumentos.parse_args()
+
+    if opcoes.diretorio:
+        lista = tarefas_diretorio(opcoes.diretorio)
+    else:
+        lista = tarefas_acervo(opcoes.acervo, opcoes.ate)
+    reextrair(lista, opcoes.formatos, opcoes.processos, opcoes.bloco)
@@ -1,76 +1,535 @@
+import argparse
 import json
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import re
+import unicodedata
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
 import time
 from tqdm import tqdm
-import re
 import os
-from .browser import BrowserManager
+from collections import Counter, defaultdict
+from datetime import datetime
+from .browser import DriverReciclavel
+from .catalog_api import GRAPHQL_URL, ErroCatalogoAPI, criar_sessao_api, buscar_produtos
+from .fetcher import sessao_compartilhada, baixar_html
+from .parsers import interpretar_html
+from .rede import rede_disponivel, descartar_eventos, respostas_recebidas, corpo_resposta
+from .writer import EscritorStreaming
+from .produto import CAMPOS, CAMPOS_NUTRIENTES, ProdutoBruto, linha_vazia
+from .urls import carregar_aliases, deduplicar_urls
+from .perfil import perfilado, sub_etapa
+from .seletores import registro_seletores, salvar_seletores, ler_tabela
+from .prazo import Prazo, PrazoEsgotado
+from .sem_tabela import CacheSemTabela, PaginaSemTabela, tem_marcador_tabela
 
-def iniciar_driver():
-    """Configura e inicia o driver do Chrome em modo headless"""
-    print("Configurando driver do navegador...")
+# conversao, agenda, delta e historico (pandas, pyarrow), banco e acervo
+# (zstandard) são importados em coletar_dados_nutricionais, só nas etapas que
+# os usam, para que importar as funções de extração continue leve
+
+# Arquivos de saída de cada formato suportado
+CAMINHOS_SAIDA = {
+    'csv': 'dados/csv/dados_nutricionais.csv',
+    'jsonl': 'dados/jsonl/dados_nutricionais.jsonl',
+    'parquet': 'dados/parquet/dados_nutricionais.parquet'
+}
+
+# Limites para reiniciar o navegador durante coletas longas
+LIMITE_PAGINAS_NAVEGADOR = 50
+LIMITE_MEMORIA_NAVEGADOR_MB = 1024
+
+# Níveis de extração, do mais barato para o mais caro
+NIVEIS_EXTRACAO = ('estruturado', 'dom', 'rede', 'navegador')
+
+# Mapear os nutrientes da tabela para seus respectivos campos
+MAPEAMENTO_NUTRIENTES = {
+    'Valor energético (kcal)': 'calorias',
+    'Carboidratos (g)': 'carboidratos',
+    'Proteínas (g)': 'proteinas',
+    'Gorduras totais (g)': 'gorduras_totais',
+    'Gorduras saturadas (g)': 'gorduras_saturadas',
+    'Fibras alimentares (g)': 'fibras',
+    'Açúcares totais (g)': 'acucares',
+    'Sódio (mg)': 'sodio'
+}
+
+def normalizar_rotulo(texto):
+    """Rótulo sem acentos, sem diferença entre maiúsculas e minúsculas e com espaços simples"""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ' '.join(''.join(c for c in decomposto if not unicodedata.combining(c)).casefold().split())
+
+# Rótulos normalizados, com e sem a unidade ('valor energetico (kcal)' e 'valor energetico')
+NUTRIENTES_NORMALIZADOS = {
+    normalizar_rotulo(variante): campo
+    for rotulo, campo in MAPEAMENTO_NUTRIENTES.items()
+    for variante in (rotulo, rotulo.split('(')[0])
+}
+
+def campo_nutriente(rotulo):
+    """
+    Campo da coluna para um rótulo da tabela nutricional, ou None
     
-    driver, browser_name = BrowserManager.setup_driver(headless=True)
+    Rótulos com uma unidade diferente da coluna (ex.: 'Valor energético (kJ)')
+    não são mapeados.
+    """
+    return NUTRIENTES_NORMALIZADOS.get(normalizar_rotulo(rotulo))
+
+# Campos do schema.org NutritionInformation (JSON-LD) e seus equivalentes
+MAPEAMENTO_SCHEMA_ORG = {
+    'calories': 'calorias',
+    'carbohydrateContent': 'carboidratos',
+    'proteinContent': 'proteinas',
+    'fatContent': 'gorduras_totais',
+    'saturatedFatContent': 'gorduras_saturadas',
+    'fiberContent': 'fibras',
+    'sugarContent': 'acucares',
+    'sodiumContent': 'sodio'
+}
+
+# Unidade de cada coluna de nutriente (as demais colunas estão em gramas)
+UNIDADES_COLUNA = {'calorias': 'kcal', 'sodio': 'mg'}
+
+# Valor de cada unidade do schema.org em kcal (energia) ou em gramas (massa)
+FATORES_ENERGIA = {'kcal': 1.0, 'cal': 1.0, 'calories': 1.0, 'calorias': 1.0, 'kj': 1 / 4.184}
+FATORES_MASSA = {'kg': 1000.0, 'g': 1.0, 'mg': 0.001, 'mcg': 0.000001, 'µg': 0.000001, 'μg': 0.000001}
+
+# Número seguido da unidade (ex.: '0.15 g', '120kcal', '1,5 g')
+PADRAO_VALOR_UNIDADE = re.compile(r'^\s*(\d+(?:[.,]\d+)?)\s*([^\s\d.,]*)')
+
+def iniciar_driver(max_paginas=LIMITE_PAGINAS_NAVEGADOR, max_memoria_mb=LIMITE_MEMORIA_NAVEGADOR_MB,
+                   capturar_rede=False):
+    """
+    Configura e inicia o driver do navegador em modo headless
     
-    if driver is None:
-        print(f"Erro ao configurar driver: {browser_name}")
+    O driver é reiniciado automaticamente após max_paginas páginas ou quando
+    a memória do navegador passa de max_memoria_mb. Com capturar_rede=True as
+    respostas de rede ficam disponíveis para extrair_via_rede.
+    """
+    print("Configurando driver do navegador...")
+    
+    try:
+        driver = DriverReciclavel(headless=True, max_paginas=max_paginas, max_memoria_mb=max_memoria_mb,
+                                  capturar_rede=capturar_rede)
+    except RuntimeError as e:
+        print(f"Erro ao configurar driver: {e}")
         return None
         
-    print(f"Driver configurado com sucesso usando {browser_name}")
+    print(f"Driver configurado com sucesso usando {driver.browser_name}")
     return driver
 
-def converter_numero_br(texto):
-    """Converte número no formato brasileiro (vírgula como decimal) para float"""
-    if not texto or texto.strip() == '-':
-        return 0.0
+def extrair_tabela_pagina(pagina, dados):
+    """
+    Preenche os dados nutricionais a partir de uma página já interpretada
+    
+    Returns:
+        True se a tabela 'div.tabela-nutri table.table' foi encontrada
+    """
+    tabela = pagina.tabela_nutricional()
+    if tabela is None:
+        return False
+    
+    porcao, linhas = tabela
+    if porcao:
+        dados['porcao'] = porcao
+    
+    for nutriente, valor in linhas:
+        campo = campo_nutriente(nutriente)
+        if campo:
+            dados[campo] = valor
+    
+    return True
+
+def extrair_tabela_html(html, dados):
+    """Preenche os dados nutricionais a partir de um trecho de HTML estático"""
+    if not html or 'tabela-nutri' not in html:
+        return False
+    return extrair_tabela_pagina(interpretar_html(html), dados)
+
+def carregar_json(texto):
+    """Interpreta um bloco JSON embutido na página; retorna None se inválido"""
+    try:
+        return json.loads(texto)
+    except (TypeError, ValueError):
+        return None
+
+def buscar_produtos_json_ld(objeto):
+    """Percorre um bloco JSON-LD e retorna os objetos do tipo Product"""
+    if isinstance(objeto, list):
+        return [produto for item in objeto for produto in buscar_produtos_json_ld(item)]
+    if not isinstance(objeto, dict):
+        return []
+    if '@graph' in objeto:
+        return buscar_produtos_json_ld(objeto['@graph'])
+    tipo = objeto.get('@type')
+    tipos = tipo if isinstance(tipo, list) else [tipo]
+    return [objeto] if 'Product' in tipos else []
+
+def buscar_html_tabela_json(objeto):
+    """Procura, dentro de um blob JSON do Magento, trechos de HTML com a tabela nutricional"""
+    if isinstance(objeto, str):
+        return [objeto] if 'tabela-nutri' in objeto else []
+    if isinstance(objeto, dict):
+        objeto = list(objeto.values())
+    if isinstance(objeto, list):
+        return [html for item in objeto for html in buscar_html_tabela_json(item)]
+    return []
+
+def converter_unidade_schema(valor, campo):
+    """
+    Converte um valor do schema.org ('0.15 g', '120 kcal') para a unidade da coluna
+    
+    Returns:
+        Número no formato brasileiro, sem unidade (ex.: '150' para sodiumContent
+        '0.15 g'); o texto original se o número ou a unidade não forem reconhecidos
+    """
+    texto = str(valor).strip()
+    encontrado = PADRAO_VALOR_UNIDADE.match(texto)
+    if not encontrado:
+        return texto
+    numero = float(encontrado.group(1).replace(',', '.'))
+    unidade = encontrado.group(2).lower()
+    destino = UNIDADES_COLUNA.get(campo, 'g')
+    fatores = FATORES_ENERGIA if destino == 'kcal' else FATORES_MASSA
+    if unidade:
+        if unidade not in fatores:
+            return texto
+        numero = numero * fatores[unidade] / fatores[destino]
+    return f"{numero:.4f}".rstrip('0').rstrip('.').replace('.', ',')
+
+def extrair_dados_estruturados(pagina, dados):
+    """
+    Nível 1: lê JSON-LD, Open Graph e blobs data-mage-init do HTML inicial
+    
+    Returns:
+        True se os valores nutricionais foram encontrados
+    """
+    encontrou = False
+    
+    # JSON-LD com schema.org Product / NutritionInformation
+    for script in pagina.json_ld():
+        for produto in buscar_produtos_json_ld(carregar_json(script)):
+            if not dados['nome'] and produto.get('name'):
+                dados['nome'] = str(produto['name']).strip()
+            nutricao = produto.get('nutrition')
+            if isinstance(nutricao, dict):
+                for chave, campo in MAPEAMENTO_SCHEMA_ORG.items():
+                    if nutricao.get(chave) is not None:
+                        dados[campo] = converter_unidade_schema(nutricao[chave], campo)
+                        encontrou = True
+                if nutricao.get('servingSize'):
+                    dados['porcao'] = str(nutricao['servingSize']).strip()
+    
+    # Open Graph
+    if not dados['nome']:
+        dados['nome'] = pagina.og_titulo()
+    
+    # Blobs JSON do Magento (atributo data-mage-init e scripts text/x-magento-init)
+    if not encontrou:
+        for blob in pagina.blobs_mage_init():
+            if not blob or 'tabela-nutri' not in blob:
+                continue
+            for html in buscar_html_tabela_json(carregar_json(blob)):
+                if extrair_tabela_html(html, dados):
+                    encontrou = True
+                    break
+            if encontrou:
+                break
+    
+    if encontrou and not dados['nome']:
+        dados['nome'] = pagina.titulo()
+    
+    return encontrou
+
+def extrair_dados_dom(pagina, dados):
+    """Nível 2: lê a tabela 'div.tabela-nutri' diretamente do HTML estático"""
+    if not extrair_tabela_pagina(pagina, dados):
+        return False
+    if not dados['nome']:
+        dados['nome'] = pagina.titulo()
+    return True
+
+def linha_de_produto_api(item, url):
+    """
+    Converte um produto retornado pela API GraphQL para o formato de linha do CSV
+    
+    Returns:
+        Tupla (ProdutoBruto, completo); completo é False quando a tabela nutricional
+        não veio na descrição do produto e precisa ser buscada na página
+    """
+    dados = linha_vazia(url)
+    dados['nome'] = (item.get('name') or '').strip()
+    categorias = item.get('categories') or []
+    if categorias:
+        dados['categoria'] = categorias[0].get('name') or ''
+    
+    completo = False
+    for campo_html in ('description', 'short_description'):
+        html = (item.get(campo_html) or {}).get('html') or ''
+        if extrair_tabela_html(html, dados):
+            completo = True
+            break
+    
+    return ProdutoBruto.de_dict(dados), completo
+
+def extrair_sem_navegador(url, sessao, acervo=None):
+    """
+    Tenta os níveis que não precisam de navegador (estruturado e dom)
+    
+    Args:
+        acervo: AcervoHtml onde o HTML baixado é guardado (None para não guardar)
+    
+    Returns:
+        Tupla (ProdutoBruto, nivel) ou None se a página precisa do navegador
+    """
+    html = baixar_html(sessao, url)
+    if not html:
+        return None
+    if acervo is not None:
+        acervo.guardar(url, html, 'produto')
+    return extrair_de_html(url, html)
+
+def extrair_de_html(url, html):
+    """
+    Aplica os níveis estruturado e dom a um HTML já obtido (baixado, salvo ou do acervo)
+    
+    Se os dados estruturados não trazem todos os nutrientes, a tabela do HTML
+    também é lida e completa os campos que faltam (nível 'dom').
+    
+    Returns:
+        Tupla (ProdutoBruto, nivel) ou None se a tabela não está no HTML
+    """
+    pagina = interpretar_html(html)
+    estruturados = linha_vazia(url)
+    encontrou = extrair_dados_estruturados(pagina, estruturados)
+    if encontrou and all(estruturados[campo] for campo in CAMPOS_NUTRIENTES):
+        return ProdutoBruto.de_dict(estruturados), 'estruturado'
+    dados = linha_vazia(url)
+    if encontrou:
+        dados['nome'] = estruturados['nome']
+    if not extrair_dados_dom(pagina, dados):
+        return (ProdutoBruto.de_dict(estruturados), 'estruturado') if encontrou else None
+    for campo, valor in estruturados.items():
+        if valor and not dados[campo]:
+            dados[campo] = valor
+    return ProdutoBruto.de_dict(dados), 'dom'
+
+def extrair_com_nivel(driver, url, sessao=None):
+    """
+    Extrai os dados nutricionais de um produto tentando os níveis em ordem de custo
+    
+    Args:
+        driver: WebDriver ou função sem argumentos que retorna um WebDriver;
+            só é usado se os níveis sem navegador falharem
+        url: URL do produto
+        sessao: Sessão HTTP para baixar o HTML inicial (None para ir direto ao navegador)
+    
+    Returns:
+        Tupla (ProdutoBruto, nivel) com o nível que forneceu os dados
+    """
+    if sessao is not None:
+        resultado = extrair_sem_navegador(url, sessao)
+        if resultado:
+            return resultado
+    
+    if callable(driver):
+        driver = driver()
+    return extrair_via_navegador(driver, url), 'navegador'
+
+# Marcador gravado na página antes de navegar; some quando o novo documento carrega
+SCRIPT_NAVEGAR = "window.__coletaAba = true; window.location.href = arguments[0];"
+SCRIPT_CARREGADA = "return window.__coletaAba === undefined && document.readyState === 'complete';"
+
+def abrir_abas(driver, abas):
+    """Garante que o navegador tenha 'abas' abas abertas e retorna seus handles"""
+    handles = list(driver.window_handles)
+    while len(handles) < abas:
+        driver.switch_to.new_window('tab')
+        handles.append(driver.current_window_handle)
+    return handles[:abas]
+
+def fechar_abas_extras(driver, handles):
+    """Fecha todas as abas menos a primeira"""
+    for handle in handles[1:]:
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+        except Exception:
+            pass
+    driver.switch_to.window(handles[0])
+
+def coletar_em_abas(driver, urls, abas=4, timeout_carregamento=30):
+    """
+    Processa várias URLs com navegações simultâneas em abas de um único navegador
+    
+    As navegações são iniciadas em todas as abas sem bloquear; a aba que
+    terminar de carregar primeiro é processada (processar_pagina_aberta) e
+    recebe a próxima URL, sobrepondo as esperas de rede.
+    
+    Args:
+        driver: WebDriver (ou DriverReciclavel, reiniciado entre lotes de abas)
+        urls: URLs a processar
+        abas: Número de abas simultâneas
+        timeout_carregamento: Segundos até processar uma aba mesmo sem carregamento completo
     
-    # Remove possíveis caracteres não numéricos, exceto vírgula e ponto
-    numero = re.sub(r'[^\d,.]', '', texto)
+    O prazo de cada página (config/prazo.py) começa a contar quando a aba é
+    colhida, já que as abas carregadas esperam a vez de serem processadas; a
+    espera pelo carregamento é limitada por timeout_carregamento. As páginas
+    são processadas sem as pausas fixas do caminho de uma aba.
     
-    # Substitui vírgula por ponto
-    numero = numero.replace(',', '.')
+    Yields:
+        Tuplas (url, ProdutoBruto ou None, duracao_segundos, erro), com a
+        duração contada desde o início da navegação; erro é o
+        PrazoEsgotado ou PaginaSemTabela de uma página sem dados, ou None
+    """
+    fila = list(urls)
+    fila.reverse()
+    handles = abrir_abas(driver, abas)
+    livres = list(handles)
+    pendentes = {}  # handle -> (url, início da navegação)
+    motivo_reciclagem = None
     
     try:
-        return float(numero)
-    except ValueError:
-        return 0.0
+        while fila or pendentes:
+            # Iniciar navegações nas abas livres
+            while livres and fila and not motivo_reciclagem:
+                handle = livres.pop()
+                url = fila.pop()
+                driver.switch_to.window(handle)
+                driver.execute_script(SCRIPT_NAVEGAR, url)
+                pendentes[handle] = (url, time.perf_counter())
+                if hasattr(driver, 'paginas'):
+                    driver.paginas += 1
+            
+            # Colher a primeira aba que terminou de carregar
+            colhida = False
+            for handle, (url, inicio) in list(pendentes.items()):
+                driver.switch_to.window(handle)
+                try:
+                    carregada = driver.execute_script(SCRIPT_CARREGADA)
+                except Exception:
+                    carregada = False
+                if not carregada and time.perf_counter() - inicio < timeout_carregamento:
+                    continue
+                
+                del pendentes[handle]
+                print(f"\nAba pronta: {url}")
+                try:
+                    dados, erro = processar_pagina_aberta(driver, url, Prazo(), pausas=False), None
+                except (PrazoEsgotado, PaginaSemTabela) as e:
+                    dados, erro = None, e
+                livres.append(handle)
+                colhida = True
+                yield url, dados, time.perf_counter() - inicio, erro
+                
+                if hasattr(driver, 'motivo_reciclagem') and not motivo_reciclagem:
+                    motivo_reciclagem = driver.motivo_reciclagem()
+                break
+            
+            # Reiniciar o navegador só depois que todas as abas forem colhidas
+            if motivo_reciclagem and not pendentes:
+                fechar_abas_extras(driver, handles)
+                driver.reciclar(reabrir=False, motivo=motivo_reciclagem)
+                handles = abrir_abas(driver, abas)
+                livres = list(handles)
+                motivo_reciclagem = None
+            
+            if not colhida and pendentes:
+                time.sleep(0.1)
+    finally:
+        try:
+            fechar_abas_extras(driver, driver.window_handles)
+        except Exception:
+            pass
+
+def carregar_categorias(caminho='dados/urls_produtos.json'):
+    """Categoria de cada URL, gravada pela coleta de URLs (vazio se o arquivo não as tem)"""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f).get('categorias') or {}
+    except (OSError, ValueError):
+        return {}
 
-def extrair_dados_nutricionais(driver, url):
+def ler_nutrientes(driver, estrategia, elemento):
+    """
+    Lê a tabela encontrada por uma estratégia de 'tabela_nutricional' (ver
+    RegistroSeletores.localizar)
+    
+    Returns:
+        Tupla (porcao, {campo: valor}), ou None se nenhum nutriente foi reconhecido
+    """
+    porcao, linhas = ler_tabela(driver, estrategia, elemento)
+    valores = {}
+    for nutriente, valor in linhas:
+        campo = campo_nutriente(nutriente)
+        if campo:
+            valores[campo] = valor
+        else:
+            print(f"Nutriente ignorado: '{nutriente}'")
+    return (porcao, valores) if valores else None
+
+def extrair_dados_nutricionais(driver, url, sessao=None):
     """Extrai os dados nutricionais de um produto"""
+    return extrair_com_nivel(driver, url, sessao)[0]
+
+def extrair_via_navegador(driver, url, prazo=None):
+    """
+    Nível 3: extrai os dados nutricionais clicando na aba pelo navegador
+    
+    Raises:
+        PrazoEsgotado: a página não terminou dentro do prazo (padrão: Prazo())
+        TimeoutException: só o teto da navegação foi atingido
+        PaginaSemTabela: a página não tem a aba "Informação Nutricional"
+    """
     print("\nIniciando extração de dados...")
     print(f"URL: {url}")
+    prazo = prazo or Prazo()
     
-    dados = {
-        'nome': '',
-        'categoria': '', # Adicionado para compatibilidade com a nova estrutura
-        'url': url,
-        'porcao': '',
-        'calorias': 0.0,
-        'carboidratos': 0.0,
-        'proteinas': 0.0,
-        'gorduras_totais': 0.0,
-        'gorduras_saturadas': 0.0,
-        'fibras': 0.0,
-        'acucares': 0.0,
-        'sodio': 0.0
-    }
-    
+    limite = prazo.limite('navegacao')
     try:
         print("Acessando página...")
+        driver.set_page_load_timeout(limite)
         driver.get(url)
-        wait = WebDriverWait(driver, 20)
-        
+    except TimeoutException:
+        # Só o teto da navegação foi atingido se ainda resta prazo
+        prazo.verificar('navegacao')
+        raise
+    except Exception as e:
+        print(f"Erro ao processar {url}: {e}")
+        return ProdutoBruto(url=url)
+    
+    return processar_pagina_aberta(driver, url, prazo)
+
+def processar_pagina_aberta(driver, url, prazo=None, pausas=True):
+    """
+    Extrai os dados nutricionais da página do produto já aberta na aba atual
+    
+    Todas as esperas descontam do mesmo prazo; quando ele acaba, a página é
+    abandonada com PrazoEsgotado em vez de seguir para a próxima espera.
+    
+    Args:
+        pausas: Se False, dispensa as pausas fixas depois do carregamento, do
+            zoom e do clique (usado nas abas, que já estão carregadas quando
+            são colhidas); as esperas por elementos continuam valendo
+    
+    Raises:
+        PrazoEsgotado: o prazo da página acabou
+        PaginaSemTabela: a página não tem a aba "Informação Nutricional" nem
+            nenhum outro sinal da tabela no HTML (ver config/sem_tabela.py)
+    """
+    dados = linha_vazia(url)
+    prazo = prazo or Prazo()
+    
+    def pausar(segundos, etapa):
+        if pausas:
+            prazo.pausar(segundos, etapa)
+        else:
+            prazo.verificar(etapa)
+    
+    try:
         # Esperar a página carregar completamente
         print("Aguardando página carregar...")
-        wait.until(lambda d: d.execute_script('return document.readyState') == 'complete')
-        time.sleep(5)  # Espera adicional para garantir
+        prazo.esperar(driver, lambda d: d.execute_script('return document.readyState') == 'complete', 'carregamento')
+        pausar(5, 'carregamento')  # Espera adicional para garantir
         print("Página carregada!")
         
         # Verificar e fechar popup de cookies se existir
@@ -86,21 +545,29 @@ def extrair_dados_nutricionais(driver, url):
         # Ajustar zoom para 50%
         print("Ajustando zoom...")
         driver.execute_script("document.body.style.zoom = '50%'")
-        time.sleep(2)
+        pausar(2, 'zoom')
         print("Zoom ajustado!")
         
         # Extrair nome do produto
         print("Buscando nome do produto...")
-        nome_element = wait.until(EC.presence_of_element_located((By.TAG_NAME, "h1")))
+        nome_element = prazo.esperar(driver, EC.presence_of_element_located((By.TAG_NAME, "h1")), 'nome')
         dados['nome'] = nome_element.text.strip()
         print(f"Nome do produto encontrado: {dados['nome']}")
         
-        # Clicar no botão de Informação Nutricional
+        # Clicar no botão de Informação Nutricional (estratégias na ordem da taxa de acerto)
         print("\nProcurando botão de Informação Nutricional...")
+        registro = registro_seletores()
         try:
-            # Primeiro verificar se o menu existe
-            menu = wait.until(EC.presence_of_element_located((By.ID, "menu-top-int")))
-            print("Menu encontrado!")
+            encontrado = registro.localizar(driver, 'aba_nutricional', timeout=prazo.limite('aba'))
+            if encontrado is None:
+                prazo.verificar('aba')
+                if tem_marcador_tabela(driver.page_source):
+                    # A página menciona a tabela: falha dos seletores ou página lenta, não produto sem tabela
+                    raise RuntimeError("aba não encontrada, mas a página menciona a tabela nutricional")
+                # A página carregou e não tem nenhum sinal da tabela: produto sem tabela
+                raise PaginaSemTabela('sem_aba', dados['nome'])
+            estrategia, botao_info = encontrado
+            print(f"Botão encontrado ({estrategia.nome})!")
             
             # Remover modal que pode estar interceptando o clique
             print("Verificando e removendo possíveis modais...")
@@ -115,76 +582,232 @@ def extrair_dados_nutricionais(driver, url):
             except:
                 print("Nenhum modal encontrado")
             
-            # Agora procurar o botão dentro do menu
-            botao_info = menu.find_element(By.XPATH, ".//a[text()='Informação Nutricional']")
-            print("Botão encontrado!")
-            
             # Rolar até o botão
             print("Rolando até o botão...")
             driver.execute_script("arguments[0].scrollIntoView(true);", botao_info)
-            time.sleep(2)
+            pausar(2, 'aba')
             
             # Tentar clicar
             print("Tentando clicar...")
             driver.execute_script("arguments[0].click();", botao_info)  # Usando JavaScript click
             print("Clique realizado! Aguardando tabela carregar...")
-            time.sleep(3)
+            pausar(3, 'aba')
             
+        except (PrazoEsgotado, PaginaSemTabela):
+            raise
         except Exception as e:
             print(f"Erro ao interagir com botão: {str(e)}")
-            return dados
+            return ProdutoBruto.de_dict(dados)
         
         # Encontrar a tabela nutricional
         try:
-            tabela = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.tabela-nutri table.table")))
-            
-            # Extrair porção do cabeçalho
-            porcao_header = tabela.find_element(By.CSS_SELECTOR, "thead tr th:first-child")
-            if porcao_header:
-                dados['porcao'] = porcao_header.text.strip()
-            
-            # Mapear os nutrientes para seus respectivos campos
-            mapeamento = {
-                'Valor energético (kcal)': 'calorias',
-                'Carboidratos (g)': 'carboidratos',
-                'Proteínas (g)': 'proteinas',
-                'Gorduras totais (g)': 'gorduras_totais',
-                'Gorduras saturadas (g)': 'gorduras_saturadas',
-                'Fibras alimentares (g)': 'fibras',
-                'Açúcares totais (g)': 'acucares',
-                'Sódio (mg)': 'sodio'
-            }
-            
-            # Extrair valores nutricionais
-            linhas = tabela.find_elements(By.CSS_SELECTOR, "tbody tr")
-            for linha in linhas:
-                colunas = linha.find_elements(By.TAG_NAME, "td")
-                if len(colunas) >= 2:
-                    nutriente = colunas[0].text.strip()
-                    print(f"Encontrado nutriente: '{nutriente}'")  # Debug
-                    for chave, campo in mapeamento.items():
-                        if chave == nutriente:  # Comparação exata
-                            valor = colunas[1].text.strip()  # Pegando sempre a segunda coluna (valor)
-                            dados[campo] = converter_numero_br(valor)
-                            print(f"Coletado {chave}: {valor} -> {dados[campo]}")
-                            break
+            # A estratégia só conta como acerto se a tabela tiver algum nutriente reconhecido
+            encontrado = registro.localizar(driver, 'tabela_nutricional', timeout=prazo.limite('tabela'),
+                                            ler=lambda estrategia, elemento: ler_nutrientes(driver, estrategia, elemento))
+            if encontrado is None:
+                prazo.verificar('tabela')
+                raise RuntimeError("nenhuma estratégia encontrou a tabela com nutrientes")
+            
+            # Porção do cabeçalho e valores nutricionais
+            porcao, valores = encontrado[1]
+            if porcao:
+                dados['porcao'] = porcao
+            for campo, valor in valores.items():
+                dados[campo] = valor
+                print(f"Coletado {campo}: {valor}")
             
+        except (PrazoEsgotado, PaginaSemTabela):
+            raise
         except Exception as e:
             print(f"Erro ao processar tabela nutricional: {e}")
         
+    except (PrazoEsgotado, PaginaSemTabela):
+        raise
     except Exception as e:
         print(f"Erro ao processar {url}: {e}")
     
-    return dados
+    return ProdutoBruto.de_dict(dados)
+
+# Clica na aba "Informação Nutricional" sem esperas fixas; retorna False se o botão não existe
+SCRIPT_CLICAR_ABA = """
+    var menu = document.getElementById('menu-top-int');
+    if (!menu) return false;
+    var modais = document.getElementsByClassName('modalchuvas');
+    while (modais.length) modais[0].remove();
+    var links = menu.getElementsByTagName('a');
+    for (var i = 0; i < links.length; i++) {
+        if (links[i].textContent.trim() === 'Informação Nutricional') {
+            links[i].click();
+            return true;
+        }
+    }
+    return false;
+"""
+
+SCRIPT_TITULO = "var h1 = document.querySelector('h1'); return h1 ? h1.textContent.trim() : '';"
+
+def extrair_tabela_respostas(driver, dados):
+    """
+    Procura a tabela nutricional nos corpos das respostas de rede capturadas
+    desde a última leitura (documento HTML, fragmentos ou JSON com HTML)
+    
+    Returns:
+        True se a tabela foi encontrada
+    """
+    for request_id, _ in respostas_recebidas(driver):
+        corpo = corpo_resposta(driver, request_id)
+        if not corpo or 'tabela-nutri' not in corpo:
+            continue
+        pagina = interpretar_html(corpo)
+        if extrair_tabela_pagina(pagina, dados):
+            if not dados['nome']:
+                dados['nome'] = pagina.titulo()
+            return True
+        for html in buscar_html_tabela_json(carregar_json(corpo)):
+            if extrair_tabela_html(html, dados):
+                return True
+    return False
+
+def extrair_via_rede(driver, url, espera=10):
+    """
+    Extrai a tabela nutricional das respostas de rede do carregamento da
+    página e do clique na aba, sem esperar o DOM estabilizar
+    
+    Se a tabela não aparecer em nenhuma resposta, segue com a leitura do DOM
+    já carregado (processar_pagina_aberta).
+    
+    Args:
+        driver: WebDriver criado com capturar_rede=True
+        url: URL do produto
+        espera: Segundos aguardando a resposta disparada pelo clique na aba
+    
+    Returns:
+        Tupla (ProdutoBruto, nivel) com nivel 'rede' ou 'navegador', ou None
+        se a navegação falhou (o chamador segue para o nível 'navegador')
+    
+    Raises:
+        PrazoEsgotado: a página não carregou dentro do prazo
+        TimeoutException: só o teto da navegação foi atingido
+    """
+    if not rede_disponivel(driver):
+        return extrair_via_navegador(driver, url), 'navegador'
+    
+    print(f"\nCapturando rede: {url}")
+    prazo = Prazo()
+    descartar_eventos(driver)
+    limite = prazo.limite('navegacao')
+    try:
+        driver.set_page_load_timeout(limite)
+        driver.get(url)
+    except TimeoutException:
+        prazo.verificar('navegacao')
+        raise
+    except Exception as e:
+        print(f"Erro ao capturar a rede de {url}: {e}")
+        return None
+    
+    dados = linha_vazia(url)
+    encontrou = extrair_tabela_respostas(driver, dados)
+    
+    if not encontrou and driver.execute_script(SCRIPT_CLICAR_ABA):
+        limite = time.perf_counter() + min(espera, prazo.restante())
+        while not encontrou and time.perf_counter() < limite:
+            time.sleep(0.2)
+            encontrou = extrair_tabela_respostas(driver, dados)
+    
+    if encontrou:
+        if not dados['nome']:
+            dados['nome'] = driver.execute_script(SCRIPT_TITULO) or ''
+        print(f"Tabela capturada da rede: {dados['nome']}")
+        return ProdutoBruto.de_dict(dados), 'rede'
+    
+    # O conteúdo da aba não veio em nenhuma resposta: ler o DOM
+    return processar_pagina_aberta(driver, url, prazo), 'navegador'
+
+def coletar_dados_api(urls_produtos, graphql_url=GRAPHQL_URL):
+    """
+    Busca os produtos em lote na API GraphQL do catálogo
+    
+    Returns:
+        Dicionário {url: (dados, completo)}; vazio se a API não estiver disponível
+    """
+    print(f"Consultando API do catálogo em {graphql_url}...")
+    try:
+        itens = buscar_produtos(criar_sessao_api(), urls_produtos, url=graphql_url)
+    except ErroCatalogoAPI as e:
+        print(f"Erro ao consultar API do catálogo: {e}")
+        print("Usando extração pelas páginas dos produtos.")
+        return {}
+    
+    print(f"API retornou {len(itens)} de {len(urls_produtos)} produtos")
+    return {url: linha_de_produto_api(item, url) for url, item in itens.items()}
 
-def coletar_dados_nutricionais():
-    """Função principal para coleta dos dados nutricionais"""
+def salvar_niveis_extracao(niveis_por_url, caminho='dados/niveis_extracao.json'):
+    """Exibe a taxa de acerto de cada nível de extração e salva o nível usado por URL"""
+    contagem = Counter(nivel for nivel, _ in niveis_por_url.values())
+    tempos = defaultdict(float)
+    for nivel, duracao in niveis_por_url.values():
+        tempos[nivel] += duracao
+    
+    total = len(niveis_por_url) or 1
+    print("\nNíveis de extração:")
+    for nivel in ('api',) + NIVEIS_EXTRACAO + ('sem_tabela',):
+        if contagem[nivel]:
+            print(f"  {nivel}: {contagem[nivel]} produtos ({contagem[nivel] / total:.0%}), "
+                  f"{tempos[nivel]:.1f}s no total, {tempos[nivel] / contagem[nivel]:.2f}s por produto")
+    
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump({
+            'data_coleta': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'totais': dict(contagem),
+            'segundos': {nivel: round(tempo, 3) for nivel, tempo in tempos.items()},
+            'urls': {url: nivel for url, (nivel, _) in niveis_por_url.items()}
+        }, f, ensure_ascii=False, indent=2)
+
+@perfilado('coletar_dados_nutricionais')
+def coletar_dados_nutricionais(backend='html', graphql_url=GRAPHQL_URL, formatos=('csv',), abas=1,
+                               captura_rede=False, banco=None, arquivar_html=True, verificar_sem_tabela=True,
+                               priorizar=True, tempo_limite=None):
+    """
+    Função principal para coleta dos dados nutricionais
+    
+    Args:
+        backend: 'html' para extrair cada produto pela sua página ou 'graphql'
+            para buscar o catálogo em lote na API e acessar a página apenas
+            dos produtos cuja tabela nutricional não veio na API
+        graphql_url: Endpoint GraphQL usado no backend 'graphql'
+        formatos: Formatos de saída ('csv', 'jsonl', 'parquet'); os textos
+            brutos são gravados em lotes durante a coleta e convertidos para
+            números ao final
+        abas: Número de abas simultâneas no navegador para os produtos que
+            precisam do nível 'navegador' (1 = uma página por vez)
+        captura_rede: Se True, lê a tabela das respostas de rede capturadas
+            pelo DevTools Protocol (só Chromium; processa uma página por vez)
+        banco: Caminho de um banco SQLite atualizado produto a produto
+            durante a coleta (ver config/banco.py); None desativa
+        arquivar_html: Se True, guarda o HTML de cada página no acervo
+            endereçado por conteúdo (ver config/acervo.py)
+        verificar_sem_tabela: Produtos no cache de páginas sem tabela
+            (config/sem_tabela.py) não vão para o navegador; com True ainda
+            passam pelo download do HTML, que detecta se a tabela apareceu,
+            e com False são pulados
+        priorizar: Processar primeiro os produtos novos, depois os coletados
+            há mais tempo ou que mudam com mais frequência (ver config/agenda.py)
+        tempo_limite: Segundos de coleta; ao acabar, nenhum produto novo é
+            iniciado e os adiados mantêm a linha da coleta anterior
+    
+    Returns:
+        Número de produtos salvos ou None se nada foi coletado
+    """
     # Carregar URLs dos produtos
     try:
         with open('dados/urls_produtos.json', 'r', encoding='utf-8') as f:
             dados_json = json.load(f)
             urls_produtos = dados_json.get('urls', [])
             total_urls = dados_json.get('total', 0)
+            # Categoria da listagem em que cada URL foi encontrada
+            categorias = dados_json.get('categorias') or {}
     except FileNotFoundError:
         print("Arquivo urls_produtos.json não encontrado!")
         return None
@@ -196,49 +819,295 @@ def coletar_dados_nutricionais():
         print("Nenhuma URL encontrada no arquivo!")
         return None
     
+    # Arquivos antigos podem ter a mesma página com URLs diferentes
+    urls_produtos = deduplicar_urls(urls_produtos, aliases=carregar_aliases())
+    total_urls = len(urls_produtos)
+    if priorizar:
+        from .agenda import carregar_estado, priorizar_urls
+        urls_produtos = priorizar_urls(urls_produtos, carregar_estado(caminho_dados=CAMINHOS_SAIDA['csv']))
+    
+    # Prazo da coleta inteira (sem tetos por etapa)
+    prazo_coleta = Prazo(tempo_limite, limites={}) if tempo_limite else None
+    adiadas = []
+    
+    def tempo_esgotado():
+        return prazo_coleta is not None and prazo_coleta.restante() <= 0
+    
     print(f"\nIniciando coleta de dados nutricionais de {total_urls} produtos...")
     
-    driver = iniciar_driver()
-    if not driver:
-        return None
+    with sub_etapa('api'):
+        dados_api = coletar_dados_api(urls_produtos, graphql_url) if backend == 'graphql' else {}
+    sessao = sessao_compartilhada()
     
-    dados_nutricionais = []
+    # O navegador só é iniciado quando algum produto chega ao nível 'navegador'
+    driver = None
+    navegador_indisponivel = False
     
-    try:
-        # Processar cada URL
-        for url in tqdm(urls_produtos, desc="Processando produtos"):
+    def obter_driver():
+        nonlocal driver, navegador_indisponivel
+        if driver is None and not navegador_indisponivel:
+            driver = iniciar_driver(capturar_rede=captura_rede)
+            navegador_indisponivel = driver is None
+        if driver is None:
+            raise RuntimeError("Não foi possível iniciar o navegador")
+        return driver
+    
+    destinos = {formato: CAMINHOS_SAIDA[formato] for formato in formatos}
+    niveis_por_url = {}
+    # URLs com linha válida ou sem tabela confirmada (as que contam como coletadas na agenda)
+    coletadas = []
+    saida_banco = None
+    if banco:
+        from .banco import SaidaSqlite
+        saida_banco = SaidaSqlite(banco)
+    acervo = None
+    if arquivar_html:
+        from .acervo import AcervoHtml
+        acervo = AcervoHtml()
+    cache_sem_tabela = CacheSemTabela()
+    
+    def arquivar_pagina_aberta(navegador, url):
+        if acervo is not None:
             try:
-                dados_produto = extrair_dados_nutricionais(driver, url)
-                if dados_produto:
-                    dados_nutricionais.append(dados_produto)
+                acervo.guardar(url, navegador.page_source, 'produto')
+            except Exception as e:
+                print(f"Erro ao arquivar HTML de {url}: {e}")
+    
+    prazos_esgotados = Counter()
+    
+    def registrar_erro(url, erro, duracao=None):
+        if isinstance(erro, PrazoEsgotado):
+            prazos_esgotados[erro.etapa] += 1
+        print(f"\nErro ao processar URL {url}: {erro}")
+        if saida_banco:
+            saida_banco.gravar_metadados(url, None, duracao, str(erro))
+    
+    def registrar_sem_tabela(escritor, url, duracao, nome=''):
+        # Linha com status explícito e nutrientes vazios: o produto continua na
+        # saída (e fora dos removidos do relatório de alterações)
+        dados_produto = dados_api.get(url, (None, False))[0]
+        if dados_produto:
+            nome, categoria = dados_produto.nome or nome, dados_produto.categoria
+        else:
+            categoria = categorias.get(url, '')
+        linha = ProdutoBruto(nome=nome, categoria=categoria, url=url, status='sem_tabela')
+        niveis_por_url[url] = ('sem_tabela', duracao)
+        coletadas.append(url)
+        escritor.escrever(linha)
+        if saida_banco:
+            saida_banco.gravar_produto(converter_produto(linha))
+            saida_banco.gravar_metadados(url, 'sem_tabela', duracao, None)
+    
+    def registrar(escritor, url, dados_pagina, nivel, duracao):
+        dados_produto = dados_api.get(url, (None, False))[0]
+        if dados_produto and dados_pagina and nivel != 'api':
+            # Manter nome e categoria vindos da API
+            dados_pagina = dados_pagina._replace(
+                nome=dados_produto.nome or dados_pagina.nome,
+                categoria=dados_produto.categoria)
+        if dados_pagina and not dados_pagina.categoria and url in categorias:
+            dados_pagina = dados_pagina._replace(categoria=categorias[url])
+        niveis_por_url[url] = (nivel, duracao)
+        erros = []
+        if dados_pagina:
+            # A página gerou uma linha: qualquer marcação anterior de "sem tabela" deixa de valer
+            cache_sem_tabela.remover(url)
+            erros = dados_pagina.validar()
+            if erros:
+                print(f"\nAviso: produto {url} com problemas: {', '.join(erros)}")
+            else:
+                coletadas.append(url)
+            escritor.escrever(dados_pagina)
+        if saida_banco:
+            if dados_pagina:
+                saida_banco.gravar_produto(converter_produto(dados_pagina))
+            saida_banco.gravar_metadados(url, nivel, duracao, ', '.join(erros) or None)
+    
+    def processar_no_navegador(escritor, pendentes):
+        """
+        Nível 'navegador' para as URLs que os níveis sem navegador não resolveram
+
+        As URLs que o tempo limite não deixar iniciar vão para adiadas.
+        """
+        if tempo_esgotado():
+            adiadas.extend(pendentes)
+            return
+        try:
+            navegador = obter_driver()
+        except RuntimeError as e:
+            print(f"\nErro ao processar {len(pendentes)} URLs: {e}")
+            if saida_banco:
+                for url in pendentes:
+                    saida_banco.gravar_metadados(url, 'navegador', None, str(e))
+            return
+        
+        if abas > 1 and not captura_rede:
+            colhidas = set()
+            for url, dados_pagina, duracao, erro in coletar_em_abas(navegador, pendentes, abas):
+                colhidas.add(url)
+                # A aba colhida continua selecionada até a próxima iteração
+                arquivar_pagina_aberta(navegador, url)
+                if isinstance(erro, PaginaSemTabela):
+                    cache_sem_tabela.marcar(url, erro.motivo)
+                    registrar_sem_tabela(escritor, url, duracao, erro.nome)
+                elif erro:
+                    registrar_erro(url, erro, duracao)
+                else:
+                    registrar(escritor, url, dados_pagina, 'navegador', duracao)
+                if tempo_esgotado():
+                    adiadas.extend(url for url in pendentes if url not in colhidas)
+                    break
+            return
+        
+        for posicao, url in enumerate(tqdm(pendentes, desc="Processando no navegador", disable=len(pendentes) == 1)):
+            if tempo_esgotado():
+                adiadas.extend(pendentes[posicao:])
+                break
+            try:
+                inicio = time.perf_counter()
+                resultado = extrair_via_rede(navegador, url) if captura_rede else None
+                if resultado is None:
+                    resultado = extrair_via_navegador(navegador, url), 'navegador'
+                dados_pagina, nivel = resultado
+                arquivar_pagina_aberta(navegador, url)
+                registrar(escritor, url, dados_pagina, nivel, time.perf_counter() - inicio)
                 time.sleep(1)  # Pequena pausa entre produtos
+            except PaginaSemTabela as e:
+                print(f"\nProduto sem tabela nutricional: {url}")
+                cache_sem_tabela.marcar(url, e.motivo)
+                registrar_sem_tabela(escritor, url, time.perf_counter() - inicio, e.nome)
             except Exception as e:
-                print(f"\nErro ao processar URL {url}: {e}")
-                continue
+                registrar_erro(url, e, time.perf_counter() - inicio)
+    
+    # Sem tempo limite, o navegador recebe todas as URLs pendentes depois da
+    # primeira passagem. Com ele, cada lote (uma URL, ou uma por aba) vai para o
+    # navegador assim que os níveis sem navegador falham, na ordem de
+    # prioridade: páginas estáticas de baixa prioridade não consomem o tempo
+    # de produtos novos que precisam do navegador.
+    lote_navegador = None
+    if prazo_coleta is not None:
+        lote_navegador = abas if abas > 1 and not captura_rede else 1
+    
+    # A conversão numérica (pandas) roda ao final; o arquivo bruto é gravado durante a coleta
+    from .conversao import CAMINHO_BRUTO, converter_arquivo, converter_produto
+    
+    try:
+        # Durante a coleta são gravados os textos brutos das células
+        with EscritorStreaming({'csv': CAMINHO_BRUTO}, CAMPOS) as escritor:
+            # Primeira passagem: API e níveis sem navegador
+            pendentes_navegador = []
+            for posicao, url in enumerate(tqdm(urls_produtos, desc="Processando produtos")):
+                if tempo_esgotado():
+                    adiadas.extend(urls_produtos[posicao:])
+                    break
+                with sub_etapa('niveis_sem_navegador'):
+                    try:
+                        inicio = time.perf_counter()
+                        dados_produto, completo = dados_api.get(url, (None, False))
+                        if completo:
+                            registrar(escritor, url, dados_produto, 'api', time.perf_counter() - inicio)
+                            continue
+                        sem_tabela = cache_sem_tabela.consultar(url)
+                        if sem_tabela and not verificar_sem_tabela:
+                            registrar_sem_tabela(escritor, url, 0.0)
+                            continue
+                        html = baixar_html(sessao, url)
+                        if html and acervo is not None:
+                            acervo.guardar(url, html, 'produto')
+                        resultado = extrair_de_html(url, html) if html else None
+                        if resultado:
+                            registrar(escritor, url, *resultado, time.perf_counter() - inicio)
+                        elif sem_tabela and not (html and tem_marcador_tabela(html)):
+                            registrar_sem_tabela(escritor, url, time.perf_counter() - inicio)
+                        else:
+                            if sem_tabela:
+                                # A página voltou a mencionar a tabela: conferir no navegador
+                                cache_sem_tabela.remover(url)
+                            pendentes_navegador.append(url)
+                    except Exception as e:
+                        registrar_erro(url, e, time.perf_counter() - inicio)
+                        continue
+                if lote_navegador and len(pendentes_navegador) >= lote_navegador:
+                    with sub_etapa('navegador'):
+                        processar_no_navegador(escritor, pendentes_navegador)
+                    pendentes_navegador = []
+            
+            # Segunda passagem: produtos que ainda precisam do navegador
+            if pendentes_navegador:
+                with sub_etapa('navegador'):
+                    if lote_navegador is None:
+                        print(f"\n{len(pendentes_navegador)} produtos precisam do navegador")
+                    processar_no_navegador(escritor, pendentes_navegador)
+            
+            if prazos_esgotados:
+                print(f"\n{sum(prazos_esgotados.values())} páginas abandonadas por prazo esgotado: " +
+                      ', '.join(f"{etapa} ({quantidade})" for etapa, quantidade in prazos_esgotados.most_common()))
+            
+            if adiadas:
+                from .agenda import manter_anteriores
+                # O arquivo bruto anterior só é substituído quando o escritor fecha
+                mantidas = manter_anteriores(escritor, CAMINHO_BRUTO, adiadas)
+                print(f"\nTempo limite atingido: {len(adiadas)} produtos adiados, "
+                      f"{mantidas} mantidos da coleta anterior")
+        
+        salvar_niveis_extracao(niveis_por_url)
+        from .agenda import registrar_coletas
+        # Adiadas e linhas inválidas continuam com a data da última coleta real
+        registrar_coletas(coletadas)
         
-        # Criar DataFrame com os dados coletados
-        if dados_nutricionais:
-            df = pd.DataFrame(dados_nutricionais)
+        if escritor.total:
+            print(f"\nTextos brutos salvos em '{CAMINHO_BRUTO}'")
             
-            # Criar diretório se não existir
-            os.makedirs('dados/csv', exist_ok=True)
+            from .delta import CAMINHO_ANTERIOR, preservar_anterior, gerar_delta
             
-            # Salvar dados em CSV
-            caminho_csv = 'dados/csv/dados_nutricionais.csv'
-            df.to_csv(caminho_csv, index=False, encoding='utf-8')
-            print(f"\nDados salvos em '{caminho_csv}'")
+            # Guardar o CSV da coleta anterior para o relatório de alterações
+            comparar = 'csv' in destinos and preservar_anterior(destinos['csv'])
             
-            return df
+            # Conversão numérica vetorizada, fora do laço do navegador
+            with sub_etapa('conversao'):
+                total = converter_arquivo(CAMINHO_BRUTO, destinos)
+            for caminho in destinos.values():
+                print(f"\nDados salvos em '{caminho}'")
+            
+            if comparar:
+                try:
+                    gerar_delta(CAMINHO_ANTERIOR, destinos['csv'])
+                except Exception as e:
+                    print(f"Erro ao comparar com a coleta anterior: {e}")
+            
+            # Acrescentar esta coleta ao histórico particionado por data (sem as linhas mantidas)
+            formato_historico = next(f for f in ('parquet', 'csv', 'jsonl') if f in destinos)
+            try:
+                from .historico import adicionar_execucao
+                adicionar_execucao(destinos[formato_historico], excluir=adiadas)
+            except Exception as e:
+                print(f"Erro ao gravar o histórico: {e}")
+            return total
         else:
             print("\nNenhum dado nutricional foi coletado!")
             return None
             
     except Exception as e:
         print(f"\nErro durante a coleta de dados: {e}")
+        print("Resultados parciais mantidos nos arquivos '.parcial'")
         return None
         
     finally:
-        driver.quit()
+        if saida_banco:
+            saida_banco.fechar()
+        if acervo is not None:
+            acervo.fechar()
+        cache_sem_tabela.salvar()
+        salvar_seletores()
+        if driver:
+            if driver.reinicios:
+                print(f"Navegador reiniciado {driver.reinicios} vezes durante a coleta")
+            driver.quit()
 
 if __name__ == "__main__":
-    coletar_dados_nutricionais() 
\ No newline at end of file
+    argumentos = argparse.ArgumentParser(description="Coleta os dados nutricionais dos produtos")
+    argumentos.add_argument('--tempo-limite', type=float, metavar='MINUTOS', help="Parar de iniciar produtos após MINUTOS")
+    argumentos.add_argument('--sem-prioridade', action='store_true', help="Processar na ordem do arquivo de URLs")
+    opcoes = argumentos.parse_args()
+    coletar_dados_nutricionais(priorizar=not opcoes.sem_prioridade,
+                               tempo_limite=opcoes.tempo_limite * 60 if opcoes.tempo_limite else None) 
\ No newline at end of file
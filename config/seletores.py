@@ -0,0 +1,221 @@
+"""
+Seletores
+=========
+Registro de estratégias de seletores por campo da página do produto. As
+páginas já apareceram com estruturas diferentes (aba em '#menu-top-int' e
+tabela em 'div.tabela-nutri', ou botão 'div.content-tabela' e linhas
+'tr.nutriente'); em vez de esperar o timeout inteiro em cada palpite, todas
+as estratégias ativas de um campo são verificadas a cada intervalo, na
+ordem da taxa de acerto observada, e a primeira encontrada é usada. Quando
+o chamador informa uma leitura (a tabela nutricional), a estratégia só
+acerta se a leitura do elemento encontrado não for vazia.
+
+As taxas de acerto ficam em dados/seletores.json e decaem a cada tentativa,
+de modo que uma mudança de layout reordena as estratégias em poucas páginas.
+Estratégias que não acertam há muitas tentativas deixam de ser esperadas e
+são verificadas uma única vez, depois que as ativas falham.
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from selenium.webdriver.common.by import By
+
+# Arquivo com as taxas de acerto de cada estratégia
+CAMINHO_SELETORES = 'dados/seletores.json'
+
+# Peso das tentativas anteriores a cada nova tentativa (janela de ~50 páginas)
+DECAIMENTO = 0.98
+
+# Uma estratégia com pelo menos MINIMO_TENTATIVAS (com decaimento) e taxa de
+# acerto abaixo de TAXA_DESCARTE deixa de ser esperada
+MINIMO_TENTATIVAS = 10
+TAXA_DESCARTE = 0.05
+
+# Intervalo, em segundos, entre verificações das estratégias ativas
+INTERVALO_VERIFICACAO = 0.5
+
+class Leitura(NamedTuple):
+    """Seletores CSS para ler a tabela, relativos ao elemento encontrado"""
+
+    porcao: str
+    linhas: str
+    nome: str
+    valor: str
+
+class Estrategia(NamedTuple):
+    """Forma de localizar um campo da página"""
+
+    nome: str
+    por: str
+    seletor: str
+    leitura: Optional[Leitura] = None
+
+# Estratégias de cada campo, na ordem usada enquanto não há estatísticas
+ESTRATEGIAS = {
+    'aba_nutricional': (
+        Estrategia('menu_top_int', By.XPATH, "//*[@id='menu-top-int']//a[text()='Informação Nutricional']"),
+        Estrategia('content_tabela', By.CSS_SELECTOR, 'div.content-tabela'),
+    ),
+    'tabela_nutricional': (
+        Estrategia('tabela_nutri', By.CSS_SELECTOR, 'div.tabela-nutri table.table',
+                   Leitura('thead tr th:first-child', 'tbody tr', 'td:nth-child(1)', 'td:nth-child(2)')),
+        Estrategia('tr_nutriente', By.XPATH, "//table[.//tr[contains(concat(' ', @class, ' '), ' nutriente ')]]",
+                   Leitura('td.porcao', 'tr.nutriente', 'td.name', 'td.valor')),
+    ),
+}
+
+class RegistroSeletores:
+    """
+    Estatísticas de acerto das estratégias e localização adaptativa dos campos
+
+    Uso:
+        registro = registro_seletores()
+        encontrado = registro.localizar(driver, 'aba_nutricional', timeout=20)
+        if encontrado:
+            estrategia, elemento = encontrado
+    """
+
+    def __init__(self, caminho: str = CAMINHO_SELETORES, estrategias: Dict[str, tuple] = ESTRATEGIAS):
+        self.caminho = caminho
+        self.estrategias = estrategias
+        self.estatisticas: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.alterado = False
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    self.estatisticas = json.load(f).get('campos', {})
+            except (OSError, ValueError) as e:
+                print(f"Erro ao ler estatísticas de seletores '{caminho}': {e}")
+
+    def _contagem(self, campo: str, nome: str) -> Dict[str, float]:
+        return self.estatisticas.setdefault(campo, {}).setdefault(nome, {'acertos': 0.0, 'tentativas': 0.0})
+
+    def taxa(self, campo: str, nome: str) -> float:
+        """Taxa de acerto suavizada (1/2 para uma estratégia nunca tentada)"""
+        contagem = self.estatisticas.get(campo, {}).get(nome, {})
+        return (contagem.get('acertos', 0.0) + 1) / (contagem.get('tentativas', 0.0) + 2)
+
+    def descartada(self, campo: str, nome: str) -> bool:
+        contagem = self.estatisticas.get(campo, {}).get(nome, {})
+        return (contagem.get('tentativas', 0.0) >= MINIMO_TENTATIVAS
+                and contagem.get('acertos', 0.0) / contagem['tentativas'] < TAXA_DESCARTE)
+
+    def ordenadas(self, campo: str) -> List[Estrategia]:
+        """Estratégias do campo da maior para a menor taxa de acerto (empates na ordem declarada)"""
+        return sorted(self.estrategias[campo], key=lambda estrategia: -self.taxa(campo, estrategia.nome))
+
+    def registrar(self, campo: str, nome: str, acertou: bool):
+        contagem = self._contagem(campo, nome)
+        contagem['acertos'] = contagem['acertos'] * DECAIMENTO + (1 if acertou else 0)
+        contagem['tentativas'] = contagem['tentativas'] * DECAIMENTO + 1
+        self.alterado = True
+
+    @staticmethod
+    def _verificar(driver, estrategias: List[Estrategia], ler: Optional[Callable] = None):
+        """Primeira estratégia (na ordem) presente na página e com leitura válida, sem esperar"""
+        for estrategia in estrategias:
+            elementos = driver.find_elements(estrategia.por, estrategia.seletor)
+            if not elementos:
+                continue
+            if ler is None:
+                return estrategia, elementos[0]
+            resultado = ler(estrategia, elementos[0])
+            if resultado:
+                return estrategia, resultado
+        return None
+
+    def localizar(self, driver, campo: str, timeout: float = 20, intervalo: float = INTERVALO_VERIFICACAO,
+                  ler: Optional[Callable] = None) -> Optional[Tuple[Estrategia, object]]:
+        """
+        Espera até timeout segundos por qualquer estratégia ativa do campo
+
+        Args:
+            ler: Função (estrategia, elemento) que interpreta o elemento
+                encontrado; a estratégia só acerta quando o resultado não é
+                vazio (um elemento presente de outro layout conta como falha)
+
+        Returns:
+            Tupla (estrategia, elemento), ou (estrategia, resultado de ler),
+            da primeira estratégia que acertou; None se nenhuma acertou
+        """
+        ordem = self.ordenadas(campo)
+        ativas = [estrategia for estrategia in ordem if not self.descartada(campo, estrategia.nome)] or ordem
+        descartadas = [estrategia for estrategia in ordem if estrategia not in ativas]
+
+        limite = time.perf_counter() + timeout
+        while True:
+            encontrado = self._verificar(driver, ativas, ler)
+            if encontrado is not None or time.perf_counter() >= limite:
+                break
+            time.sleep(intervalo)
+        if encontrado is None and descartadas:
+            encontrado = self._verificar(driver, descartadas, ler)
+            tentadas = ordem
+        else:
+            tentadas = ativas
+
+        # Estratégias verificadas depois da encontrada não contam como falha
+        for estrategia in tentadas:
+            if encontrado is not None and estrategia is encontrado[0]:
+                self.registrar(campo, estrategia.nome, True)
+                break
+            self.registrar(campo, estrategia.nome, False)
+        return encontrado
+
+    def resumo(self):
+        """Exibe a taxa de acerto de cada estratégia"""
+        print("\nEstratégias de seletores:")
+        for campo in self.estrategias:
+            for estrategia in self.ordenadas(campo):
+                contagem = self.estatisticas.get(campo, {}).get(estrategia.nome)
+                if not contagem:
+                    continue
+                situacao = ' (descartada)' if self.descartada(campo, estrategia.nome) else ''
+                print(f"  {campo}/{estrategia.nome}: {contagem['acertos'] / contagem['tentativas']:.0%} "
+                      f"de acerto{situacao}")
+
+    def salvar(self):
+        """Grava as estatísticas se alguma tentativa foi registrada"""
+        if not self.alterado:
+            return
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'campos': self.estatisticas}, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho)
+        self.alterado = False
+
+# Registro compartilhado pelos extratores (carregado na primeira página)
+_registro = None
+
+def registro_seletores() -> RegistroSeletores:
+    global _registro
+    if _registro is None:
+        _registro = RegistroSeletores()
+    return _registro
+
+def salvar_seletores():
+    """Exibe e grava as estatísticas do registro compartilhado, se ele foi usado"""
+    if _registro is not None and _registro.alterado:
+        _registro.resumo()
+        _registro.salvar()
+
+def ler_tabela(driver, estrategia: Estrategia, elemento) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Lê a tabela nutricional encontrada por uma estratégia de 'tabela_nutricional'
+
+    Returns:
+        Tupla (porcao, [(nutriente, valor), ...]) com os textos da página
+    """
+    leitura = estrategia.leitura
+    porcao = elemento.find_elements(By.CSS_SELECTOR, leitura.porcao) or \
+        driver.find_elements(By.CSS_SELECTOR, leitura.porcao)
+    linhas = []
+    for linha in elemento.find_elements(By.CSS_SELECTOR, leitura.linhas):
+        nome = linha.find_elements(By.CSS_SELECTOR, leitura.nome)
+        valor = linha.find_elements(By.CSS_SELECTOR, leitura.valor)
+        if nome and valor:
+            linhas.append((nome[0].text.strip(), valor[0].text.strip()))
+    return (porcao[0].text.strip() if porcao else ''), linhas
@@ -0,0 +1,123 @@
+"""
+Sem Tabela
+==========
+Cache negativo dos produtos sem tabela nutricional (kits, acessórios,
+vales-presente). Uma página só conta como sem tabela quando carregou, não
+tem a aba "Informação Nutricional" e não tem nenhum MARCADORES_TABELA no
+HTML; um timeout ou uma falha dos seletores numa página que menciona a
+tabela não conta. A URL é registrada em dados/sem_tabela.json e só passa a
+valer depois de CONFIRMACOES coletas diferentes seguidas sem tabela (uma
+coleta em que a página gera dados tira a URL do cache).
+
+Nas coletas seguintes, enquanto o registro confirmado não expira, a URL não
+vai para o navegador: passa só pelo download do HTML (que a tira do cache
+se a tabela ou a aba aparecerem) ou é pulada, e fica com o status
+'sem_tabela' em vez de uma linha zerada.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+# Arquivo do cache negativo
+CAMINHO_SEM_TABELA = 'dados/sem_tabela.json'
+
+# Dias até uma URL sem tabela voltar a ser verificada no navegador
+VALIDADE_DIAS = 30
+
+# Coletas diferentes sem tabela até a URL sair do navegador
+CONFIRMACOES = 2
+
+# Trechos do HTML (sem diferença entre maiúsculas e minúsculas) que indicam
+# que a página tem, ou pode carregar, a tabela nutricional
+MARCADORES_TABELA = ('tabela-nutri', 'content-tabela', 'informação nutricional',
+                     'informa&ccedil;&atilde;o nutricional', 'informacao nutricional')
+
+class PaginaSemTabela(Exception):
+    """A página carregou, mas não tem a tabela nutricional"""
+
+    def __init__(self, motivo: str, nome: str = ''):
+        self.motivo = motivo
+        self.nome = nome
+        super().__init__(f"página sem tabela nutricional ({motivo})")
+
+def tem_marcador_tabela(html: str) -> bool:
+    """True se o HTML menciona a tabela ou a aba nutricional"""
+    texto = (html or '').lower()
+    return any(marcador in texto for marcador in MARCADORES_TABELA)
+
+class CacheSemTabela:
+    """
+    URLs confirmadas sem tabela nutricional, com motivo e validade
+
+    Cada instância corresponde a uma coleta: marcar a mesma URL mais de uma
+    vez na mesma coleta conta como uma ocorrência só.
+
+    Uso:
+        with CacheSemTabela() as cache:
+            if cache.consultar(url) is None:
+                ...
+            cache.marcar(url, 'sem_aba')
+    """
+
+    def __init__(self, caminho: str = CAMINHO_SEM_TABELA, validade_dias: float = VALIDADE_DIAS):
+        self.caminho = caminho
+        self.validade = timedelta(days=validade_dias)
+        self.entradas: Dict[str, Dict] = {}
+        self.marcadas = set()
+        self.alterado = False
+        if os.path.exists(caminho):
+            try:
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    self.entradas = json.load(f).get('urls', {})
+            except (OSError, ValueError) as e:
+                print(f"Erro ao ler cache de produtos sem tabela '{caminho}': {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastro):
+        self.salvar()
+        return False
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def consultar(self, url: str) -> Optional[Dict]:
+        """Entrada da URL se ela está confirmada e ainda não expirou; None caso contrário"""
+        entrada = self.entradas.get(url)
+        if entrada is None or entrada.get('ocorrencias', 1) < CONFIRMACOES:
+            return None
+        confirmado = datetime.strptime(entrada['confirmado_em'], '%Y-%m-%d %H:%M:%S')
+        if datetime.now() - confirmado > self.validade:
+            return None
+        return entrada
+
+    def marcar(self, url: str, motivo: str):
+        """Registra mais uma coleta em que a URL não tinha tabela (renova a validade)"""
+        if url in self.marcadas:
+            return
+        self.marcadas.add(url)
+        anterior = self.entradas.get(url, {})
+        self.entradas[url] = {
+            'motivo': motivo,
+            'ocorrencias': anterior.get('ocorrencias', 0) + 1,
+            'confirmado_em': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self.alterado = True
+
+    def remover(self, url: str):
+        """Tira a URL do cache (a página gerou dados ou voltou a mencionar a tabela)"""
+        if self.entradas.pop(url, None) is not None:
+            self.alterado = True
+
+    def salvar(self):
+        if not self.alterado:
+            return
+        os.makedirs(os.path.dirname(self.caminho) or '.', exist_ok=True)
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'validade_dias': self.validade.days, 'urls': self.entradas}, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho)
+        self.alterado = False
@@ -0,0 +1,207 @@
+"""
+Servidor
+========
+API HTTP somente leitura sobre o resultado da coleta. Todas as respostas
+são montadas e comprimidas com gzip no carregamento do arquivo, com ETag
+forte; cada requisição só escolhe a resposta pronta (ou responde 304).
+Quando uma nova coleta substitui o arquivo, as respostas são refeitas.
+
+Rotas:
+    /produtos                 todos os produtos (JSON)
+    /produtos.csv             exportação CSV
+    /produtos.parquet         exportação Parquet (requer pyarrow)
+    /produtos/<id>            um produto (id = último trecho da URL do produto)
+    /produto?url=<url>        um produto pela URL
+    /categorias               categorias e quantidade de produtos
+    /categorias/<categoria>   produtos de uma categoria
+
+Uso:
+    python -m config.servidor --porta 8000
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+import pandas as pd
+from .produto import CAMPOS, CAMPOS_TEXTO
+from .urls import canonicalizar_url
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pyarrow é opcional (só para a exportação Parquet)
+    pyarrow = None
+
+# Arquivo servido por padrão
+CAMINHO_DADOS = 'dados/csv/dados_nutricionais.csv'
+
+# Intervalo, em segundos, entre verificações de um novo arquivo
+INTERVALO_RECARGA = 2.0
+
+class Resposta(NamedTuple):
+    """Corpo pronto de uma rota, nas versões sem compressão e gzip"""
+
+    tipo: str
+    corpo: bytes
+    corpo_gzip: bytes
+    etag: str
+    etag_gzip: str
+
+def criar_resposta(corpo: bytes, tipo: str) -> Resposta:
+    """Comprime o corpo e calcula as ETags (uma por codificação)"""
+    digest = hashlib.sha256(corpo).hexdigest()[:32]
+    return Resposta(tipo, corpo, gzip.compress(corpo, compresslevel=9, mtime=0),
+                    f'"{digest}"', f'"{digest}-gzip"')
+
+def resposta_json(objeto) -> Resposta:
+    return criar_resposta(json.dumps(objeto, ensure_ascii=False).encode('utf-8'),
+                          'application/json; charset=utf-8')
+
+def id_produto(url: str) -> str:
+    """Identificador curto do produto: o último trecho do caminho da URL"""
+    return urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]
+
+class Catalogo:
+    """Respostas pré-calculadas de todas as rotas para um arquivo de dados"""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.mtime = os.stat(caminho).st_mtime_ns
+        df = pd.read_csv(caminho, dtype={campo: 'object' for campo in CAMPOS_TEXTO})
+        df = df.reindex(columns=list(CAMPOS))
+        df[list(CAMPOS_TEXTO)] = df[list(CAMPOS_TEXTO)].fillna('')
+        registros = df.astype(object).where(df.notna(), None).to_dict('records')
+
+        self.rotas: Dict[str, Resposta] = {}
+        self.ids_por_url: Dict[str, str] = {}
+
+        self.rotas['/produtos'] = resposta_json(registros)
+        self.rotas['/produtos.csv'] = criar_resposta(df.to_csv(index=False).encode('utf-8'), 'text/csv; charset=utf-8')
+        if pyarrow is not None:
+            buffer = io.BytesIO()
+            df.to_parquet(buffer, index=False)
+            self.rotas['/produtos.parquet'] = criar_resposta(buffer.getvalue(), 'application/vnd.apache.parquet')
+
+        for registro in registros:
+            url = canonicalizar_url(registro['url'])
+            identificador = id_produto(url)
+            if f'/produtos/{identificador}' in self.rotas:
+                # Último trecho repetido: usar um hash da URL
+                identificador = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+            self.rotas[f'/produtos/{identificador}'] = resposta_json(registro)
+            self.ids_por_url[url] = identificador
+
+        categorias = {}
+        for registro in registros:
+            categorias.setdefault(registro['categoria'], []).append(registro)
+        self.rotas['/categorias'] = resposta_json({categoria: len(itens) for categoria, itens in categorias.items()})
+        for categoria, itens in categorias.items():
+            self.rotas[f'/categorias/{categoria}'] = resposta_json(itens)
+
+        self.total = len(registros)
+
+    def buscar(self, caminho: str, parametros: Dict[str, list]) -> Optional[Resposta]:
+        """Retorna a resposta pronta da rota, ou None se não existe"""
+        if caminho == '/produto':
+            url = canonicalizar_url((parametros.get('url') or [''])[0])
+            identificador = self.ids_por_url.get(url)
+            return self.rotas.get(f'/produtos/{identificador}') if identificador else None
+        return self.rotas.get(caminho)
+
+class EstadoServidor:
+    """Catálogo atual, trocado atomicamente quando o arquivo muda"""
+
+    def __init__(self, caminho: str, intervalo: float = INTERVALO_RECARGA):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.catalogo = Catalogo(caminho)
+
+    def vigiar(self):
+        """Laço (em thread separada) que recarrega o catálogo quando o arquivo muda"""
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                if os.stat(self.caminho).st_mtime_ns != self.catalogo.mtime:
+                    catalogo = Catalogo(self.caminho)
+                    self.catalogo = catalogo
+                    print(f"Catálogo recarregado: {catalogo.total} produtos")
+            except Exception as e:
+                print(f"Erro ao recarregar '{self.caminho}': {e}")
+
+def criar_manipulador(estado: EstadoServidor):
+    """Cria a classe de requisições ligada ao estado do servidor"""
+
+    class Manipulador(BaseHTTPRequestHandler):
+        server_version = 'EssentialNutrition/1.0'
+
+        def do_GET(self):
+            self.responder(enviar_corpo=True)
+
+        def do_HEAD(self):
+            self.responder(enviar_corpo=False)
+
+        def responder(self, enviar_corpo: bool):
+            partes = urlsplit(self.path)
+            caminho = unquote(partes.path).rstrip('/') or '/'
+            resposta = estado.catalogo.buscar(caminho, parse_qs(partes.query))
+            if resposta is None:
+                self.send_error(404, "Rota não encontrada")
+                return
+
+            usar_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            corpo = resposta.corpo_gzip if usar_gzip else resposta.corpo
+            etag = resposta.etag_gzip if usar_gzip else resposta.etag
+
+            etags_cliente = [valor.strip() for valor in self.headers.get('If-None-Match', '').split(',')]
+            if etag in etags_cliente or '*' in etags_cliente:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', resposta.tipo)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Cache-Control', 'no-cache')
+            if usar_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.end_headers()
+            if enviar_corpo:
+                self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return Manipulador
+
+def iniciar_servidor(caminho: str = CAMINHO_DADOS, host: str = '127.0.0.1', porta: int = 8000,
+                     intervalo: float = INTERVALO_RECARGA) -> ThreadingHTTPServer:
+    """Carrega o catálogo, inicia a recarga automática e retorna o servidor (ainda sem atender)"""
+    estado = EstadoServidor(caminho, intervalo)
+    threading.Thread(target=estado.vigiar, daemon=True).start()
+    servidor = ThreadingHTTPServer((host, porta), criar_manipulador(estado))
+    servidor.estado = estado
+    print(f"Servindo {estado.catalogo.total} produtos de '{caminho}' em http://{host}:{servidor.server_port}")
+    return servidor
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="API somente leitura dos dados nutricionais")
+    argumentos.add_argument('--arquivo', default=CAMINHO_DADOS, help="CSV numérico da coleta")
+    argumentos.add_argument('--host', default='127.0.0.1', help="Endereço de escuta")
+    argumentos.add_argument('--porta', type=int, default=8000, help="Porta de escuta")
+    opcoes = argumentos.parse_args()
+    servidor = iniciar_servidor(opcoes.arquivo, opcoes.host, opcoes.porta)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
@@ -1,19 +1,25 @@
+import argparse
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import random
+import sys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
 import time
 from urllib.parse import urlparse
-from collections import defaultdict
+from collections import Counter, defaultdict
 import os
-import re
 from .browser import BrowserManager
+from .produto import ProdutoBruto, linha_vazia
+from .perfil import perfilado
+from .seletores import registro_seletores, salvar_seletores
+from .prazo import Prazo, PrazoEsgotado
+from .sem_tabela import PaginaSemTabela
+from .fetcher import sessao_compartilhada
+from .listagem import listar_categoria
+from .urls import canonicalizar_url
+from .url_collector import CATEGORIAS
 
 # Selecionando apenas 2 categorias para teste
 CATEGORIAS_TESTE = {
@@ -21,6 +27,22 @@ CATEGORIAS_TESTE = {
     'AMINOACIDOS': 'https://www.essentialnutrition.com.br/produtos/aminoacidos'
 }
 
+# Modo de amostragem (canário): produtos sorteados por categoria e semente fixa
+AMOSTRAS_POR_CATEGORIA = 3
+SEMENTE_AMOSTRA = 42
+
+# Peso no sorteio dos produtos alterados na última coleta (os demais pesam 1)
+PESO_ALTERADOS = 3.0
+
+# Páginas de listagem lidas por categoria para montar a população do sorteio
+MAXIMO_PAGINAS_AMOSTRA = 10
+
+# Limites para aprovar a amostra
+LIMITE_TAXA_SUCESSO = 0.9
+LIMITE_LATENCIA_P95 = 20.0
+
+CAMINHO_RELATORIO_AMOSTRA = 'dados/amostra_teste.json'
+
 def iniciar_driver():
     """Configura e inicia o driver do navegador em modo headless"""
     print("Configurando driver do navegador...")
@@ -129,7 +151,9 @@ def coletar_dados_nutricionais_teste(urls):
         
         # Criar DataFrame
         if dados_nutricionais:
-            df = pd.DataFrame(dados_nutricionais)
+            from .conversao import converter_registros, resumir_relatorio
+            df, relatorio = converter_registros(dados_nutricionais)
+            resumir_relatorio(relatorio)
             
             # Criar diretório se não existir
             os.makedirs('dados/csv', exist_ok=True)
@@ -149,6 +173,7 @@ def coletar_dados_nutricionais_teste(urls):
         return None
         
     finally:
+        salvar_seletores()
         if driver:
             driver.quit()
 
@@ -163,7 +188,7 @@ def testar_extracao_unica(url_teste="https://www.essentialnutrition.com.br/produ
         dados = extrair_dados_nutricionais(driver, url_teste)
         if dados:
             print("\nDados extraídos:")
-            for chave, valor in dados.items():
+            for chave, valor in dados._asdict().items():
                 print(f"{chave}: {valor}")
         return dados
         
@@ -172,6 +197,7 @@ def testar_extracao_unica(url_teste="https://www.essentialnutrition.com.br/produ
         return None
         
     finally:
+        salvar_seletores()
         if driver:
             driver.quit()
 
@@ -180,27 +206,15 @@ def extrair_dados_nutricionais(driver, url):
     print("\nIniciando extração de dados...")
     print(f"URL: {url}")
     
-    dados = {
-        'nome': '',
-        'url': url,
-        'porcao': '',
-        'calorias': 0.0,
-        'carboidratos': 0.0,
-        'proteinas': 0.0,
-        'gorduras_totais': 0.0,
-        'gorduras_saturadas': 0.0,
-        'fibras': 0.0,
-        'sodio': 0.0
-    }
+    dados = linha_vazia(url)
+    prazo = Prazo()
     
     try:
         print("Acessando página...")
         driver.get(url)
         
         print("Aguardando página carregar...")
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "h1"))
-        )
+        prazo.esperar(driver, EC.presence_of_element_located((By.TAG_NAME, "h1")), 'carregamento')
         print("Página carregada!")
         
         # Ajustar zoom
@@ -223,97 +237,58 @@ def extrair_dados_nutricionais(driver, url):
             pass
         
         # Clicar no botão de informação nutricional usando JavaScript
+        # (estratégias de seletores na ordem da taxa de acerto)
         print("Procurando botão de informação nutricional...")
-        try:
-            botao = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.content-tabela"))
-            )
-            driver.execute_script("arguments[0].click();", botao)
-            print("Botão encontrado e clicado!")
-        except:
-            print("Botão não encontrado, tentando alternativa...")
-            try:
-                botao = driver.find_element(By.CSS_SELECTOR, "div.content-tabela")
-                driver.execute_script("arguments[0].click();", botao)
-                print("Botão encontrado e clicado (alternativa)!")
-            except:
-                print("Não foi possível encontrar o botão")
-                return None
+        registro = registro_seletores()
+        encontrado = registro.localizar(driver, 'aba_nutricional', timeout=prazo.limite('aba'))
+        if encontrado is None:
+            print("Não foi possível encontrar o botão")
+            return None
+        estrategia, botao = encontrado
+        driver.execute_script("arguments[0].click();", botao)
+        print(f"Botão encontrado e clicado ({estrategia.nome})!")
         
-        # Aguardar tabela nutricional carregar
-        time.sleep(2)
+        # Aguardar tabela nutricional carregar (mesma leitura da coleta de
+        # produção: a estratégia só acerta se algum nutriente for reconhecido)
+        from .scraper import ler_nutrientes
+        encontrado = registro.localizar(driver, 'tabela_nutricional', timeout=prazo.limite('tabela'),
+                                        ler=lambda estrategia, elemento: ler_nutrientes(driver, estrategia, elemento))
+        if encontrado is None:
+            print("Tabela nutricional não encontrada")
+            return ProdutoBruto.de_dict(dados)
+        porcao, valores = encontrado[1]
         
         # Extrair porção
-        try:
-            porcao_element = driver.find_element(By.CSS_SELECTOR, "td.porcao")
-            dados['porcao'] = porcao_element.text.strip()
+        if porcao:
+            dados['porcao'] = porcao
             print(f"Porção encontrada: {dados['porcao']}")
-        except:
+        else:
             print("Porção não encontrada")
         
-        # Função auxiliar para extrair valor numérico
-        def extrair_valor(texto):
-            if not texto:
-                return 0.0
-            match = re.search(r'(\d+[.,]?\d*)', texto.replace(',', '.'))
-            return float(match.group(1)) if match else 0.0
+        # Extrair dados nutricionais (mantidos como texto; a conversão
+        # numérica é feita depois da coleta por config/conversao.py)
+        for campo, valor in valores.items():
+            dados[campo] = valor
+            print(f"Coletado {campo}: {valor}")
         
-        # Extrair dados nutricionais
-        elementos_nutricionais = driver.find_elements(By.CSS_SELECTOR, "tr.nutriente")
-        for elemento in elementos_nutricionais:
-            try:
-                nome_nutriente = elemento.find_element(By.CSS_SELECTOR, "td.name").text.strip()
-                valor_nutriente = elemento.find_element(By.CSS_SELECTOR, "td.valor").text.strip()
-                
-                print(f"Encontrado nutriente: '{nome_nutriente}'")
-                
-                if 'Valor Energético' in nome_nutriente:
-                    valor = extrair_valor(valor_nutriente)
-                    dados['calorias'] = valor
-                    print(f"Coletado Valor Energético: {valor_nutriente} -> {valor}")
-                    
-                elif 'Carboidratos' in nome_nutriente and 'Fibras' not in nome_nutriente:
-                    valor = extrair_valor(valor_nutriente)
-                    dados['carboidratos'] = valor
-                    print(f"Coletado Carboidratos: {valor_nutriente} -> {valor}")
-                    
-                elif 'Proteínas' in nome_nutriente:
-                    valor = extrair_valor(valor_nutriente)
-                    dados['proteinas'] = valor
-                    print(f"Coletado Proteínas: {valor_nutriente} -> {valor}")
-                    
-                elif 'Gorduras totais' in nome_nutriente:
-                    valor = extrair_valor(valor_nutriente)
-                    dados['gorduras_totais'] = valor
-                    print(f"Coletado Gorduras totais: {valor_nutriente} -> {valor}")
-                    
-                elif 'Gorduras saturadas' in nome_nutriente:
-                    valor = extrair_valor(valor_nutriente)
-                    dados['gorduras_saturadas'] = valor
-                    print(f"Coletado Gorduras saturadas: {valor_nutriente} -> {valor}")
-                    
-                elif 'Fibras' in nome_nutriente:
-                    valor = extrair_valor(valor_nutriente)
-                    dados['fibras'] = valor
-                    print(f"Coletado Fibras alimentares: {valor_nutriente} -> {valor}")
-                    
-                elif 'Sódio' in nome_nutriente:
-                    valor = extrair_valor(valor_nutriente)
-                    dados['sodio'] = valor
-                    print(f"Coletado Sódio: {valor_nutriente} -> {valor}")
-                    
-            except Exception as e:
-                print(f"Erro ao processar nutriente: {e}")
-                continue
-        
-        return dados
+        return ProdutoBruto.de_dict(dados)
         
     except Exception as e:
         print(f"Erro durante extração: {e}")
         return None
 
-def executar_teste():
-    """Executa o teste completo de coleta"""
+@perfilado('executar_teste')
+def executar_teste(amostra=None):
+    """
+    Executa o teste completo de coleta
+    
+    Args:
+        amostra: Se informado, executa o canário com esse número de produtos
+            por categoria (ver executar_amostragem) em vez das categorias de teste
+    """
+    if amostra:
+        return executar_amostragem(amostra)
+    
     print("\n1. Iniciando coleta de URLs de teste...")
     urls = coletar_urls_teste()
     
@@ -329,6 +304,158 @@ def executar_teste():
     else:
         print("\nErro durante coleta de URLs")
 
+def carregar_alterados(caminho=None):
+    """URLs adicionadas ou alteradas na última coleta (vazio se não há arquivo de alterações)"""
+    from .delta import CAMINHO_ALTERACOES
+    caminho = caminho or CAMINHO_ALTERACOES
+    if not os.path.exists(caminho):
+        return set()
+    import pandas as pd
+    alteracoes = pd.read_csv(caminho, usecols=['tipo', 'url'])
+    return {canonicalizar_url(url) for url in alteracoes.loc[alteracoes['tipo'] != 'removido', 'url'].dropna()}
+
+def sortear_amostra(urls, k, semente, categoria, alterados=frozenset(), peso_alterados=PESO_ALTERADOS):
+    """
+    Sorteia k URLs sem reposição, com pesos (Efraimidis-Spirakis)
+    
+    O gerador é semeado com a semente e a categoria, então a amostra de uma
+    categoria não muda quando outras categorias mudam.
+    """
+    gerador = random.Random(f"{semente}:{categoria}")
+    chaves = []
+    for url in sorted(urls):
+        peso = peso_alterados if url in alterados else 1.0
+        chaves.append((gerador.random() ** (1.0 / peso), url))
+    chaves.sort(reverse=True)
+    return [url for _, url in chaves[:k]]
+
+def percentil(valores, fracao):
+    """Percentil por interpolação linear (0.0 para lista vazia)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * fracao
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+@perfilado('executar_amostragem')
+def executar_amostragem(k=AMOSTRAS_POR_CATEGORIA, semente=SEMENTE_AMOSTRA, categorias=None,
+                        priorizar_alterados=True, limite_taxa=LIMITE_TAXA_SUCESSO,
+                        limite_latencia_p95=LIMITE_LATENCIA_P95):
+    """
+    Teste rápido (canário) antes de uma coleta completa
+    
+    Sorteia k produtos de cada categoria de CATEGORIAS (semente fixa, com
+    mais peso para os alterados na última coleta), extrai cada um pelo
+    mesmo caminho da coleta de produção (níveis sem navegador e, se preciso,
+    o navegador com prazo por página) e compara a taxa de sucesso e a
+    latência por página com os limites.
+    
+    Args:
+        k: Produtos sorteados por categoria
+        semente: Semente do sorteio (mesma semente = mesma amostra)
+        categorias: Subconjunto de CATEGORIAS (padrão: todas)
+        priorizar_alterados: Dar peso PESO_ALTERADOS aos produtos alterados
+        limite_taxa: Taxa mínima de produtos com nutrientes
+        limite_latencia_p95: Latência máxima (p95), em segundos por página
+    
+    Returns:
+        Dicionário com o relatório; 'aprovado' indica se os limites foram
+        atendidos e todas as categorias tiveram produtos sorteados
+        ('estratos_vazios' lista as que não tiveram, com o motivo)
+    """
+    from .scraper import iniciar_driver as iniciar_driver_coleta, extrair_sem_navegador, extrair_via_navegador
+    
+    categorias = categorias or list(CATEGORIAS)
+    sessao = sessao_compartilhada()
+    alterados = carregar_alterados() if priorizar_alterados else set()
+    
+    print(f"\nSorteando {k} produtos de {len(categorias)} categorias (semente {semente})...")
+    amostra = []
+    estratos_vazios = {}  # categoria -> motivo
+    for categoria in categorias:
+        populacao = listar_categoria(CATEGORIAS[categoria], sessao=sessao, maximo_paginas=MAXIMO_PAGINAS_AMOSTRA)
+        if not populacao:
+            estratos_vazios[categoria] = 'listagem indisponível' if populacao is None else 'listagem sem produtos'
+            print(f"  {categoria}: nenhum produto sorteado ({estratos_vazios[categoria]})")
+            continue
+        sorteadas = sortear_amostra(sorted(populacao), k, semente, categoria, alterados)
+        print(f"  {categoria}: {len(sorteadas)} de {len(populacao)} produtos")
+        amostra.extend((categoria, url) for url in sorteadas)
+    
+    driver = None
+    resultados = []
+    try:
+        for categoria, url in amostra:
+            inicio = time.perf_counter()
+            try:
+                resultado = extrair_sem_navegador(url, sessao)
+                if resultado is None:
+                    if driver is None:
+                        driver = iniciar_driver_coleta()
+                        if driver is None:
+                            raise RuntimeError("Não foi possível iniciar o navegador")
+                    resultado = extrair_via_navegador(driver, url, Prazo()), 'navegador'
+                produto, nivel = resultado
+                erros = produto.validar()
+                status = 'falha' if erros else 'sucesso'
+                detalhe = ', '.join(erros)
+            except PaginaSemTabela as e:
+                nivel, status, detalhe = 'navegador', 'sem_tabela', e.motivo
+            except PrazoEsgotado as e:
+                nivel, status, detalhe = 'navegador', 'prazo_esgotado', str(e)
+            except Exception as e:
+                nivel, status, detalhe = None, 'erro', str(e)
+            resultados.append({'categoria': categoria, 'url': url, 'nivel': nivel, 'status': status,
+                               'detalhe': detalhe, 'segundos': round(time.perf_counter() - inicio, 3)})
+    finally:
+        salvar_seletores()
+        if driver:
+            driver.quit()
+    
+    # Produtos sem tabela são válidos, mas não entram na taxa de sucesso
+    avaliados = [r for r in resultados if r['status'] != 'sem_tabela']
+    sucessos = sum(r['status'] == 'sucesso' for r in avaliados)
+    taxa = sucessos / len(avaliados) if avaliados else 0.0
+    latencias = [r['segundos'] for r in resultados]
+    relatorio = {
+        'data': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'semente': semente,
+        'amostras_por_categoria': k,
+        'produtos': len(resultados),
+        'taxa_sucesso': round(taxa, 4),
+        'latencia_p50': round(percentil(latencias, 0.5), 3),
+        'latencia_p95': round(percentil(latencias, 0.95), 3),
+        'latencia_max': round(max(latencias, default=0.0), 3),
+        'limites': {'taxa_sucesso': limite_taxa, 'latencia_p95': limite_latencia_p95},
+        'por_nivel': dict(Counter(r['nivel'] for r in resultados if r['nivel'])),
+        'por_status': dict(Counter(r['status'] for r in resultados)),
+        'estratos_vazios': estratos_vazios,
+        'resultados': resultados,
+    }
+    # Uma categoria sem amostra reprova o canário (a amostra não cobre todos os estratos)
+    relatorio['aprovado'] = (bool(avaliados) and not estratos_vazios and taxa >= limite_taxa
+                             and relatorio['latencia_p95'] <= limite_latencia_p95)
+    
+    print(f"\nAmostra: {len(resultados)} produtos; status: {relatorio['por_status']}; níveis: {relatorio['por_nivel']}")
+    print(f"Taxa de sucesso: {taxa:.0%} (mínimo {limite_taxa:.0%})")
+    print(f"Latência por página: p50 {relatorio['latencia_p50']:.2f}s, p95 {relatorio['latencia_p95']:.2f}s "
+          f"(máximo {limite_latencia_p95:.0f}s), pior {relatorio['latencia_max']:.2f}s")
+    for r in resultados:
+        if r['status'] in ('falha', 'erro', 'prazo_esgotado'):
+            print(f"  {r['status']}: {r['url']} ({r['detalhe']})")
+    if estratos_vazios:
+        print("Categorias sem amostra: " + ', '.join(f"{categoria} ({motivo})"
+                                                    for categoria, motivo in estratos_vazios.items()))
+    print("\nAMOSTRA APROVADA" if relatorio['aprovado'] else "\nAMOSTRA REPROVADA")
+    
+    os.makedirs(os.path.dirname(CAMINHO_RELATORIO_AMOSTRA), exist_ok=True)
+    with open(CAMINHO_RELATORIO_AMOSTRA, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"Relatório salvo em '{CAMINHO_RELATORIO_AMOSTRA}'")
+    return relatorio
+
 def testar_produto_especifico():
     """Testa a coleta em um produto específico"""
     from scraper import configurar_driver, extrair_dados_nutricionais
@@ -344,7 +471,7 @@ def testar_produto_especifico():
         
         print("\nDados coletados:")
         print("-" * 40)
-        for campo, valor in dados.items():
+        for campo, valor in dados._asdict().items():
             print(f"{campo}: {valor}")
             
     except Exception as e:
@@ -356,4 +483,16 @@ def testar_produto_especifico():
     print("\n=== Teste Finalizado ===")
 
 if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Testes rápidos da coleta")
+    argumentos.add_argument('--amostra', type=int, metavar='K',
+                            help="Canário: K produtos sorteados por categoria (sem isso, testa um produto)")
+    argumentos.add_argument('--semente', type=int, default=SEMENTE_AMOSTRA, help="Semente do sorteio")
+    argumentos.add_argument('--categorias', nargs='+', choices=sorted(CATEGORIAS), help="Categorias sorteadas")
+    argumentos.add_argument('--sem-prioridade', action='store_true', help="Não dar mais peso aos produtos alterados")
+    opcoes = argumentos.parse_args()
+    
+    if opcoes.amostra:
+        relatorio = executar_amostragem(opcoes.amostra, opcoes.semente, opcoes.categorias,
+                                        not opcoes.sem_prioridade)
+        sys.exit(0 if relatorio['aprovado'] else 1)
     testar_produto_especifico() 
\ No newline at end of file
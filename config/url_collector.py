@@ -1,18 +1,20 @@
 import json
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 from tqdm import tqdm
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from collections import defaultdict
 import os
 from datetime import datetime
 from .browser import BrowserManager
+from .parsers import interpretar_html
+from .urls import LIMITE_CONJUNTO_EXATO, ConjuntoVisto, canonicalizar_url, carregar_aliases, deduplicar_urls
+from .perfil import perfilado
+from .catalog_api import GRAPHQL_URL, ErroCatalogoAPI, criar_sessao_api, listar_urls_categoria
+from .fetcher import sessao_compartilhada
+from .listagem import listar_categoria
 
 # Dicionário com as categorias e suas URLs
 CATEGORIAS = {
@@ -54,8 +56,8 @@ def verificar_pagina_vazia(driver):
     except:
         return False
 
-def coletar_urls_pagina(driver):
-    """Coleta as URLs dos produtos na página atual"""
+def coletar_urls_pagina(driver, aliases=None):
+    """Coleta as URLs dos produtos na página atual, já na forma canônica"""
     if verificar_pagina_vazia(driver):
         return set()
     
@@ -70,23 +72,34 @@ def coletar_urls_pagina(driver):
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         time.sleep(2)  # Aguardar o carregamento dinâmico
         
-        # Coletar URLs usando o seletor específico
-        links = driver.find_elements(By.CSS_SELECTOR, "a.product.photo.product-item-photo")
+        # Coletar URLs usando o seletor específico (uma única leitura do HTML)
+        links = interpretar_html(driver.page_source).links_fotos_produtos()
         
-        for link in links:
-            url = link.get_attribute('href')
-            if url and 'essentialnutrition.com.br' in url and '/produtos/' not in url:
-                # Normalizar a URL removendo parâmetros de query e fragmentos
-                parsed_url = urlparse(url)
-                url_normalizada = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
-                urls.add(url_normalizada)
+        for href in links:
+            url = canonicalizar_url(href, driver.current_url, aliases)
+            if 'essentialnutrition.com.br' in urlparse(url).netloc and '/produtos/' not in url:
+                urls.add(url)
     except Exception as e:
         print(f"Erro ao coletar URLs da página: {e}")
     
     return urls
 
-def coletar_urls_produtos(driver, url_categoria):
-    """Coleta todas as URLs dos produtos de uma categoria"""
+def coletar_urls_produtos(driver, url_categoria, aliases=None, sessao=None):
+    """
+    Coleta todas as URLs dos produtos de uma categoria
+    
+    As listagens são lidas primeiro por HTTP (config/listagem.py); o
+    navegador só é usado se a categoria não puder ser lida assim.
+    
+    Args:
+        driver: WebDriver usado se a leitura por HTTP falhar (pode ser None)
+        sessao: Sessão HTTP (padrão: a sessão compartilhada)
+    """
+    urls_http = listar_categoria(url_categoria, aliases, sessao)
+    if urls_http is not None or driver is None:
+        return urls_http or []
+    
+    print("Listagem indisponível por HTTP; usando o navegador")
     driver.get(url_categoria)
     urls_produtos = set()  # Usando set para evitar duplicatas
     pagina = 1
@@ -105,7 +118,7 @@ def coletar_urls_produtos(driver, url_categoria):
             break
         
         # Coletar URLs da página atual
-        urls_pagina = coletar_urls_pagina(driver)
+        urls_pagina = coletar_urls_pagina(driver, aliases)
         
         # Se não encontrou produtos e a página não está explicitamente vazia,
         # pode ser um erro de carregamento
@@ -113,7 +126,7 @@ def coletar_urls_produtos(driver, url_categoria):
             print(f"Aviso: Nenhum produto encontrado na página {pagina}, mas a página não está marcada como vazia")
             # Tentar mais uma vez após uma pausa
             time.sleep(3)
-            urls_pagina = coletar_urls_pagina(driver)
+            urls_pagina = coletar_urls_pagina(driver, aliases)
             if not urls_pagina:
                 print("Ainda não encontrou produtos. Finalizando coleta desta categoria.")
                 break
@@ -143,13 +156,120 @@ def analisar_duplicatas(resultados):
         'urls_duplicadas': duplicatas
     }
 
-def coletar_urls():
-    """Coleta URLs de todos os produtos do site"""
-    driver = iniciar_driver()
-    if not driver:
+def salvar_urls(todas_urls, categorias=None):
+    """
+    Salva a lista de URLs coletadas em formato JSON
+    
+    Args:
+        categorias: Dicionário {url: categoria} com a primeira categoria em
+            que cada URL apareceu (usado para preencher a coluna 'categoria')
+    """
+    os.makedirs('dados', exist_ok=True)
+    with open('dados/urls_produtos.json', 'w', encoding='utf-8') as f:
+        json.dump({
+            'urls': todas_urls,
+            'total': len(todas_urls),
+            'categorias': categorias or {},
+            'data_coleta': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }, f, ensure_ascii=False, indent=2)
+
+def coletar_urls_api(graphql_url=GRAPHQL_URL):
+    """
+    Coleta URLs de todos os produtos pela API GraphQL do catálogo
+    
+    Returns:
+        Tupla (urls, categorias) ou None se a API não estiver disponível
+    """
+    sessao = criar_sessao_api()
+    aliases = carregar_aliases()
+    todas_urls = []
+    categorias = {}
+    
+    print(f"\nIniciando coleta de URLs de {len(CATEGORIAS)} categorias pela API...")
+    try:
+        for categoria, url_categoria in tqdm(CATEGORIAS.items(), desc="Processando categorias"):
+            urls_categoria = listar_urls_categoria(sessao, url_categoria, url=graphql_url)
+            print(f"\nEncontrados {len(urls_categoria)} produtos na categoria {categoria}")
+            todas_urls.extend(urls_categoria)
+            for url in urls_categoria:
+                categorias.setdefault(canonicalizar_url(url, aliases=aliases), categoria)
+    except ErroCatalogoAPI as e:
+        print(f"Erro ao consultar API do catálogo: {e}")
         return None
+    
+    return deduplicar_urls(todas_urls, aliases=aliases), categorias
+
+def coletar_categoria_navegador(driver, url_categoria, aliases=None, acervo=None):
+    """Percorre as páginas de uma categoria no navegador e retorna as URLs canônicas encontradas"""
+    urls = []
+    driver.get(url_categoria)
+    time.sleep(2)  # Aguardar carregamento
+    
+    pagina = 1
+    while True:
+        print(f"Processando página {pagina}")
+        
+        # Encontrar todos os links de produtos na página atual
+        html = driver.page_source
+        if acervo is not None:
+            acervo.guardar(driver.current_url, html, 'listagem')
+        links_produtos = interpretar_html(html).links_produtos()
+        
+        if not links_produtos:
+            print(f"Página {pagina} está vazia. Finalizando coleta desta categoria.")
+            break
+        
+        urls.extend(canonicalizar_url(href, driver.current_url, aliases) for href in links_produtos)
+        print(f"Encontrados {len(links_produtos)} produtos na página {pagina}")
+        
+        # Tentar ir para a próxima página
+        try:
+            pagina += 1
+            driver.get(f"{url_categoria}?p={pagina}")
+            time.sleep(2)  # Aguardar carregamento
+        except Exception as e:
+            print(f"Erro ao acessar página {pagina}: {e}")
+            break
+    return urls
 
-    todas_urls = []  # Lista simples para armazenar todas as URLs
+@perfilado('coletar_urls')
+def coletar_urls(backend='html', graphql_url=GRAPHQL_URL, limite_visto=LIMITE_CONJUNTO_EXATO,
+                 arquivar_html=True):
+    """
+    Coleta URLs de todos os produtos do site
+    
+    As URLs são canonicalizadas (ver config/urls.py) e as repetidas são
+    descartadas assim que encontradas. As listagens são lidas por HTTP com
+    a sessão compartilhada (config/listagem.py); o navegador só é iniciado
+    para categorias que não puderem ser lidas assim.
+    
+    Args:
+        backend: 'html' para navegar pelas páginas das categorias ou 'graphql'
+            para listar as categorias pela API (com retorno ao 'html' se falhar)
+        graphql_url: Endpoint GraphQL usado no backend 'graphql'
+        limite_visto: URLs guardadas exatamente antes de usar um filtro de Bloom
+        arquivar_html: Se True, guarda o HTML das listagens no acervo (ver config/acervo.py)
+    """
+    if backend == 'graphql':
+        resultado = coletar_urls_api(graphql_url)
+        if resultado is not None:
+            todas_urls, categorias = resultado
+            print(f"\nTotal de URLs únicas coletadas: {len(todas_urls)}")
+            salvar_urls(todas_urls, categorias)
+            return todas_urls
+        print("Usando coleta pelas páginas das categorias.")
+    
+    driver = None
+    sessao = sessao_compartilhada()
+    todas_urls = []  # URLs únicas, na ordem em que foram encontradas
+    categorias = {}  # URL -> primeira categoria em que apareceu
+    visto = ConjuntoVisto(limite_visto)
+    aliases = carregar_aliases()
+    repetidas = 0
+    acervo = None
+    if arquivar_html:
+        from .acervo import AcervoHtml
+        acervo = AcervoHtml()
     total_categorias = len(CATEGORIAS)
     
     try:
@@ -159,49 +279,29 @@ def coletar_urls():
         for categoria, url_categoria in tqdm(CATEGORIAS.items(), desc="Processando categorias"):
             print(f"\nColetando URLs da categoria: {categoria}")
             
-            # Acessar a página da categoria
-            driver.get(url_categoria)
-            time.sleep(2)  # Aguardar carregamento
+            urls_categoria = listar_categoria(url_categoria, aliases, sessao, acervo)
+            if urls_categoria is None:
+                print("Listagem indisponível por HTTP; usando o navegador")
+                if driver is None:
+                    driver = iniciar_driver()
+                    if not driver:
+                        return None
+                urls_categoria = coletar_categoria_navegador(driver, url_categoria, aliases, acervo)
             
-            pagina = 1
-            while True:
-                print(f"Processando página {pagina}")
-                
-                # Encontrar todos os links de produtos na página atual
-                links_produtos = driver.find_elements(By.CSS_SELECTOR, 'a.product-item-link')
-                
-                if not links_produtos:
-                    print(f"Página {pagina} está vazia. Finalizando coleta desta categoria.")
-                    break
-                
-                # Coletar URLs
-                urls_pagina = [link.get_attribute('href') for link in links_produtos]
-                todas_urls.extend(urls_pagina)  # Adicionar à lista principal
-                
-                print(f"Encontrados {len(urls_pagina)} produtos na página {pagina}")
-                
-                # Tentar ir para a próxima página
-                try:
-                    pagina += 1
-                    url_proxima = f"{url_categoria}?p={pagina}"
-                    driver.get(url_proxima)
-                    time.sleep(2)  # Aguardar carregamento
-                except Exception as e:
-                    print(f"Erro ao acessar página {pagina}: {e}")
-                    break
-        
-        # Remover duplicatas
-        todas_urls = list(set(todas_urls))
-        print(f"\nTotal de URLs únicas coletadas: {len(todas_urls)}")
+            # Coletar URLs novas
+            novas = 0
+            for url in urls_categoria:
+                if visto.adicionar(url):
+                    todas_urls.append(url)
+                    categorias.setdefault(url, categoria)
+                    novas += 1
+            repetidas += len(urls_categoria) - novas
+            print(f"Categoria {categoria}: {len(urls_categoria)} produtos ({novas} novos)")
+        
+        print(f"\nTotal de URLs únicas coletadas: {len(todas_urls)} ({repetidas} repetidas descartadas)")
         
         # Salvar URLs em formato JSON
-        os.makedirs('dados', exist_ok=True)
-        with open('dados/urls_produtos.json', 'w', encoding='utf-8') as f:
-            json.dump({
-                'urls': todas_urls,
-                'total': len(todas_urls),
-                'data_coleta': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }, f, ensure_ascii=False, indent=2)
+        salvar_urls(todas_urls, categorias)
         
         return todas_urls
         
@@ -210,7 +310,10 @@ def coletar_urls():
         return None
         
     finally:
-        driver.quit()
+        if acervo is not None:
+            acervo.fechar()
+        if driver:
+            driver.quit()
 
 if __name__ == "__main__":
     coletar_urls() 
\ No newline at end of file
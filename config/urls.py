@@ -0,0 +1,160 @@
+"""
+URLs
+====
+Forma canônica das URLs de produtos e conjunto de URLs já vistas, usados
+pelo coletor para descartar duplicatas no momento em que os links são
+encontrados.
+"""
+
+import hashlib
+import json
+import math
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+# Hosts que atendem o mesmo site (redirecionados para o host canônico)
+ALIASES_HOST = {
+    'essentialnutrition.com.br': 'www.essentialnutrition.com.br',
+}
+
+# Portas padrão removidas da URL canônica
+PORTAS_PADRAO = {'http': 80, 'https': 443}
+
+# Redirecionamentos conhecidos de URLs de produtos {url_antiga: url_nova}
+CAMINHO_ALIASES = 'dados/aliases_urls.json'
+
+# Quantidade de URLs guardadas exatamente antes de passar para o filtro de Bloom
+LIMITE_CONJUNTO_EXATO = 1_000_000
+
+def carregar_aliases(caminho: str = CAMINHO_ALIASES) -> Dict[str, str]:
+    """Carrega o mapa de redirecionamentos conhecidos (vazio se o arquivo não existe)"""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            aliases = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    # As chaves e os destinos também ficam na forma canônica
+    return {canonicalizar_url(origem): canonicalizar_url(destino) for origem, destino in aliases.items()}
+
+def canonicalizar_url(url: str, base: Optional[str] = None, aliases: Optional[Dict[str, str]] = None) -> str:
+    """
+    Retorna a forma canônica de uma URL
+
+    Esquema e host em minúsculas, host alternativo trocado pelo canônico
+    (com https), porta padrão, query string, fragmento, barras repetidas e
+    barra final removidos. Redirecionamentos conhecidos são aplicados ao final.
+
+    Args:
+        url: URL absoluta ou relativa
+        base: URL da página onde o link foi encontrado (para links relativos)
+        aliases: Mapa {url_canônica_antiga: url_canônica_nova}
+    """
+    if base:
+        url = urljoin(base, url)
+    partes = urlsplit(url.strip())
+    esquema = partes.scheme.lower()
+    host = (partes.hostname or '').lower()
+
+    if host in ALIASES_HOST:
+        host = ALIASES_HOST[host]
+        esquema = 'https'
+    if host in ALIASES_HOST.values():
+        esquema = 'https'
+
+    porta = partes.port
+    if porta and porta != PORTAS_PADRAO.get(esquema):
+        host = f"{host}:{porta}"
+
+    caminho = '/'.join(parte for parte in partes.path.split('/') if parte)
+    canonica = urlunsplit((esquema, host, '/' + caminho if caminho else '', '', ''))
+
+    if aliases:
+        canonica = aliases.get(canonica, canonica)
+    return canonica
+
+class FiltroBloom:
+    """Conjunto probabilístico de tamanho fixo (pode dar falso positivo, nunca falso negativo)"""
+
+    def __init__(self, capacidade: int, taxa_falsos_positivos: float = 0.001):
+        """
+        Args:
+            capacidade: Número de itens esperado
+            taxa_falsos_positivos: Probabilidade aceita de um item novo parecer já visto
+        """
+        self.bits = max(8, int(-capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacidade * math.log(2)))
+        self.tabela = bytearray((self.bits + 7) // 8)
+
+    def _posicoes(self, item: str):
+        # Hash duplo: duas metades de um único digest geram todas as posições
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def adicionar(self, item: str):
+        for posicao in self._posicoes(item):
+            self.tabela[posicao >> 3] |= 1 << (posicao & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.tabela[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(item))
+
+class ConjuntoVisto:
+    """
+    Conjunto das URLs já vistas: um set comum até 'limite' itens e, acima
+    disso, um filtro de Bloom com memória fixa
+    """
+
+    def __init__(self, limite: int = LIMITE_CONJUNTO_EXATO, capacidade_bloom: Optional[int] = None,
+                 taxa_falsos_positivos: float = 0.001):
+        """
+        Args:
+            limite: Itens guardados exatamente antes de migrar para o filtro de Bloom
+            capacidade_bloom: Itens esperados no filtro (padrão: 10 vezes o limite)
+            taxa_falsos_positivos: Taxa de falsos positivos do filtro
+        """
+        self.limite = limite
+        self.capacidade_bloom = capacidade_bloom or limite * 10
+        self.taxa_falsos_positivos = taxa_falsos_positivos
+        self.exato = set()
+        self.bloom = None
+        self.total = 0
+
+    def adicionar(self, item: str) -> bool:
+        """Adiciona o item e retorna True se ele ainda não tinha sido visto"""
+        if item in self:
+            return False
+        if self.bloom is not None:
+            self.bloom.adicionar(item)
+        else:
+            self.exato.add(item)
+            if len(self.exato) > self.limite:
+                self._migrar_para_bloom()
+        self.total += 1
+        return True
+
+    def _migrar_para_bloom(self):
+        print(f"Conjunto de URLs passou de {self.limite} itens: usando filtro de Bloom")
+        self.bloom = FiltroBloom(self.capacidade_bloom, self.taxa_falsos_positivos)
+        for item in self.exato:
+            self.bloom.adicionar(item)
+        self.exato = set()
+
+    def __contains__(self, item: str) -> bool:
+        if self.bloom is not None:
+            return item in self.bloom
+        return item in self.exato
+
+    def __len__(self) -> int:
+        return self.total
+
+def deduplicar_urls(urls: Iterable[str], base: Optional[str] = None,
+                    aliases: Optional[Dict[str, str]] = None) -> List[str]:
+    """Canonicaliza as URLs e remove as repetidas, mantendo a ordem da primeira ocorrência"""
+    visto = ConjuntoVisto()
+    unicas = []
+    for url in urls:
+        canonica = canonicalizar_url(url, base, aliases)
+        if visto.adicionar(canonica):
+            unicas.append(canonica)
+    return unicas
@@ -0,0 +1,182 @@
+"""
+Writer
+======
+Escrita incremental dos resultados da coleta. As linhas são gravadas em
+lotes em arquivos temporários '.parcial' (que podem ser acompanhados durante
+a execução) e renomeadas atomicamente para o destino ao final.
+"""
+
+import csv
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Union
+from .produto import CAMPOS_NUTRIENTES, para_tabela_arrow
+
+# pyarrow é opcional (só para saída Parquet) e só é importado quando uma
+# saída Parquet é aberta
+
+# Sufixo dos arquivos enquanto a coleta está em andamento
+SUFIXO_PARCIAL = '.parcial'
+
+class SaidaCsv:
+    """Saída em CSV (UTF-8, com cabeçalho)"""
+
+    def __init__(self, caminho: str, colunas: Sequence[str]):
+        self.caminho = caminho
+        self.arquivo = open(caminho, 'w', encoding='utf-8', newline='')
+        self.escritor = csv.writer(self.arquivo)
+        self.escritor.writerow(colunas)
+
+    def escrever_lote(self, linhas: List[tuple]):
+        self.escritor.writerows(linhas)
+        self.arquivo.flush()
+
+    def fechar(self):
+        self.arquivo.close()
+
+class SaidaJsonl:
+    """Saída em JSON Lines (um objeto por linha)"""
+
+    def __init__(self, caminho: str, colunas: Sequence[str]):
+        self.caminho = caminho
+        self.colunas = colunas
+        self.arquivo = open(caminho, 'w', encoding='utf-8')
+
+    def escrever_lote(self, linhas: List[tuple]):
+        for linha in linhas:
+            self.arquivo.write(json.dumps(dict(zip(self.colunas, linha)), ensure_ascii=False) + '\n')
+        self.arquivo.flush()
+
+    def fechar(self):
+        self.arquivo.close()
+
+def esquema_parquet(colunas: Sequence[str]):
+    """Esquema fixo da saída Parquet (nutrientes em float64, demais colunas em texto)"""
+    import pyarrow as pa
+    return pa.schema([pa.field(coluna, pa.float64() if coluna in CAMPOS_NUTRIENTES else pa.string())
+                      for coluna in colunas])
+
+class SaidaParquet:
+    """
+    Saída em Parquet (valores numéricos), com um row group por lote
+
+    O esquema é fixo: uma coluna toda vazia no primeiro lote não muda o tipo
+    usado pelos lotes seguintes.
+    """
+
+    def __init__(self, caminho: str, colunas: Sequence[str]):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Saída Parquet requer o pacote pyarrow")
+        self.pq = pq
+        self.caminho = caminho
+        self.colunas = list(colunas)
+        self.esquema = esquema_parquet(self.colunas)
+        self.escritor = None
+
+    def escrever_lote(self, linhas: List[tuple]):
+        tabela = para_tabela_arrow(linhas, self.esquema)
+        if self.escritor is None:
+            self.escritor = self.pq.ParquetWriter(self.caminho, self.esquema)
+        self.escritor.write_table(tabela)
+
+    def fechar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+        else:
+            # Nenhum lote escrito: criar arquivo vazio com as colunas
+            self.pq.write_table(self.esquema.empty_table(), self.caminho)
+
+SAIDAS = {
+    'csv': SaidaCsv,
+    'jsonl': SaidaJsonl,
+    'parquet': SaidaParquet,
+}
+
+class EscritorStreaming:
+    """
+    Grava linhas em uma ou mais saídas, em lotes, sem manter tudo em memória
+
+    Uso:
+        with EscritorStreaming({'csv': 'dados/csv/saida.csv'}, CAMPOS) as escritor:
+            escritor.escrever(produto)
+    """
+
+    def __init__(self, destinos: Dict[str, str], colunas: Sequence[str], tamanho_lote: int = 20):
+        formatos_invalidos = set(destinos) - set(SAIDAS)
+        if formatos_invalidos:
+            raise ValueError(f"Formatos de saída não suportados: {', '.join(sorted(formatos_invalidos))}")
+        self.destinos = destinos
+        self.colunas = colunas
+        self.tamanho_lote = tamanho_lote
+        self.lote = []
+        self.saidas = {}
+        self.total = 0
+
+    def __enter__(self):
+        self.abrir()
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastro):
+        self.fechar(confirmar=tipo_erro is None)
+        return False
+
+    def abrir(self):
+        """Cria os arquivos temporários de todas as saídas"""
+        for formato, caminho in self.destinos.items():
+            diretorio = os.path.dirname(caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+            self.saidas[formato] = SAIDAS[formato](caminho + SUFIXO_PARCIAL, self.colunas)
+
+    def escrever(self, linha: Union[Dict, tuple]):
+        """
+        Adiciona uma linha; o lote é gravado quando atinge o tamanho configurado
+
+        Args:
+            linha: Tupla (ex.: ProdutoBruto) na ordem das colunas ou dicionário
+        """
+        if isinstance(linha, dict):
+            linha = tuple(linha.get(coluna) for coluna in self.colunas)
+        # NaN vira valor ausente (célula vazia no CSV, null no JSONL e no Parquet)
+        linha = tuple(None if valor != valor else valor for valor in linha)
+        self.lote.append(linha)
+        self.total += 1
+        if len(self.lote) >= self.tamanho_lote:
+            self.descarregar()
+
+    def descarregar(self):
+        """Grava o lote pendente em todas as saídas"""
+        if not self.lote:
+            return
+        for saida in self.saidas.values():
+            saida.escrever_lote(self.lote)
+        self.lote = []
+
+    def fechar(self, confirmar: bool = True) -> Optional[Dict[str, str]]:
+        """
+        Fecha as saídas e renomeia os arquivos para o destino final
+
+        Args:
+            confirmar: Se False (erro durante a coleta), os arquivos '.parcial'
+                são mantidos para inspeção e os destinos anteriores preservados
+
+        Returns:
+            Dicionário {formato: caminho} dos arquivos finais, ou None se nada foi confirmado
+        """
+        self.descarregar()
+        for saida in self.saidas.values():
+            saida.fechar()
+
+        if not confirmar or self.total == 0:
+            if self.total == 0:
+                for saida in self.saidas.values():
+                    os.remove(saida.caminho)
+            self.saidas = {}
+            return None
+
+        for formato, saida in self.saidas.items():
+            os.replace(saida.caminho, self.destinos[formato])
+        self.saidas = {}
+        return dict(self.destinos)
@@ -17,9 +17,11 @@ import sys
 import time
 from datetime import datetime
 from typing import List, Dict, Optional
-from config.url_collector import coletar_urls
-from config.scraper import coletar_dados_nutricionais
-from config.teste_coleta import executar_teste
+
+# Os módulos de coleta (selenium, webdriver_manager, pandas, tqdm) são
+# importados apenas quando a etapa correspondente é executada, para que o
+# menu e as opções de gerenciamento de arquivos abram instantaneamente.
+MODULOS_COLETA = ['config.url_collector', 'config.scraper', 'config.teste_coleta']
 
 # ============================================================================
 # 🎨 SISTEMA DE CORES ANSI PARA TERMINAL
@@ -107,6 +109,7 @@ def coletar_urls_produtos():
     
     try:
         mostrar_barra_progresso("Iniciando coleta de URLs", 1.0)
+        from config.url_collector import coletar_urls
         dados_urls = coletar_urls()
         if dados_urls:
             print(f"{Cores.VERDE}✅ URLs coletadas com sucesso!{Cores.RESET}")
@@ -129,6 +132,7 @@ def coletar_dados_nutricionais_produtos():
     
     try:
         mostrar_barra_progresso("Iniciando coleta de dados nutricionais", 1.0)
+        from config.scraper import coletar_dados_nutricionais
         df_dados = coletar_dados_nutricionais()
         if df_dados is not None:
             print(f"{Cores.VERDE}✅ Dados nutricionais coletados com sucesso!{Cores.RESET}")
@@ -183,6 +187,8 @@ def limpar_dados():
                 print(f"{Cores.VERDE}✅ Removido: {file}{Cores.RESET}")
         
         print(f"\n{Cores.VERDE}✅ Todos os arquivos foram removidos com sucesso!{Cores.RESET}")
+        if os.path.isdir('dados/history'):
+            print(f"{Cores.AMARELO}ℹ️ Histórico de coletas mantido em 'dados/history'{Cores.RESET}")
     except Exception as e:
         print(f"\n{Cores.VERMELHO}❌ Erro ao limpar dados: {e}{Cores.RESET}")
 
@@ -230,6 +236,47 @@ https://github.com/sidnei-junior
 """
     print(sobre)
 
+def medir_importacoes(modulo: str) -> List[tuple]:
+    """
+    Mede o tempo de importação de um módulo em um processo separado (python -X importtime)
+    
+    Returns:
+        Lista de tuplas (cumulativo_us, proprio_us, pacote), da mais lenta para a mais rápida
+    """
+    import subprocess
+    resultado = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+                               capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    linhas = []
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        proprio, cumulativo, pacote = linha[len('import time:'):].split('|')
+        linhas.append((int(cumulativo), int(proprio), pacote.rstrip()))
+    
+    # O módulo pedido é a última linha; as importações feitas por ele vêm
+    # logo antes, com indentação maior (as demais são da inicialização do Python)
+    alvo = max((i for i, (_, _, pacote) in enumerate(linhas) if pacote.strip() == modulo), default=None)
+    if alvo is None:
+        return []
+    nivel = len(linhas[alvo][2]) - len(linhas[alvo][2].lstrip())
+    inicio = alvo
+    while inicio > 0 and len(linhas[inicio - 1][2]) - len(linhas[inicio - 1][2].lstrip()) > nivel:
+        inicio -= 1
+    return sorted(linhas[inicio:alvo + 1], reverse=True)
+
+def relatorio_inicializacao(quantidade: int = 10):
+    """Exibe o tempo de importação do menu e de cada etapa de coleta"""
+    print(f"\n{Cores.CIANO}{Cores.BOLD}⏱️  TEMPO DE INICIALIZAÇÃO{Cores.RESET}")
+    print(f"{Cores.AZUL}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Cores.RESET}")
+    
+    for modulo in ['main'] + MODULOS_COLETA:
+        medicoes = medir_importacoes(modulo)
+        total = medicoes[0][0] if medicoes else 0
+        print(f"\n{Cores.VERDE}📦 {modulo}: {total / 1000:.1f} ms{Cores.RESET}")
+        for cumulativo, proprio, pacote in medicoes[1:quantidade + 1]:
+            print(f"  {cumulativo / 1000:8.1f} ms  (próprio {proprio / 1000:6.1f} ms)  {pacote}")
+
 # ============================================================================
 # 🚀 FUNÇÃO PRINCIPAL
 # ============================================================================
@@ -276,6 +323,7 @@ def main():
             elif escolha == "4":
                 print(f"\n{Cores.CIANO}{Cores.BOLD}🧪 EXECUTANDO TESTE RÁPIDO{Cores.RESET}")
                 print(f"{Cores.AZUL}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Cores.RESET}")
+                from config.teste_coleta import executar_teste
                 executar_teste()
                 pausar()
                 
@@ -303,6 +351,17 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # python main.py --importtime: relatório do tempo de inicialização
+    if '--importtime' in sys.argv:
+        relatorio_inicializacao()
+        sys.exit(0)
+    
+    # python main.py --perfil[=cprofile]: perfila cada etapa de coleta executada pelo menu
+    for argumento in sys.argv[1:]:
+        if argumento.startswith('--perfil'):
+            from config.perfil import ativar_perfil
+            ativar_perfil(argumento.partition('=')[2] or 'amostragem')
+    
     # Criar diretórios necessários
     os.makedirs('dados/csv', exist_ok=True)
     main() 
\ No newline at end of file
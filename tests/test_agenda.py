@@ -0,0 +1,111 @@
+import json
+import time
+from datetime import datetime, timedelta
+import pytest
+from config import agenda, historico, scraper
+from config.produto import ProdutoBruto
+
+URLS = [f'https://www.essentialnutrition.com.br/produto-{i}' for i in range(6)]
+NOVA = 'https://www.essentialnutrition.com.br/produto-novo'
+
+class Relogio(datetime):
+    """Data das coletas controlada pelo teste (as coletas rodam no mesmo segundo)"""
+    atual = datetime.now().replace(microsecond=0) - timedelta(days=3)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.atual
+
+class Navegador:
+    reinicios = 0
+
+    def quit(self):
+        pass
+
+def produto(url, **nutrientes):
+    nutrientes = nutrientes or {'calorias': '120', 'proteinas': '24'}
+    return ProdutoBruto(nome=url.rsplit('/', 1)[-1], categoria='', url=url, porcao='30g', **nutrientes)
+
+@pytest.fixture
+def coleta(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'dados').mkdir()
+
+    monkeypatch.setattr(agenda, 'datetime', Relogio)
+    monkeypatch.setattr(historico, 'datetime', Relogio)
+    # Cada página consome um segundo do tempo limite
+    segundos = [0.0]
+    monkeypatch.setattr(time, 'perf_counter', lambda: segundos[0])
+    monkeypatch.setattr(time, 'sleep', lambda _: None)
+
+    # URL -> linha extraída do HTML estático (ausente = produto(url); None = precisa do navegador)
+    paginas = {}
+
+    def baixar_html(sessao, url):
+        segundos[0] += 1
+        return url
+
+    def extrair_via_navegador(driver, url, prazo=None):
+        segundos[0] += 1
+        return produto(url)
+
+    monkeypatch.setattr(scraper, 'baixar_html', baixar_html)
+    monkeypatch.setattr(scraper, 'extrair_de_html', lambda url, html: (
+        None if paginas.get(url, True) is None else (paginas.get(url) or produto(url), 'estruturado')))
+    monkeypatch.setattr(scraper, 'iniciar_driver', lambda **kwargs: Navegador())
+    monkeypatch.setattr(scraper, 'extrair_via_navegador', extrair_via_navegador)
+
+    def executar(tempo_limite=None, urls=URLS):
+        with open('dados/urls_produtos.json', 'w', encoding='utf-8') as f:
+            json.dump({'urls': urls, 'total': len(urls)}, f)
+        Relogio.atual += timedelta(hours=1)
+        assert scraper.coletar_dados_nutricionais(arquivar_html=False, tempo_limite=tempo_limite)
+        with open('dados/niveis_extracao.json', 'r', encoding='utf-8') as f:
+            return json.load(f)['urls']
+
+    executar.paginas = paginas
+    return executar
+
+@pytest.mark.parametrize('com_historico', [True, False])
+def test_coleta_seguinte_comeca_pelas_adiadas(coleta, monkeypatch, com_historico):
+    if not com_historico:
+        monkeypatch.setattr(historico, 'adicionar_execucao', lambda *args, **kwargs: None)
+
+    assert list(coleta()) == URLS
+    primeira = coleta(tempo_limite=3)
+    assert list(primeira) == URLS[:3]
+
+    # As linhas mantidas não contam como coleta: as adiadas são as mais atrasadas
+    segunda = coleta(tempo_limite=3)
+    assert list(segunda) == URLS[3:]
+    assert list(coleta(tempo_limite=3)) == URLS[:3]
+
+def test_linhas_mantidas_ficam_fora_do_historico(coleta):
+    coleta()
+    coleta(tempo_limite=3)
+    df = historico.consultar_historico(colunas=['url'])
+    assert df.groupby('url').size().to_dict() == {url: 2 if url in URLS[:3] else 1 for url in URLS}
+
+def test_produto_novo_que_precisa_do_navegador_nao_espera_as_paginas_estaticas(coleta):
+    coleta()
+    coleta.paginas[NOVA] = None
+
+    # O novo vem primeiro e vai ao navegador antes das demais páginas estáticas
+    niveis = coleta(tempo_limite=3, urls=URLS + [NOVA])
+    assert niveis[NOVA] == 'navegador'
+    assert list(niveis) == [NOVA, URLS[0]]
+
+def test_coleta_invalida_nao_atualiza_a_data_da_ultima_coleta(coleta):
+    coleta()
+    anteriores = agenda.carregar_coletas()
+
+    # Só o nome, sem nenhum nutriente (ex.: clique na aba falhou)
+    coleta.paginas[URLS[0]] = ProdutoBruto(nome='produto-0', url=URLS[0])
+    coleta()
+    coletas = agenda.carregar_coletas()
+    assert coletas[URLS[0]] == anteriores[URLS[0]]
+    assert all(coletas[url] > anteriores[url] for url in URLS[1:])
+
+    # A coleta que falhou não conta como recente: o produto é o primeiro da próxima
+    del coleta.paginas[URLS[0]]
+    assert list(coleta(tempo_limite=1)) == [URLS[0]]
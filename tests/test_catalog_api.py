@@ -0,0 +1,111 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from config import scraper
+from config.catalog_api import buscar_produtos, criar_sessao_api, listar_urls_categoria
+from config.produto import CAMPOS, ProdutoBruto
+
+LOJA = 'https://www.essentialnutrition.com.br'
+
+TABELA = ('<div class="tabela-nutri"><table class="table"><thead><tr><th>Porção: 30g (1 scoop)</th></tr></thead>'
+          '<tbody><tr><td>Valor energético (kcal)</td><td>120</td></tr>'
+          '<tr><td>Proteínas (g)</td><td>24</td></tr>'
+          '<tr><td>Sódio (mg)</td><td>1.234</td></tr></tbody></table></div>')
+
+def item(url_key, nome, descricao=''):
+    return {'name': nome, 'sku': url_key, 'url_key': url_key, 'url_suffix': '', 'canonical_url': None,
+            'categories': [{'name': 'PROTEINAS', 'url_path': 'produtos/proteinas'}],
+            'description': {'html': descricao}, 'short_description': {'html': ''}}
+
+# O último produto só tem a tabela no HTML da página (fora da descrição da API)
+ITENS = [
+    item('whey-protein', 'Whey Protein', TABELA),
+    item('beef-protein', 'Beef Protein', f'<p>Proteína da carne</p>{TABELA}'),
+    item('kit-treino', 'Kit Treino', '<p>Acompanha coqueteleira</p>'),
+]
+
+class ServidorGraphQL(BaseHTTPRequestHandler):
+    """Stub da API do Magento: categoria, produtos paginados e busca por url_key"""
+
+    consultas = []
+
+    def do_POST(self):
+        corpo = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        consulta, variaveis = corpo['query'], corpo['variables']
+        self.consultas.append(variaveis)
+        if 'categoryList' in consulta:
+            dados = {'categoryList': [{'uid': 'MTI=', 'name': 'Proteínas', 'url_path': variaveis['urlPath']}]}
+        elif 'category_uid' in consulta:
+            tamanho, pagina = variaveis['tamanho'], variaveis['pagina']
+            total_paginas = -(-len(ITENS) // tamanho)
+            dados = {'products': {'total_count': len(ITENS),
+                                  'page_info': {'current_page': pagina, 'total_pages': total_paginas},
+                                  'items': ITENS[(pagina - 1) * tamanho:pagina * tamanho]}}
+        else:
+            itens = [item for item in ITENS if item['url_key'] in variaveis['urlKeys']]
+            dados = {'products': {'items': itens[:variaveis['tamanho']]}}
+        resposta = json.dumps({'data': dados}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(resposta)))
+        self.end_headers()
+        self.wfile.write(resposta)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def graphql_url():
+    ServidorGraphQL.consultas = []
+    servidor = HTTPServer(('127.0.0.1', 0), ServidorGraphQL)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{servidor.server_port}/graphql'
+    servidor.shutdown()
+    servidor.server_close()
+
+def test_listagem_percorre_as_duas_paginas(graphql_url):
+    urls = listar_urls_categoria(criar_sessao_api(), f'{LOJA}/produtos/proteinas', url=graphql_url, tamanho_pagina=2)
+    assert urls == [f'{LOJA}/whey-protein', f'{LOJA}/beef-protein', f'{LOJA}/kit-treino']
+    assert [consulta.get('pagina') for consulta in ServidorGraphQL.consultas] == [None, 1, 2]
+
+def test_busca_em_lotes_mapeia_para_produto_bruto(graphql_url):
+    urls = [f'{LOJA}/{item["url_key"]}' for item in ITENS]
+    assert set(buscar_produtos(criar_sessao_api(), urls, url=graphql_url, tamanho_lote=2)) == set(urls)
+    assert [len(consulta['urlKeys']) for consulta in ServidorGraphQL.consultas] == [2, 1]
+
+    dados = scraper.coletar_dados_api(urls, graphql_url)
+    whey, completo = dados[urls[0]]
+    assert isinstance(whey, ProdutoBruto) and whey._fields == CAMPOS
+    assert completo
+    assert (whey.nome, whey.categoria, whey.url) == ('Whey Protein', 'PROTEINAS', urls[0])
+    assert (whey.calorias, whey.proteinas, whey.sodio) == ('120', '24', '1.234')
+    assert '30g' in whey.porcao
+    assert dados[urls[1]][1]
+
+    # Sem tabela na descrição: identificação da API, nutrientes pela página
+    kit, completo = dados[urls[2]]
+    assert not completo
+    assert (kit.nome, kit.categoria) == ('Kit Treino', 'PROTEINAS')
+    assert not kit.proteinas
+
+def test_coleta_graphql_busca_a_pagina_so_do_produto_sem_tabela_na_api(graphql_url, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'dados').mkdir()
+    urls = [f'{LOJA}/{item["url_key"]}' for item in ITENS]
+    with open('dados/urls_produtos.json', 'w', encoding='utf-8') as f:
+        json.dump({'urls': urls, 'total': len(urls)}, f)
+    baixadas = []
+
+    def baixar_html(sessao, url):
+        baixadas.append(url)
+        return f'<html><body><h1>Kit Treino</h1>{TABELA}</body></html>'
+
+    monkeypatch.setattr(scraper, 'baixar_html', baixar_html)
+    assert scraper.coletar_dados_nutricionais(backend='graphql', graphql_url=graphql_url,
+                                              arquivar_html=False, priorizar=False) == 3
+    assert baixadas == [urls[2]]
+    with open('dados/niveis_extracao.json', 'r', encoding='utf-8') as f:
+        niveis = json.load(f)['urls']
+    assert niveis[urls[0]] == niveis[urls[1]] == 'api'
+    assert niveis[urls[2]] == 'dom'
@@ -0,0 +1,40 @@
+import math
+import pandas as pd
+import pytest
+from config.conversao import converter_dataframe, converter_produto
+from config.produto import CAMPOS, CAMPOS_NUTRIENTES, ProdutoBruto, ProdutoNutricional, para_tabela_arrow
+from config.writer import esquema_parquet
+
+BRUTOS = [
+    ProdutoBruto(nome='Whey Protein', url='https://exemplo/whey', porcao='30g', calorias='1.234,5',
+                 proteinas='24', acucares='<0,1', sodio='Tr'),
+    ProdutoBruto(nome='Kit', url='https://exemplo/kit', status='sem_tabela'),
+]
+
+def test_registro_numerico_tem_os_campos_do_bruto():
+    assert ProdutoNutricional._fields == CAMPOS
+
+def test_converter_produto_retorna_floats():
+    produto = converter_produto(BRUTOS[0])
+    assert isinstance(produto, ProdutoNutricional)
+    assert all(isinstance(getattr(produto, campo), float) for campo in CAMPOS_NUTRIENTES)
+    assert (produto.calorias, produto.proteinas, produto.acucares, produto.sodio) == (1234.5, 24.0, 0.1, 0.0)
+    assert math.isnan(produto.carboidratos)
+
+def test_converter_produto_igual_a_conversao_vetorizada():
+    df, _ = converter_dataframe(pd.DataFrame(BRUTOS, columns=CAMPOS))
+    for bruto, linha in zip(BRUTOS, df.itertuples(index=False)):
+        produto = converter_produto(bruto)
+        for campo in CAMPOS_NUTRIENTES:
+            esperado = getattr(linha, campo)
+            assert getattr(produto, campo) == esperado or (math.isnan(esperado) and math.isnan(getattr(produto, campo)))
+
+def test_tabela_arrow_em_lote_com_esquema_fixo():
+    pa = pytest.importorskip('pyarrow')
+    esquema = esquema_parquet(CAMPOS)
+    tabela = para_tabela_arrow([converter_produto(bruto) for bruto in BRUTOS], esquema)
+    assert tabela.schema == esquema
+    assert tabela.column('proteinas').to_pylist()[0] == 24.0
+    assert tabela.column('status').to_pylist() == ['', 'sem_tabela']
+    assert para_tabela_arrow([], esquema).num_rows == 0
+    assert tabela.column('calorias').type == pa.float64()
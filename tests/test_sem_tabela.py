@@ -0,0 +1,103 @@
+import csv
+import json
+from selenium.common.exceptions import NoSuchElementException
+from config import scraper
+from config.prazo import Prazo
+from config.produto import CAMPOS, ProdutoBruto
+from config.seletores import RegistroSeletores
+from config.sem_tabela import CacheSemTabela, PaginaSemTabela
+
+# Prazo curto: a aba nunca aparece e a espera por ela termina em timeout
+LIMITES_TESTE = {'carregamento': 0.01, 'zoom': 0.01, 'nome': 1.0, 'aba': 0.1, 'tabela': 0.1}
+
+class Elemento:
+    def __init__(self, texto=''):
+        self.text = texto
+
+class DriverSemAba:
+    """Página carregada cujo botão "Informação Nutricional" nenhuma estratégia encontra"""
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+
+    def execute_script(self, script, *argumentos):
+        return 'complete'
+
+    def find_element(self, por, seletor):
+        if seletor == 'h1':
+            return Elemento('Whey Protein')
+        raise NoSuchElementException(seletor)
+
+    def find_elements(self, por, seletor):
+        return []
+
+def processar(driver, tmp_path, monkeypatch):
+    registro = RegistroSeletores(caminho=str(tmp_path / 'seletores.json'))
+    monkeypatch.setattr(scraper, 'registro_seletores', lambda: registro)
+    cache = CacheSemTabela(caminho=str(tmp_path / 'sem_tabela.json'))
+    url = 'https://www.essentialnutrition.com.br/whey-protein'
+    try:
+        resultado = scraper.processar_pagina_aberta(driver, url, Prazo(5, LIMITES_TESTE))
+    except PaginaSemTabela as e:
+        cache.marcar(url, e.motivo)
+        resultado = None
+    cache.salvar()
+    return resultado, CacheSemTabela(caminho=str(tmp_path / 'sem_tabela.json')).consultar(url)
+
+def test_timeout_da_aba_nao_popula_o_cache(tmp_path, monkeypatch):
+    pagina = '<html><body><h1>Whey Protein</h1><div id="menu-top-int"><a>Informação Nutricional</a></div></body></html>'
+    resultado, entrada = processar(DriverSemAba(pagina), tmp_path, monkeypatch)
+    assert isinstance(resultado, ProdutoBruto)
+    assert resultado.nome == 'Whey Protein'
+    assert entrada is None
+    assert not (tmp_path / 'sem_tabela.json').exists()
+
+def test_pagina_sem_sinal_da_tabela_so_vale_apos_duas_coletas(tmp_path, monkeypatch):
+    pagina = '<html><body><h1>Kit Presente</h1><p>Acompanha coqueteleira</p></body></html>'
+    resultado, entrada = processar(DriverSemAba(pagina), tmp_path, monkeypatch)
+    assert resultado is None
+    assert entrada is None
+
+    _, entrada = processar(DriverSemAba(pagina), tmp_path, monkeypatch)
+    assert entrada is not None
+    assert entrada['ocorrencias'] == 2
+
+def test_marcar_duas_vezes_na_mesma_coleta_conta_uma(tmp_path):
+    cache = CacheSemTabela(caminho=str(tmp_path / 'sem_tabela.json'))
+    cache.marcar('https://exemplo/kit', 'sem_aba')
+    cache.marcar('https://exemplo/kit', 'sem_aba')
+    assert cache.consultar('https://exemplo/kit') is None
+
+def test_produto_sem_tabela_continua_na_saida_com_status(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'dados').mkdir()
+    kit = 'https://www.essentialnutrition.com.br/kit-presente'
+    whey = 'https://www.essentialnutrition.com.br/whey-protein'
+    with open('dados/urls_produtos.json', 'w', encoding='utf-8') as f:
+        json.dump({'urls': [whey, kit], 'total': 2, 'categorias': {kit: 'KITS'}}, f)
+    for _ in range(2):
+        cache = CacheSemTabela(caminho='dados/sem_tabela.json')
+        cache.marcar(kit, 'sem_aba')
+        cache.salvar()
+    # Coleta anterior, de antes da coluna status, com a linha vazia do kit
+    (tmp_path / 'dados' / 'csv').mkdir()
+    with open('dados/csv/dados_nutricionais.csv', 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(CAMPOS[:-1])
+        escritor.writerow(['Whey Protein', '', whey, '30g', '', '', '24.0', '', '', '', '', ''])
+        escritor.writerow(['Kit Presente', 'KITS', kit, '', '', '', '', '', '', '', '', ''])
+
+    paginas = {whey: '<h1>Whey Protein</h1>', kit: '<h1>Kit Presente</h1><p>Acompanha coqueteleira</p>'}
+    monkeypatch.setattr(scraper, 'baixar_html', lambda sessao, url: paginas[url])
+    monkeypatch.setattr(scraper, 'extrair_de_html', lambda url, html: (
+        (ProdutoBruto(nome='Whey Protein', url=url, porcao='30g', proteinas='24'), 'dom') if url == whey else None))
+
+    assert scraper.coletar_dados_nutricionais(arquivar_html=False, priorizar=False) == 2
+    with open('dados/csv/dados_nutricionais.csv', encoding='utf-8') as f:
+        linhas = {linha['url']: linha for linha in csv.DictReader(f)}
+    assert linhas[kit]['status'] == 'sem_tabela'
+    assert linhas[kit]['categoria'] == 'KITS'
+    assert linhas[kit]['proteinas'] == ''
+    assert linhas[whey]['status'] == ''
+    with open('dados/csv/alteracoes.csv', encoding='utf-8') as f:
+        assert not [linha for linha in csv.DictReader(f) if linha['tipo'] == 'removido']